@@ -2,14 +2,18 @@ from flask import Flask, jsonify
 from flasgger import Swagger
 from routes.incidente_router import incidente_bp
 from routes.ticket_router import ticket_bp
-from database.db import init_db, close_session, close_db
+from routes.estadistica_router import estadistica_bp
+from routes.proveedor_json import configurar_json
+from routes.instrumentacion import configurar_instrumentacion
+from database.db import migrar_db, close_session, close_db, nombre_backend, estadisticas_cache_sql
+from cache.respuestas import obtener_cache
+from eventos.difusor import obtener_difusor
 
 
 def create_app() -> Flask:
+    # Sin acceso a la base: el engine se crea con la primera sesión, ya dentro de cada worker.
     app = Flask(__name__)
-    
-    with app.app_context():
-        init_db()
+    configurar_json(app)
     
     app.config["SWAGGER"] = {
         "title": "Ticketing API",
@@ -21,6 +25,7 @@ def create_app() -> Flask:
     
     app.register_blueprint(incidente_bp, url_prefix="/incidentes")
     app.register_blueprint(ticket_bp, url_prefix="/tickets")
+    app.register_blueprint(estadistica_bp, url_prefix="/stats")
     
     @app.route("/", methods=["GET"])
     def root():
@@ -33,6 +38,7 @@ def create_app() -> Flask:
             "endpoints": {
                 "incidentes": "/incidentes",
                 "tickets": "/tickets",
+                "estadisticas": "/stats",
             },
         }), 200
     
@@ -41,7 +47,10 @@ def create_app() -> Flask:
         return jsonify({
             "status": "healthy",
             "mensaje": "La API está funcionando correctamente",
-            "database": "SQLite con SQLAlchemy ORM",
+            "database": f"{nombre_backend()} con SQLAlchemy ORM",
+            "cache": obtener_cache().estadisticas(),
+            "cache_sql": estadisticas_cache_sql(),
+            "suscripciones_stream": obtener_difusor().cantidad_suscripciones(),
         }), 200
     
     @app.errorhandler(404)
@@ -63,13 +72,14 @@ def create_app() -> Flask:
     def cleanup(exception=None):
         close_session()
     
+    configurar_instrumentacion(app)
     return app
 
 
-app = create_app()
-
-
 if __name__ == "__main__":
+    migrar_db()
+    app = create_app()
+    
     print("=" * 60)
     print(" Iniciando Ticketing API con SQLAlchemy")
     print("=" * 60)
@@ -0,0 +1,329 @@
+"""Modo de ejecución ASGI: uvicorn asgi:app
+
+Los listados, exportaciones y el stream de eventos se atienden con handlers asíncronos sobre
+AsyncSession, reutilizando los mismos controllers y repositorios mediante run_sync. Un cliente
+lento o una conexión SSE abierta esperan en el event loop sin ocupar un hilo. El resto de la API
+(altas, cambios de estado, lecturas condicionales) se delega a la aplicación Flask, que corre en
+un pool acotado de hilos y conserva la unidad de trabajo y el registro de cambios.
+"""
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl
+from a2wsgi import WSGIMiddleware
+from werkzeug.datastructures import MIMEAccept
+from werkzeug.http import parse_accept_header
+from app import create_app
+from controllers.cambio_controller import CambioController
+from controllers.incidente_controller import IncidenteController
+from controllers.ticket_controller import TicketController
+from database.db import init_db_async, get_session_async, close_db_async, unidad_de_diagnostico
+from database.unit_of_work import UnitOfWork
+from eventos.difusor import SuscripcionAsync, TAMANO_LOTE, obtener_difusor
+from instrumentacion import iniciar_medicion, terminar_medicion
+from routes.ndjson import MIMETYPE_NDJSON
+from routes.filtros import leer_consulta_tickets, cursor_siguiente
+from routes.paginacion import leer_paginacion, codificar_cursor
+from routes.sse import MIMETYPE_SSE, CABECERAS_SSE, REINTENTO, formatear_evento, leer_parametros_stream
+
+TAMANO_PAGINA_EXPORTACION = 500
+LATIDO_SEGUNDOS = 15.0
+
+
+class Solicitud:
+
+    def __init__(self, scope: Dict[str, Any], receive):
+        self.metodo: str = scope["method"]
+        self.ruta: str = scope["path"]
+        self.receive = receive
+        # Como en Flask, ante parámetros repetidos vale el primero.
+        self.args: Dict[str, str] = {}
+        for clave, valor in parse_qsl(scope["query_string"].decode("latin-1")):
+            self.args.setdefault(clave, valor)
+        self.headers: Dict[str, str] = {
+            clave.decode("latin-1").lower(): valor.decode("latin-1") for clave, valor in scope["headers"]
+        }
+
+    def acepta(self, mimetype: str) -> bool:
+        aceptados = parse_accept_header(self.headers.get("accept"), MIMEAccept)
+        return aceptados.best_match(["application/json", mimetype]) == mimetype
+
+
+async def _con_uow(funcion: Callable[[UnitOfWork], Any]) -> Any:
+    """Ejecuta funcion con una UnitOfWork sobre la sesión síncrona de una AsyncSession.
+
+    Cada llamada es una unidad del diagnóstico SQL, como un request en la aplicación Flask.
+    """
+    async with get_session_async() as sesion:
+        with unidad_de_diagnostico():
+            return await sesion.run_sync(lambda session: funcion(UnitOfWork(session)))
+
+
+class TicketingASGI:
+
+    def __init__(self, aplicacion_flask, hilos_wsgi: int = 10):
+        self.flask = aplicacion_flask
+        self.wsgi = WSGIMiddleware(aplicacion_flask, workers=hilos_wsgi)
+        # Con TICKETING_INSTRUMENTACION=1; los handlers asíncronos no pasan por los hooks de Flask.
+        self.metricas = aplicacion_flask.extensions.get("metricas")
+        self.rutas: Dict[Tuple[str, str], Callable[[Solicitud, Any], Awaitable[None]]] = {
+            ("GET", "/tickets"): self.listar_tickets,
+            ("GET", "/tickets/export"): self.exportar_tickets,
+            ("GET", "/tickets/stream"): self.stream_tickets,
+            ("GET", "/incidentes"): self.listar_incidentes,
+            ("GET", "/incidentes/export"): self.exportar_incidentes,
+        }
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._ciclo_de_vida(receive, send)
+            return
+
+        if scope["type"] == "http":
+            handler = self.rutas.get((scope["method"], scope["path"]))
+            if handler is not None:
+                if self.metricas is not None:
+                    await self._medir(handler, Solicitud(scope, receive), send)
+                else:
+                    await handler(Solicitud(scope, receive), send)
+                return
+        await self.wsgi(scope, receive, send)
+
+    async def _medir(self, handler, solicitud: Solicitud, send) -> None:
+        """Lo mismo que hacen los hooks de Flask: Server-Timing y la serie de /metrics al empezar la respuesta."""
+        medicion = iniciar_medicion()
+
+        async def enviar(mensaje: Dict[str, Any]) -> None:
+            if mensaje["type"] == "http.response.start" and terminar_medicion() is not None:
+                # El handler hace de router: no hay vista de Flask envuelta por medir_tramo.
+                medicion.duraciones["router"] += medicion.total()
+                self.metricas.observar(solicitud.metodo, solicitud.ruta, mensaje["status"], medicion)
+                mensaje = dict(mensaje, headers=list(mensaje["headers"]) + [
+                    (b"server-timing", medicion.server_timing().encode()),
+                ])
+            await send(mensaje)
+
+        try:
+            await handler(solicitud, enviar)
+        finally:
+            terminar_medicion()
+
+    async def listar_tickets(self, solicitud: Solicitud, send) -> None:
+        incluir_inc = solicitud.args.get("incluir_incidentes", "false").lower() == "true"
+        try:
+            consulta = leer_consulta_tickets(solicitud.args)
+        except ValueError as e:
+            await self._json(send, {"exito": False, "mensaje": str(e)}, 400)
+            return
+
+        if solicitud.acepta(MIMETYPE_NDJSON):
+            await self._ndjson(send, self._paginas_tickets(incluir_inc, consulta))
+            return
+
+        tickets, siguiente = await _con_uow(
+            lambda uow: TicketController(uow).listar_tickets(
+                incluir_incidentes=incluir_inc,
+                limite=consulta["limite"],
+                despues_de=consulta["despues_de"],
+                filtros=consulta["filtros"],
+                orden=consulta["orden"],
+                descendente=consulta["descendente"],
+            )
+        )
+        await self._json(send, {"exito": True, "datos": tickets, "next_cursor": cursor_siguiente(consulta, siguiente)})
+
+    async def exportar_tickets(self, solicitud: Solicitud, send) -> None:
+        incluir_inc = solicitud.args.get("incluir_incidentes", "false").lower() == "true"
+        try:
+            consulta = leer_consulta_tickets(solicitud.args)
+        except ValueError as e:
+            await self._json(send, {"exito": False, "mensaje": str(e)}, 400)
+            return
+        await self._ndjson(send, self._paginas_tickets(incluir_inc, consulta))
+
+    async def listar_incidentes(self, solicitud: Solicitud, send) -> None:
+        try:
+            limite, despues_de = leer_paginacion(solicitud.args)
+        except ValueError as e:
+            await self._json(send, {"exito": False, "mensaje": str(e)}, 400)
+            return
+
+        if solicitud.acepta(MIMETYPE_NDJSON):
+            await self._ndjson(send, self._paginas_incidentes(despues_de))
+            return
+
+        incidentes, siguiente = await _con_uow(
+            lambda uow: IncidenteController(uow).listar_incidentes(limite=limite, despues_de=despues_de)
+        )
+        await self._json(send, {"exito": True, "datos": incidentes, "next_cursor": codificar_cursor(siguiente)})
+
+    async def exportar_incidentes(self, solicitud: Solicitud, send) -> None:
+        try:
+            _, despues_de = leer_paginacion(solicitud.args)
+        except ValueError as e:
+            await self._json(send, {"exito": False, "mensaje": str(e)}, 400)
+            return
+        await self._ndjson(send, self._paginas_incidentes(despues_de))
+
+    async def stream_tickets(self, solicitud: Solicitud, send) -> None:
+        try:
+            estado, empleado_id, timeout, desde = leer_parametros_stream(
+                solicitud.args,
+                solicitud.headers.get("last-event-id"),
+            )
+        except ValueError as e:
+            await self._json(send, {"exito": False, "mensaje": str(e)}, 400)
+            return
+
+        difusor = obtener_difusor()
+        suscripcion = SuscripcionAsync(estado, empleado_id, difusor.capacidad)
+        await asyncio.to_thread(difusor.registrar, suscripcion)
+        try:
+            if solicitud.acepta(MIMETYPE_SSE):
+                await self._sse(solicitud, send, suscripcion, desde)
+            else:
+                eventos, hasta = await self._esperar_eventos(suscripcion, desde, timeout)
+                await self._json(send, {"exito": True, "datos": eventos, "next_token": codificar_cursor(hasta)})
+        finally:
+            difusor.desuscribir(suscripcion)
+
+    async def _sse(self, solicitud: Solicitud, send, suscripcion: SuscripcionAsync, desde: Optional[int]) -> None:
+        desconectado = asyncio.Event()
+
+        async def vigilar_desconexion():
+            while (await solicitud.receive())["type"] != "http.disconnect":
+                pass
+            desconectado.set()
+
+        vigilancia = asyncio.create_task(vigilar_desconexion())
+        try:
+            await self._iniciar(send, 200, MIMETYPE_SSE, CABECERAS_SSE.items())
+            await self._fragmento(send, REINTENTO)
+
+            ultimo = suscripcion.desde
+            if desde is not None:
+                async for evento, ultimo in self._pendientes(suscripcion, desde):
+                    if evento is not None:
+                        await self._fragmento(send, formatear_evento(evento))
+
+            while not suscripcion.desbordada and not desconectado.is_set():
+                evento = await suscripcion.esperar_async(LATIDO_SEGUNDOS)
+                if evento is None or evento["seq"] > ultimo:
+                    await self._fragmento(send, formatear_evento(evento))
+
+            if not desconectado.is_set():
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            vigilancia.cancel()
+
+    async def _esperar_eventos(
+        self,
+        suscripcion: SuscripcionAsync,
+        desde: Optional[int],
+        timeout: float,
+    ) -> Tuple[list, int]:
+        hasta = suscripcion.desde
+        if desde is not None:
+            pendientes = [par async for par in self._pendientes(suscripcion, desde)]
+            hasta = pendientes[-1][1] if pendientes else desde
+            eventos = [evento for evento, _ in pendientes if evento is not None]
+            if eventos:
+                return eventos, hasta
+
+        limite = asyncio.get_running_loop().time() + timeout
+        while True:
+            restante = limite - asyncio.get_running_loop().time()
+            evento = await suscripcion.esperar_async(restante) if restante > 0 else None
+            if evento is None:
+                return [], hasta
+            eventos = [e for e in [evento] + suscripcion.drenar() if e["seq"] > hasta]
+            if eventos:
+                return eventos, eventos[-1]["seq"]
+
+    async def _pendientes(
+        self,
+        suscripcion: SuscripcionAsync,
+        desde: int,
+    ) -> AsyncIterator[Tuple[Optional[Dict[str, Any]], int]]:
+        while True:
+            eventos, hasta = await _con_uow(
+                lambda uow: CambioController(uow).obtener_eventos_tickets(desde, TAMANO_LOTE)
+            )
+            if hasta == desde:
+                return
+            for evento in eventos:
+                if suscripcion.acepta(evento):
+                    yield evento, evento["seq"]
+            yield None, hasta
+            desde = hasta
+
+    async def _paginas_tickets(self, incluir_incidentes: bool, consulta: Dict[str, Any]) -> AsyncIterator[Iterable[dict]]:
+        # Una sesión por página: entre páginas no se retiene ninguna conexión mientras el cliente lee.
+        despues_de = consulta["despues_de"]
+        while True:
+            tickets, despues_de = await _con_uow(
+                lambda uow: TicketController(uow).listar_tickets(
+                    incluir_incidentes=incluir_incidentes,
+                    limite=TAMANO_PAGINA_EXPORTACION,
+                    despues_de=despues_de,
+                    filtros=consulta["filtros"],
+                    orden=consulta["orden"],
+                    descendente=consulta["descendente"],
+                )
+            )
+            yield tickets
+            if despues_de is None:
+                return
+
+    async def _paginas_incidentes(self, despues_de: Optional[int]) -> AsyncIterator[Iterable[dict]]:
+        while True:
+            incidentes, despues_de = await _con_uow(
+                lambda uow: IncidenteController(uow).listar_incidentes(
+                    limite=TAMANO_PAGINA_EXPORTACION,
+                    despues_de=despues_de,
+                )
+            )
+            yield incidentes
+            if despues_de is None:
+                return
+
+    async def _json(self, send, cuerpo: Dict[str, Any], estado: int = 200) -> None:
+        contenido = self.flask.json.dumps(cuerpo).encode()
+        await self._iniciar(send, estado, "application/json", [("Content-Length", str(len(contenido)))])
+        await send({"type": "http.response.body", "body": contenido})
+
+    async def _ndjson(self, send, paginas: AsyncIterator[Iterable[dict]]) -> None:
+        await self._iniciar(send, 200, MIMETYPE_NDJSON)
+        async for pagina in paginas:
+            lineas = "".join(json.dumps(fila, ensure_ascii=False) + "\n" for fila in pagina)
+            if lineas:
+                await self._fragmento(send, lineas)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _iniciar(send, estado: int, mimetype: str, cabeceras: Iterable[Tuple[str, str]] = ()) -> None:
+        headers = [(b"content-type", mimetype.encode())]
+        headers.extend((clave.lower().encode(), valor.encode()) for clave, valor in cabeceras)
+        await send({"type": "http.response.start", "status": estado, "headers": headers})
+
+    @staticmethod
+    async def _fragmento(send, texto: str) -> None:
+        await send({"type": "http.response.body", "body": texto.encode(), "more_body": True})
+
+    async def _ciclo_de_vida(self, receive, send) -> None:
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                init_db_async()
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await close_db_async()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+app = TicketingASGI(
+    create_app(),
+    hilos_wsgi=int(os.environ.get("TICKETING_ASGI_HILOS_WSGI", "10")),
+)
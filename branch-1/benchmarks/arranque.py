@@ -0,0 +1,80 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+# (etapa, máximo en milisegundos) para un worker recién arrancado. La importación se paga
+# una sola vez en el maestro con preload_app; la primera solicitud incluye crear el engine
+# y abrir la primera conexión, ya sin DDL.
+PRESUPUESTO_MS = [
+    ("importar wsgi", 400),
+    ("primera solicitud", 50),
+    ("solicitud en caliente", 10),
+]
+
+
+def _medir_worker() -> None:
+    inicio = time.perf_counter()
+    from wsgi import app
+    importado = time.perf_counter()
+
+    cliente = app.test_client()
+    assert cliente.get("/tickets/1").status_code == 200
+    primera = time.perf_counter()
+    assert cliente.get("/tickets/1").status_code == 200
+    segunda = time.perf_counter()
+
+    print(json.dumps({
+        "importar wsgi": (importado - inicio) * 1000,
+        "primera solicitud": (primera - importado) * 1000,
+        "solicitud en caliente": (segunda - primera) * 1000,
+    }))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Tiempo de arranque en frío de un worker")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--medir", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        _medir_worker()
+        return 0
+
+    imprimir_encabezado("Arranque en frío de un worker (mediana de procesos nuevos)")
+    with base_temporal() as ruta:
+        from app import create_app
+
+        assert create_app().test_client().post("/tickets", json={
+            "cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": 1, "incidentes": [],
+        }).status_code == 201
+
+        entorno = dict(os.environ, DATABASE_URL=f"sqlite:///{ruta}")
+        muestras = []
+        for _ in range(args.repeticiones):
+            salida = subprocess.run(
+                [sys.executable, "-m", "benchmarks.arranque", "--medir"],
+                env=entorno,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            muestras.append(json.loads(salida.strip().splitlines()[-1]))
+
+    excedidos = 0
+    for etapa, maximo in PRESUPUESTO_MS:
+        mediana = statistics.median(muestra[etapa] for muestra in muestras)
+        estado = "OK" if mediana <= maximo else "EXCEDIDO"
+        if mediana > maximo:
+            excedidos += 1
+        print(f"{etapa:<25}{mediana:>10.1f} ms / {maximo:<6}{estado}")
+
+    return 1 if excedidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+RUTA_CARGA = "/tickets?limit=50"
+
+
+def _servir(modo: str, puerto: int) -> None:
+    if modo == "wsgi":
+        from werkzeug.serving import make_server
+        from app import create_app
+
+        # Mismo servidor que app.py: un hilo por conexión.
+        make_server("127.0.0.1", puerto, create_app(), threaded=True).serve_forever()
+    else:
+        import uvicorn
+
+        uvicorn.run("asgi:app", host="127.0.0.1", port=puerto, log_level="warning")
+
+
+def _hilos(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as estado:
+        for linea in estado:
+            if linea.startswith("Threads:"):
+                return int(linea.split()[1])
+    return -1
+
+
+async def _escuchar(url: str, clientes_sse: int) -> None:
+    import httpx
+
+    limites = httpx.Limits(max_connections=clientes_sse)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=None) as cliente:
+        async def escuchar():
+            async with cliente.stream("GET", "/tickets/stream", headers={"Accept": "text/event-stream"}) as respuesta:
+                async for _ in respuesta.aiter_bytes():
+                    pass
+
+        await asyncio.gather(*(escuchar() for _ in range(clientes_sse)))
+
+
+async def _medir(url: str, concurrencia: int, segundos: float, pid: int):
+    import httpx
+
+    limites = httpx.Limits(max_connections=concurrencia)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=30) as cliente:
+        latencias = []
+        fin = time.perf_counter() + segundos
+
+        async def trabajador():
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                respuesta = await cliente.get(RUTA_CARGA)
+                respuesta.raise_for_status()
+                latencias.append(time.perf_counter() - inicio)
+
+        await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+        hilos = _hilos(pid)
+
+    latencias.sort()
+    return {
+        "req_s": len(latencias) / segundos,
+        "p50": statistics.median(latencias) * 1000,
+        "p95": latencias[int(len(latencias) * 0.95) - 1] * 1000,
+        "hilos": hilos,
+    }
+
+
+def _lanzar(*argumentos: str, entorno=None) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.asgi_carga", *argumentos],
+        env=entorno,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _esperar_servidor(url: str, proceso: subprocess.Popen) -> None:
+    import httpx
+
+    for _ in range(100):
+        if proceso.poll() is not None:
+            raise RuntimeError("El servidor terminó antes de aceptar conexiones")
+        try:
+            httpx.get(f"{url}/health", timeout=1).raise_for_status()
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("El servidor no respondió a tiempo")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga concurrente sobre el modo WSGI y el modo ASGI")
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=32)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--clientes-sse", type=int, default=200)
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--servir", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--escuchar", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.servir:
+        _servir(args.servir, args.puerto)
+        return
+    if args.escuchar:
+        asyncio.run(_escuchar(f"http://127.0.0.1:{args.puerto}", args.escuchar))
+        return
+
+    imprimir_encabezado(f"GET {RUTA_CARGA} con {args.concurrencia} clientes concurrentes")
+    with base_temporal() as ruta:
+        from app import create_app
+
+        items = [{"cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": i % 10, "incidentes": []}
+                 for i in range(args.tickets)]
+        assert create_app().test_client().post("/tickets/bulk", json=items).status_code == 201
+
+        entorno = dict(os.environ, DATABASE_URL=f"sqlite:///{ruta}")
+        url = f"http://127.0.0.1:{args.puerto}"
+        resultados = []
+        for modo in ("wsgi", "asgi"):
+            for clientes_sse in (0, args.clientes_sse):
+                proceso = _lanzar("--servir", modo, "--puerto", str(args.puerto), entorno=entorno)
+                # Los clientes SSE corren en otro proceso para no competir con el generador de carga.
+                oyentes = None
+                try:
+                    _esperar_servidor(url, proceso)
+                    if clientes_sse:
+                        oyentes = _lanzar("--escuchar", str(clientes_sse), "--puerto", str(args.puerto))
+                        time.sleep(2)
+                    medicion = asyncio.run(_medir(url, args.concurrencia, args.segundos, proceso.pid))
+                finally:
+                    for subproceso in (oyentes, proceso):
+                        if subproceso is not None:
+                            subproceso.terminate()
+                            subproceso.wait()
+                resultados.append((modo, clientes_sse, medicion))
+
+    print(f"{'modo':<6}{'SSE abiertos':>14}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'hilos':>8}")
+    for modo, clientes_sse, medicion in resultados:
+        print(
+            f"{modo:<6}{clientes_sse:>14}{medicion['req_s']:>10.0f}"
+            f"{medicion['p50']:>10.1f}{medicion['p95']:>10.1f}{medicion['hilos']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
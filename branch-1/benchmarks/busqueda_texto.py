@@ -0,0 +1,97 @@
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime
+from sqlalchemy import insert
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+VOCABULARIO = (
+    "disco duro sólido memoria ram placa madre fuente poder pantalla monitor teclado mouse impresora "
+    "escáner red wifi cable router switch servidor correo outlook navegador chrome actualización "
+    "windows linux licencia antivirus virus contraseña usuario bloqueado acceso vpn firewall lento "
+    "error falla ruido reinicia apaga enciende congelado azul crítico urgente backup respaldo "
+    "archivo carpeta permisos compartida nube sincronización telefono celular batería cargador"
+).split()
+# Términos frecuentes (miles de coincidencias que hay que rankear), un equipo puntual y uno inexistente.
+CONSULTAS = ["disco duro", "impresora", "red wifi lento", "pantalla azul", "pc01234 lento", "pc99999999"]
+TAMANO_LOTE = 20000
+
+
+def _cargar(session, incidentes: int, semilla: int) -> float:
+    from models.ticket import Ticket
+    from models.incidente import Incidente, CATEGORIAS, PRIORIDADES
+
+    generador = random.Random(semilla)
+    inicio = time.perf_counter()
+    tickets = max(1, incidentes // 3)
+    session.execute(insert(Ticket.__table__), [
+        {"cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": i % 10,
+         "estado": "Abierto", "fecha_creacion": datetime(2025, 1, 1), "version": 1}
+        for i in range(tickets)
+    ])
+    for desde in range(0, incidentes, TAMANO_LOTE):
+        session.execute(insert(Incidente.__table__), [
+            {
+                "descripcion": " ".join(generador.choices(VOCABULARIO, k=generador.randint(4, 14)))
+                + f" equipo pc{generador.randrange(max(1, incidentes // 10)):05d}",
+                "categoria": generador.choice(CATEGORIAS),
+                "prioridad": generador.choice(PRIORIDADES),
+                "ticket_id": 1 + i % tickets,
+                "version": 1,
+            }
+            for i in range(desde, min(desde + TAMANO_LOTE, incidentes))
+        ])
+    session.commit()
+    return incidentes / (time.perf_counter() - inicio)
+
+
+def _latencias(buscar, repeticiones: int) -> dict:
+    resultados = {}
+    for consulta in CONSULTAS:
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            buscar(consulta)
+            tiempos.append((time.perf_counter() - inicio) * 1000)
+        resultados[consulta] = statistics.median(tiempos)
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Búsqueda de texto en incidentes: FTS5 contra LIKE")
+    parser.add_argument("--incidentes", type=int, default=1_000_000)
+    parser.add_argument("--limite", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    imprimir_encabezado(f"Búsqueda de texto sobre {args.incidentes} incidentes (primera página de {args.limite})")
+    with base_temporal():
+        from database.db import get_session
+        from database.busqueda import BusquedaFTS5, BusquedaLike
+
+        session = get_session()
+        velocidad = _cargar(session, args.incidentes, args.semilla)
+        print(f"Carga con índice FTS5 sincronizado por triggers: {velocidad:.0f} incidentes/s")
+
+        fts, like = BusquedaFTS5(), BusquedaLike()
+        paginas = {}
+
+        def con_fts(consulta):
+            paginas[consulta] = fts.buscar(session, consulta, args.limite)
+
+        def con_like(consulta):
+            like.buscar(session, consulta, args.limite)
+
+        tiempos_fts = _latencias(con_fts, args.repeticiones)
+        tiempos_like = _latencias(con_like, args.repeticiones)
+
+        print(f"{'consulta':<24}{'FTS5 ms':>10}{'LIKE ms':>10}{'resultado 1':>40}")
+        for consulta in CONSULTAS:
+            primero = paginas[consulta][0][2] if paginas[consulta] else "-"
+            print(f"{consulta:<24}{tiempos_fts[consulta]:>10.1f}{tiempos_like[consulta]:>10.1f}  {primero[:38]}")
+
+
+if __name__ == "__main__":
+    main()
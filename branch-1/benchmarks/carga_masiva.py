@@ -0,0 +1,49 @@
+import argparse
+from benchmarks.comun import base_temporal, medir, imprimir_encabezado
+
+
+def _ticket(indice: int) -> dict:
+    return {
+        "cliente_id": 1,
+        "servicio_id": 1,
+        "equipo_id": 1,
+        "empleado_id": indice % 10,
+        "incidentes": [
+            {"descripcion": f"Alerta de monitoreo {indice}", "categoria": "Red", "prioridad": "Alta"},
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="POST /tickets en bucle contra POST /tickets/bulk")
+    parser.add_argument("--tickets", type=int, default=2000)
+    args = parser.parse_args()
+
+    imprimir_encabezado(f"Creación de {args.tickets} tickets")
+    with base_temporal():
+        from app import create_app
+
+        cliente = create_app().test_client()
+        items = [_ticket(i) for i in range(args.tickets)]
+
+        def en_bucle():
+            for item in items:
+                assert cliente.post("/tickets", json=item).status_code == 201
+            return len(items)
+
+        def en_bloque():
+            respuesta = cliente.post("/tickets/bulk", json=items)
+            assert respuesta.status_code == 201 and len(respuesta.get_json()["creados"]) == len(items)
+            return len(items)
+
+        individual = medir(en_bucle)
+        bloque = medir(en_bloque)
+
+    print(f"{'modo':<20}{'tickets/s':>12}")
+    print(f"{'POST /tickets':<20}{individual:>12.0f}")
+    print(f"{'POST /tickets/bulk':<20}{bloque:>12.0f}")
+    print(f"Aceleración: {bloque / individual:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+
+@contextmanager
+def base_temporal(perfil: Optional[str] = None) -> Iterator[str]:
+    """Inicializa la base en un directorio temporal y la cierra al terminar."""
+    from database.db import migrar_db, close_db
+
+    directorio = tempfile.mkdtemp(prefix="ticketing-bench-")
+    ruta = os.path.join(directorio, "bench.db")
+    migrar_db(ruta, perfil=perfil)
+    try:
+        yield ruta
+    finally:
+        close_db()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+def medir(funcion: Callable[[], int]) -> float:
+    """Ejecuta funcion (que devuelve la cantidad de operaciones) y retorna operaciones por segundo."""
+    inicio = time.perf_counter()
+    operaciones = funcion()
+    return operaciones / (time.perf_counter() - inicio)
+
+
+def imprimir_encabezado(titulo: str) -> None:
+    print("=" * 60)
+    print(f" {titulo}")
+    print("=" * 60)
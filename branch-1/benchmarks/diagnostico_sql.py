@@ -0,0 +1,62 @@
+import argparse
+import sys
+from benchmarks.comun import base_temporal, imprimir_encabezado
+from benchmarks.sentencias_sql import PRESUPUESTO, TICKET
+
+
+def _detecta_n_mas_1(maximo: int) -> bool:
+    """Control del propio detector: recorrer la relación lazy de varios tickets tiene que fallar."""
+    from database.db import get_session, close_session
+    from database.diagnostico import ConsultasRepetidasError
+    from database.repositories.ticket_repository import TicketRepository
+
+    try:
+        tickets = TicketRepository(get_session()).listar_todos(limite=maximo + 1)
+        sum(len(ticket.incidentes) for ticket in tickets)
+    except ConsultasRepetidasError:
+        return True
+    finally:
+        close_session()
+    return False
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Endpoints sin N+1 bajo el diagnóstico SQL estricto")
+    parser.add_argument("--maximo-repeticiones", type=int, default=5)
+    parser.add_argument("--lentas-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    imprimir_encabezado(f"Diagnóstico SQL estricto: máximo {args.maximo_repeticiones} repeticiones por request")
+    fallos = 0
+    with base_temporal():
+        from app import create_app
+        from database.db import configurar_diagnostico, quitar_diagnostico
+
+        cliente = create_app().test_client()
+        for _ in range(args.maximo_repeticiones + 1):
+            assert cliente.post("/tickets", json=TICKET).status_code == 201
+
+        diagnostico = configurar_diagnostico(args.lentas_ms, args.maximo_repeticiones, estricto=True)
+        for metodo, ruta, cuerpo, _ in PRESUPUESTO:
+            repetidas = len(diagnostico.repetidas)
+            respuesta = cliente.open(ruta, method=metodo, json=cuerpo)
+            estado = "OK" if len(diagnostico.repetidas) == repetidas else "N+1"
+            if estado != "OK":
+                fallos += 1
+            print(f"{metodo:<7}{ruta:<45}{respuesta.status_code:>5}  {estado}")
+
+        detectado = _detecta_n_mas_1(args.maximo_repeticiones)
+        print(f"{'Control: carga lazy de incidentes en un bucle':<52}  {'detectado' if detectado else 'NO DETECTADO'}")
+        fallos += 0 if detectado else 1
+
+        for lenta in diagnostico.lentas:
+            print(f"Lenta ({lenta['milisegundos']:.1f} ms): {' '.join(lenta['sentencia'].split())[:100]}")
+            for paso in lenta["plan"]:
+                print(f"    {paso}")
+        quitar_diagnostico()
+
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
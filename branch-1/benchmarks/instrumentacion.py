@@ -0,0 +1,51 @@
+import argparse
+import os
+from benchmarks.comun import base_temporal, imprimir_encabezado, medir
+
+RUTAS = ["/tickets/1", "/tickets?limit=50", "/incidentes?limit=50"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Costo de la instrumentación por request, desactivada y activada")
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+
+    imprimir_encabezado(f"{args.requests} requests por ruta, instrumentación desactivada y activada")
+    # Sin cache de respuestas, para que cada GET recorra controlador, repositorio y SQL.
+    os.environ["TICKETING_CACHE_BACKEND"] = "ninguno"
+    with base_temporal():
+        from app import create_app
+
+        cliente = create_app().test_client()
+        items = [
+            {"cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": i % 10,
+             "incidentes": [{"descripcion": "Falla", "categoria": "Red", "prioridad": "Media"}]}
+            for i in range(args.tickets)
+        ]
+        assert cliente.post("/tickets/bulk", json=items).status_code == 201
+
+        resultados = {}
+        # Activarla envuelve las clases del proceso, así que la medición desactivada va primero.
+        for estado in ("desactivada", "activada"):
+            os.environ["TICKETING_INSTRUMENTACION"] = "1" if estado == "activada" else "0"
+            cliente = create_app().test_client()
+            for ruta in RUTAS:
+                def recorrer() -> int:
+                    for _ in range(args.requests):
+                        assert cliente.get(ruta).status_code == 200
+                    return args.requests
+
+                recorrer()
+                resultados[(estado, ruta)] = medir(recorrer)
+        os.environ.pop("TICKETING_INSTRUMENTACION", None)
+        os.environ.pop("TICKETING_CACHE_BACKEND", None)
+
+    print(f"{'ruta':<26}{'desactivada req/s':>19}{'activada req/s':>16}{'costo':>9}")
+    for ruta in RUTAS:
+        desactivada, activada = resultados[("desactivada", ruta)], resultados[("activada", ruta)]
+        print(f"{ruta:<26}{desactivada:>19.0f}{activada:>16.0f}{(desactivada / activada - 1) * 100:>8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import os
+import random
+from sqlalchemy import insert
+from benchmarks.comun import base_temporal, imprimir_encabezado, medir
+
+
+def _cargar(session, tickets: int) -> None:
+    from datetime import datetime
+    from models.ticket import Ticket
+
+    session.execute(insert(Ticket.__table__), [
+        {"cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": i % 10,
+         "estado": "Abierto", "fecha_creacion": datetime(2025, 1, 1), "version": 1}
+        for i in range(tickets)
+    ])
+    session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Operaciones por segundo de TicketRepository.obtener_por_id")
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--operaciones", type=int, default=20000)
+    parser.add_argument("--repetidos", type=int, default=100, help="Ids distintos en la pasada con una misma sesión")
+    parser.add_argument(
+        "--query-cache-size", type=int, default=None,
+        help="Tamaño de la caché de sentencias compiladas (0 la desactiva); por defecto el del perfil",
+    )
+    args = parser.parse_args()
+    if args.query_cache_size is not None:
+        os.environ["TICKETING_DB_QUERY_CACHE_SIZE"] = str(args.query_cache_size)
+
+    imprimir_encabezado(f"obtener_por_id sobre {args.tickets} tickets, {args.operaciones} llamadas por caso")
+    with base_temporal():
+        from database.db import get_session, close_session, estadisticas_cache_sql
+        from database.repositories.ticket_repository import TicketRepository
+
+        _cargar(get_session(), args.tickets)
+        close_session()
+        azar = random.Random(7)
+        ids = [azar.randint(1, args.tickets) for _ in range(args.operaciones)]
+        repetidos = [ids[i % args.repetidos] for i in range(args.operaciones)]
+
+        def sesion_por_llamada() -> int:
+            # Como un request: sesión nueva, una búsqueda y cierre.
+            for ticket_id in ids:
+                assert TicketRepository(get_session()).obtener_por_id(ticket_id) is not None
+                close_session()
+            return len(ids)
+
+        def misma_sesion() -> int:
+            # El mapa de identidad guarda referencias débiles: como en un request, los
+            # tickets ya leídos siguen vivos mientras dura la sesión.
+            repo = TicketRepository(get_session())
+            vivos = [repo.obtener_por_id(ticket_id) for ticket_id in repetidos]
+            assert all(vivos)
+            close_session()
+            return len(repetidos)
+
+        sesion_por_llamada()
+        print(f"{'sesión nueva por llamada':<34}{medir(sesion_por_llamada):>12.0f} ops/s")
+        print(f"{f'misma sesión, {args.repetidos} ids repetidos':<34}{medir(misma_sesion):>12.0f} ops/s")
+        print(f"caché de sentencias: {estadisticas_cache_sql()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import random
+import threading
+from benchmarks.comun import base_temporal, medir, imprimir_encabezado
+
+
+def _escribir(hilos: int, tickets_por_hilo: int, errores: list) -> int:
+    from database.db import close_session
+    from database.repositories.ticket_repository import TicketRepository
+    from models.ticket import Ticket
+    from models.incidente import Incidente
+
+    def trabajo():
+        repo = TicketRepository()
+        try:
+            for i in range(tickets_por_hilo):
+                ticket = Ticket(cliente_id=1, servicio_id=1, equipo_id=1, empleado_id=i % 10)
+                ticket.incidentes.append(Incidente("Bench", "Hardware", "Alta", ticket_id=0))
+                try:
+                    repo.crear(ticket)
+                    repo.session.commit()
+                except Exception as e:
+                    repo.session.rollback()
+                    errores.append(e)
+        finally:
+            close_session()
+
+    ejecutar = [threading.Thread(target=trabajo) for _ in range(hilos)]
+    for hilo in ejecutar:
+        hilo.start()
+    for hilo in ejecutar:
+        hilo.join()
+    return hilos * tickets_por_hilo
+
+
+def _leer(hilos: int, lecturas_por_hilo: int, maximo_id: int) -> int:
+    from database.db import close_session
+    from database.repositories.ticket_repository import TicketRepository
+
+    def trabajo():
+        repo = TicketRepository()
+        try:
+            for _ in range(lecturas_por_hilo):
+                repo.obtener_para_lectura(random.randint(1, maximo_id))
+                repo.session.rollback()
+        finally:
+            close_session()
+
+    ejecutar = [threading.Thread(target=trabajo) for _ in range(hilos)]
+    for hilo in ejecutar:
+        hilo.start()
+    for hilo in ejecutar:
+        hilo.join()
+    return hilos * lecturas_por_hilo
+
+
+def _mixto(hilos: int, tickets_por_hilo: int, lecturas_por_hilo: int, errores: list) -> int:
+    lectores = threading.Thread(target=_leer, args=(hilos, lecturas_por_hilo, hilos * tickets_por_hilo))
+    lectores.start()
+    _escribir(hilos, tickets_por_hilo, errores)
+    lectores.join()
+    return hilos * tickets_por_hilo + hilos * lecturas_por_hilo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput de escritura y lectura por perfil SQLite")
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--tickets", type=int, default=250, help="Tickets creados por hilo")
+    parser.add_argument("--lecturas", type=int, default=2000, help="Lecturas por hilo")
+    parser.add_argument("--perfiles", nargs="+", default=["basico", "produccion"])
+    args = parser.parse_args()
+
+    imprimir_encabezado("Benchmark de perfiles SQLite")
+    resultados = []
+    for perfil in args.perfiles:
+        with base_temporal(perfil):
+            errores = []
+            escrituras = medir(lambda: _escribir(args.hilos, args.tickets, errores))
+            lecturas = medir(lambda: _leer(args.hilos, args.lecturas, args.hilos * args.tickets))
+            mixto = medir(lambda: _mixto(args.hilos, args.tickets, args.lecturas, errores))
+        resultados.append((perfil, escrituras, lecturas, mixto, len(errores)))
+
+    print(f"{'perfil':<12}{'escrituras/s':>14}{'lecturas/s':>14}{'mixto ops/s':>14}{'errores':>10}")
+    for perfil, escrituras, lecturas, mixto, errores in resultados:
+        print(f"{perfil:<12}{escrituras:>14.0f}{lecturas:>14.0f}{mixto:>14.0f}{errores:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import itertools
+import sys
+from urllib.parse import urlencode
+from sqlalchemy import event
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+FILTROS = {
+    "estado": "Abierto",
+    "cliente_id": "1",
+    "empleado_id": "2",
+    "equipo_id": "3",
+    "creado_desde": "2024-01-01",
+    "creado_hasta": "2030-01-01",
+    "categoria": "Red",
+    "prioridad": "Alta",
+}
+ORDENES = ["id", "-id", "fecha_creacion", "-fecha_creacion", "cantidad_incidentes", "-cantidad_incidentes"]
+
+
+def main() -> int:
+    """Verifica que cada combinación de filtros y orden de GET /tickets sea una única sentencia indexada."""
+    imprimir_encabezado("Planes de consulta de GET /tickets")
+    with base_temporal():
+        from app import create_app
+        from database import db
+
+        sentencias = []
+        event.listen(db._engine, "before_cursor_execute", lambda *args: sentencias.append((args[2], args[3])))
+
+        cliente = create_app().test_client()
+        combinaciones = sin_indice = con_ordenamiento = 0
+        for cantidad in range(len(FILTROS) + 1):
+            for campos in itertools.combinations(FILTROS, cantidad):
+                for orden in ORDENES:
+                    sentencias.clear()
+                    consulta = dict({campo: FILTROS[campo] for campo in campos}, sort=orden, limit=50)
+                    assert cliente.get(f"/tickets?{urlencode(consulta)}").status_code == 200
+                    combinaciones += 1
+                    if len(sentencias) != 1:
+                        print(f"{len(sentencias)} sentencias: {consulta}")
+                        sin_indice += 1
+                        continue
+
+                    sql, parametros = sentencias[0]
+                    conexion = db._engine.raw_connection()
+                    try:
+                        plan = [fila[3] for fila in conexion.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)]
+                    finally:
+                        conexion.close()
+                    # Recorrer tickets sin índice sólo es aceptable en el orden de la clave primaria.
+                    if "SCAN tickets" in plan and orden.lstrip("-") != "id":
+                        print(f"Sin índice: {consulta} -> {' | '.join(plan)}")
+                        sin_indice += 1
+                    if any("TEMP B-TREE" in paso for paso in plan):
+                        con_ordenamiento += 1
+
+    print(f"{combinaciones} combinaciones, {sin_indice} sin índice, "
+          f"{con_ordenamiento} ordenan en memoria el subconjunto filtrado")
+    return 1 if sin_indice else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from sqlalchemy import insert
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+TAMANO_LOTE = 20000
+
+
+def _cargar(session, incidentes: int) -> None:
+    from datetime import datetime
+    from models.ticket import Ticket
+    from models.incidente import Incidente, CATEGORIAS, PRIORIDADES
+
+    tickets = max(1, incidentes // 4)
+    session.execute(insert(Ticket.__table__), [
+        {"cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": i % 10,
+         "estado": "Abierto", "fecha_creacion": datetime(2025, 1, 1), "version": 1}
+        for i in range(tickets)
+    ])
+    for desde in range(0, incidentes, TAMANO_LOTE):
+        session.execute(insert(Incidente.__table__), [
+            {"descripcion": f"Falla {i} reportada por el usuario", "categoria": CATEGORIAS[i % 4],
+             "prioridad": PRIORIDADES[i % 4], "ticket_id": 1 + i % tickets, "version": 1}
+            for i in range(desde, min(desde + TAMANO_LOTE, incidentes))
+        ])
+    session.commit()
+
+
+def _memoria_por_fila(session, cargar) -> float:
+    """Bytes retenidos por fila mientras el resultado está vivo, incluido lo que guarda la sesión."""
+    session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    filas = cargar()
+    retenidos = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    cantidad = len(filas)
+    del filas
+    session.expunge_all()
+    return retenidos / cantidad
+
+
+def _latencia_ms(session, listar, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        session.expunge_all()
+        gc.collect()
+        inicio = time.perf_counter()
+        listar()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Listados de incidentes: instancias ORM contra filas proyectadas")
+    parser.add_argument("--incidentes", type=int, default=100_000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    imprimir_encabezado(f"Listado de {args.incidentes} incidentes en una página")
+    with base_temporal():
+        from database.db import get_session
+        from database.repositories.incidente_repository import IncidenteRepository
+        from models.incidente import Incidente
+
+        session = get_session()
+        _cargar(session, args.incidentes)
+        repo = IncidenteRepository(session)
+        total = args.incidentes
+        caminos = {
+            "instancias ORM": (
+                lambda: repo.listar_todos(limite=total),
+                lambda: [incidente.to_dict() for incidente in repo.listar_todos(limite=total)],
+            ),
+            "filas proyectadas": (
+                lambda: repo.listar_filas(limite=total),
+                lambda: [Incidente.representar(fila) for fila in repo.listar_filas(limite=total)],
+            ),
+            "categoría, instancias ORM": (
+                lambda: repo.filtrar_por_categoria("Red", limite=total),
+                lambda: [incidente.to_dict() for incidente in repo.filtrar_por_categoria("Red", limite=total)],
+            ),
+            "categoría, filas proyectadas": (
+                lambda: repo.filtrar_filas_por_categoria("Red", limite=total),
+                lambda: [Incidente.representar(fila) for fila in repo.filtrar_filas_por_categoria("Red", limite=total)],
+            ),
+        }
+
+        print(f"{'camino':<30}{'bytes/fila':>12}{'consulta ms':>13}{'con dicts ms':>14}")
+        for nombre, (cargar, listar) in caminos.items():
+            memoria = _memoria_por_fila(session, cargar)
+            consulta = _latencia_ms(session, cargar, args.repeticiones)
+            con_dicts = _latencia_ms(session, listar, args.repeticiones)
+            print(f"{nombre:<30}{memoria:>12.0f}{consulta:>13.1f}{con_dicts:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select, update
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+TAMANO_LOTE = 20000
+INICIO = datetime(2023, 1, 1)
+
+
+def _cargar(session, tickets: int, dias: int, semilla: int) -> None:
+    from models.ticket import Ticket
+    from models.incidente import Incidente, CATEGORIAS, PRIORIDADES
+
+    generador = random.Random(semilla)
+    for desde in range(0, tickets, TAMANO_LOTE):
+        filas = []
+        for _ in range(desde, min(desde + TAMANO_LOTE, tickets)):
+            creacion = INICIO + timedelta(seconds=generador.randrange(dias * 86400))
+            cerrado = generador.random() < 0.6
+            filas.append({
+                "cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": generador.randrange(50),
+                "estado": "Cerrado" if cerrado else generador.choice(["Abierto", "En Progreso", "Reabierto"]),
+                "fecha_creacion": creacion,
+                "fecha_cierre": creacion + timedelta(hours=generador.randrange(1, 240)) if cerrado else None,
+                "version": 1,
+            })
+        session.execute(insert(Ticket.__table__), filas)
+    for desde in range(0, tickets * 2, TAMANO_LOTE):
+        session.execute(insert(Incidente.__table__), [
+            {"descripcion": "x", "categoria": generador.choice(CATEGORIAS), "prioridad": generador.choice(PRIORIDADES),
+             "ticket_id": 1 + i % tickets, "version": 1}
+            for i in range(desde, min(desde + TAMANO_LOTE, tickets * 2))
+        ])
+    session.commit()
+
+
+def _mediana_ms(funcion, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Series temporales: tablas base contra resúmenes diarios")
+    parser.add_argument("--tickets", type=int, default=300_000)
+    parser.add_argument("--dias", type=int, default=3 * 365)
+    parser.add_argument("--cambios", type=int, default=1000)
+    parser.add_argument("--hilos", type=int, default=4)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=7)
+    args = parser.parse_args()
+
+    imprimir_encabezado(f"Series diarias sobre {args.tickets} tickets y {args.tickets * 2} incidentes en {args.dias} días")
+    with base_temporal():
+        from database.db import get_session
+        from database.cambios import ACTUALIZAR, registrar_cambios
+        from database.repositories.resumen_repository import ResumenRepository
+        from database.resumenes import actualizar_resumenes, reconstruir_resumenes
+        from models.incidente import Incidente
+        from models.ticket import Ticket
+
+        session = get_session()
+        _cargar(session, args.tickets, args.dias, args.semilla)
+
+        for hilos in sorted({1, args.hilos}):
+            inicio = time.perf_counter()
+            resultado = reconstruir_resumenes(session, hilos=hilos)
+            session.commit()
+            print(f"Reconstrucción con {hilos} hilo(s): {time.perf_counter() - inicio:.2f} s "
+                  f"({resultado['lotes']} lotes, {resultado['filas']} filas)")
+
+        # Cierres registrados como lo haría la API: primero sobre tickets de la última semana,
+        # el caso habitual, y después sobre tickets de cualquier fecha.
+        generador = random.Random(args.semilla)
+        recientes = session.execute(
+            select(Ticket.id).where(Ticket.fecha_creacion >= INICIO + timedelta(days=args.dias - 7))
+        ).scalars().all()
+        escenarios = {
+            "recientes": generador.sample(recientes, min(args.cambios, len(recientes))),
+            "dispersos": generador.sample(range(1, args.tickets + 1), min(args.cambios, args.tickets)),
+        }
+        for nombre, ids in escenarios.items():
+            session.execute(
+                update(Ticket).where(Ticket.id.in_(ids)).values(estado="Cerrado", fecha_cierre=datetime.now()),
+                execution_options={"synchronize_session": False},
+            )
+            registrar_cambios(session, [("ticket", ACTUALIZAR, ticket_id, ticket_id) for ticket_id in ids])
+            session.commit()
+            inicio = time.perf_counter()
+            resultado = actualizar_resumenes(session)
+            session.commit()
+            print(f"Pasada incremental tras {len(ids)} cierres {nombre}: {(time.perf_counter() - inicio) * 1000:.0f} ms "
+                  f"({resultado['dias']} días recalculados)")
+
+        dia = func.date(Ticket.fecha_creacion)
+        directas = {
+            "tickets por día y estado": select(dia, Ticket.estado, func.count()).group_by(dia, Ticket.estado),
+            "incidentes por día y categoría": select(dia, Incidente.categoria, func.count())
+            .join_from(Incidente, Ticket, Ticket.id == Incidente.ticket_id)
+            .group_by(dia, Incidente.categoria),
+        }
+        resumenes = ResumenRepository(session)
+        desde_resumen = {
+            "tickets por día y estado": lambda: resumenes.serie("tickets", "estado"),
+            "incidentes por día y categoría": lambda: resumenes.serie("incidentes", "categoria"),
+        }
+
+        print(f"{'serie':<34}{'tablas base ms':>16}{'resúmenes ms':>16}")
+        for nombre, query in directas.items():
+            base = _mediana_ms(lambda: session.execute(query).all(), args.repeticiones)
+            resumen = _mediana_ms(desde_resumen[nombre], args.repeticiones)
+            print(f"{nombre:<34}{base:>16.1f}{resumen:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
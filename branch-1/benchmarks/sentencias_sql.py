@@ -0,0 +1,63 @@
+import sys
+from sqlalchemy import event
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+TICKET = {
+    "cliente_id": 1,
+    "servicio_id": 1,
+    "equipo_id": 1,
+    "empleado_id": 1,
+    "incidentes": [
+        {"descripcion": "Pantalla no enciende", "categoria": "Hardware", "prioridad": "Alta"},
+        {"descripcion": "Sin red", "categoria": "Red", "prioridad": "Media"},
+    ],
+}
+
+# (método, ruta, cuerpo, máximo de sentencias SQL sin contar COMMIT)
+PRESUPUESTO = [
+    # Cada escritura suma un único INSERT al registro de cambios por flush.
+    ("POST", "/tickets", dict(TICKET, incidentes=[]), 2),
+    ("POST", "/tickets", TICKET, 4),
+    ("POST", "/incidentes", {"descripcion": "Teclado", "categoria": "Hardware", "prioridad": "Baja", "ticket_id": 1}, 3),
+    ("POST", "/tickets/1/incidentes", {"descripcion": "Mouse", "categoria": "Hardware", "prioridad": "Baja"}, 4),
+    # Las lecturas individuales consultan antes la versión para poder responder 304.
+    ("GET", "/tickets/1", None, 3),
+    ("GET", "/tickets?limit=50", None, 1),
+    ("GET", "/tickets?limit=50&incluir_incidentes=true", None, 2),
+    ("GET", "/tickets?estado=Abierto&categoria=Hardware&prioridad=Alta&sort=-fecha_creacion&limit=50", None, 1),
+    ("GET", "/incidentes?limit=50", None, 1),
+    ("GET", "/incidentes/ticket/1", None, 2),
+    # Una consulta GROUP BY por agregado.
+    ("GET", "/stats?desde=2020-01-01", None, 4),
+    ("PUT", "/tickets/1/estado", {"estado": "En Progreso"}, 3),
+    ("PUT", "/tickets/1/cerrar", None, 3),
+    ("PUT", "/tickets/1/reabrir", None, 3),
+    ("DELETE", "/incidentes/1", None, 4),
+]
+
+
+def main() -> int:
+    imprimir_encabezado("Sentencias SQL por endpoint")
+    excedidos = 0
+    with base_temporal():
+        from app import create_app
+        from database import db
+
+        sentencias = []
+        event.listen(db._engine, "before_cursor_execute", lambda *args: sentencias.append(args[2]))
+
+        cliente = create_app().test_client()
+        for metodo, ruta, cuerpo, maximo in PRESUPUESTO:
+            sentencias.clear()
+            respuesta = cliente.open(ruta, method=metodo, json=cuerpo)
+            cantidad = len(sentencias)
+            estado = "OK" if cantidad <= maximo else "EXCEDIDO"
+            if cantidad > maximo:
+                excedidos += 1
+            print(f"{metodo:<7}{ruta:<45}{respuesta.status_code:>5}{cantidad:>4} / {maximo:<3}{estado}")
+
+    return 1 if excedidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import argparse
+import json
+import os
+import time
+from benchmarks.comun import base_temporal, imprimir_encabezado
+
+CAMINOS = [
+    ("orm", "estandar"),
+    ("orm", "orjson"),
+    ("filas", "estandar"),
+    ("filas", "orjson"),
+]
+
+
+def _recorrer(cliente, ruta: str) -> tuple:
+    """Recorre todas las páginas siguiendo next_cursor; devuelve (bytes, páginas, tickets)."""
+    total_bytes = paginas = tickets = 0
+    cursor = None
+    while True:
+        respuesta = cliente.get(ruta + (f"&after={cursor}" if cursor else ""))
+        assert respuesta.status_code == 200, respuesta.status_code
+        cuerpo = respuesta.get_data()
+        total_bytes += len(cuerpo)
+        paginas += 1
+        datos = json.loads(cuerpo)
+        tickets += len(datos["datos"])
+        cursor = datos["next_cursor"]
+        if not cursor:
+            return total_bytes, paginas, tickets
+
+
+def _normalizar(cliente, ruta: str) -> list:
+    datos = json.loads(cliente.get(ruta).get_data())["datos"]
+    for ticket in datos:
+        ticket["incidentes"].sort(key=lambda incidente: incidente["id"])
+    return datos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes/s de GET /tickets?incluir_incidentes=true por camino de serialización")
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--incidentes-por-ticket", type=int, default=3)
+    parser.add_argument("--limite", type=int, default=500)
+    parser.add_argument("--pasadas", type=int, default=3)
+    args = parser.parse_args()
+
+    ruta = f"/tickets?incluir_incidentes=true&limit={args.limite}"
+    imprimir_encabezado(f"GET {ruta} sobre {args.tickets} tickets con {args.incidentes_por_ticket} incidentes")
+    with base_temporal():
+        from app import create_app
+
+        incidentes = [
+            {"descripcion": f"Falla número {i} en el equipo", "categoria": "Hardware", "prioridad": "Alta"}
+            for i in range(args.incidentes_por_ticket)
+        ]
+        cliente = create_app().test_client()
+        for inicio in range(0, args.tickets, 10000):
+            items = [
+                {"cliente_id": 1, "servicio_id": 1, "equipo_id": 1, "empleado_id": i % 10, "incidentes": incidentes}
+                for i in range(inicio, min(inicio + 10000, args.tickets))
+            ]
+            assert cliente.post("/tickets/bulk", json=items).status_code == 201
+
+        resultados = []
+        referencia = None
+        for listados, proveedor in CAMINOS:
+            os.environ["TICKETING_LISTADOS"] = listados
+            os.environ["TICKETING_JSON"] = proveedor
+            cliente = create_app().test_client()
+
+            pagina = _normalizar(cliente, ruta)
+            referencia = referencia if referencia is not None else pagina
+            assert pagina == referencia, f"{listados}/{proveedor} devuelve otra página"
+
+            _recorrer(cliente, ruta)
+            inicio = time.perf_counter()
+            total_bytes = paginas = 0
+            for _ in range(args.pasadas):
+                leidos, leidas, _ = _recorrer(cliente, ruta)
+                total_bytes += leidos
+                paginas += leidas
+            segundos = time.perf_counter() - inicio
+            resultados.append((listados, proveedor, total_bytes / segundos, paginas / segundos, segundos * 1000 / paginas))
+
+        for variable in ("TICKETING_LISTADOS", "TICKETING_JSON"):
+            os.environ.pop(variable, None)
+
+    base = resultados[0][3]
+    print(f"{'listado':<8}{'json':<10}{'MB/s':>8}{'páginas/s':>12}{'ms/página':>12}{'mejora':>9}")
+    for listados, proveedor, bytes_s, paginas_s, ms in resultados:
+        print(f"{listados:<8}{proveedor:<10}{bytes_s / 1e6:>8.2f}{paginas_s:>12.1f}{ms:>12.1f}{paginas_s / base:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
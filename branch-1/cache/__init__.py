@@ -0,0 +1,12 @@
+from .backends import BackendCache, MemoriaLRU, RedisBackend
+from .respuestas import CacheRespuestas, obtener_cache, obtener_cache_estadisticas, configurar_cache
+
+__all__ = [
+    "BackendCache",
+    "MemoriaLRU",
+    "RedisBackend",
+    "CacheRespuestas",
+    "obtener_cache",
+    "obtener_cache_estadisticas",
+    "configurar_cache",
+]
@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+
+class BackendCache(ABC):
+    """Interfaz mínima que debe cumplir un almacenamiento de cache."""
+    
+    @abstractmethod
+    def obtener(self, clave: str) -> Optional[Any]:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def guardar(self, clave: str, valor: Any) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def eliminar(self, claves: Iterable[str]) -> None:
+        raise NotImplementedError
+    
+    @abstractmethod
+    def limpiar(self) -> None:
+        raise NotImplementedError
+
+
+class MemoriaLRU(BackendCache):
+    """LRU acotada en memoria del proceso, con expiración por TTL."""
+    
+    def __init__(self, max_entradas: int = 10000, ttl: float = 30.0):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self._entradas: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def obtener(self, clave: str) -> Optional[Any]:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None:
+                return None
+            expira, valor = entrada
+            if expira < time.monotonic():
+                del self._entradas[clave]
+                return None
+            self._entradas.move_to_end(clave)
+            return valor
+    
+    def guardar(self, clave: str, valor: Any) -> None:
+        with self._lock:
+            self._entradas[clave] = (time.monotonic() + self.ttl, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+    
+    def eliminar(self, claves: Iterable[str]) -> None:
+        with self._lock:
+            for clave in claves:
+                self._entradas.pop(clave, None)
+    
+    def limpiar(self) -> None:
+        with self._lock:
+            self._entradas.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+
+class RedisBackend(BackendCache):
+    """Cache compartida entre procesos. Requiere el paquete opcional 'redis'."""
+    
+    def __init__(self, url: str, ttl: float = 30.0, prefijo: str = "ticketing:"):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("El backend de cache 'redis' requiere instalar el paquete redis") from e
+        
+        self._cliente = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefijo = prefijo
+    
+    def obtener(self, clave: str) -> Optional[Any]:
+        valor = self._cliente.get(self.prefijo + clave)
+        return json.loads(valor) if valor is not None else None
+    
+    def guardar(self, clave: str, valor: Any) -> None:
+        self._cliente.set(self.prefijo + clave, json.dumps(valor), px=int(self.ttl * 1000))
+    
+    def eliminar(self, claves: Iterable[str]) -> None:
+        claves = [self.prefijo + clave for clave in claves]
+        if claves:
+            self._cliente.delete(*claves)
+    
+    def limpiar(self) -> None:
+        for clave in self._cliente.scan_iter(self.prefijo + "*"):
+            self._cliente.delete(clave)
@@ -0,0 +1,122 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+from cache.backends import BackendCache, MemoriaLRU, RedisBackend
+
+
+class CacheRespuestas:
+    """Cache de lectura de los GET de tickets e incidentes, invalidada por ticket."""
+    
+    def __init__(self, backend: Optional[BackendCache]):
+        self.backend = backend
+        self.aciertos = 0
+        self.fallos = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def clave_ticket(ticket_id: int, incluir_incidentes: bool) -> str:
+        return f"ticket:{ticket_id}:incidentes={int(incluir_incidentes)}"
+    
+    @staticmethod
+    def clave_incidentes_ticket(ticket_id: int) -> str:
+        return f"incidentes_ticket:{ticket_id}"
+    
+    @staticmethod
+    def clave_estadisticas(desde: Optional[str], hasta: Optional[str]) -> str:
+        return f"estadisticas:{desde or ''}:{hasta or ''}"
+    
+    @staticmethod
+    def clave_serie(metrica: str, por: Optional[str], desde: Optional[str], hasta: Optional[str]) -> str:
+        return f"serie:{metrica}:{por or ''}:{desde or ''}:{hasta or ''}"
+    
+    def obtener_o_calcular(
+        self,
+        clave: str,
+        calcular: Callable[[], Any],
+        vigente: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Devuelve el valor guardado o lo calcula y lo guarda.
+        
+        Si 'vigente' rechaza el valor guardado se recalcula y se sobrescribe: una lectura que
+        terminó después de la invalidación de una escritura pudo guardar datos anteriores a ella.
+        """
+        if self.backend is None:
+            return calcular()
+        
+        valor = self.backend.obtener(clave)
+        if valor is not None and (vigente is None or vigente(valor)):
+            self._contar(acierto=True)
+            return valor
+        
+        self._contar(acierto=False)
+        valor = calcular()
+        if valor is not None:
+            self.backend.guardar(clave, valor)
+        return valor
+    
+    def invalidar_ticket(self, ticket_id: int) -> None:
+        self.invalidar_tickets([ticket_id])
+    
+    def invalidar_tickets(self, ticket_ids: Iterable[int]) -> None:
+        if self.backend is None:
+            return
+        claves = []
+        for ticket_id in ticket_ids:
+            claves.append(self.clave_ticket(ticket_id, True))
+            claves.append(self.clave_ticket(ticket_id, False))
+            claves.append(self.clave_incidentes_ticket(ticket_id))
+        self.backend.eliminar(claves)
+    
+    def estadisticas(self) -> Dict[str, Any]:
+        total = self.aciertos + self.fallos
+        return {
+            "backend": type(self.backend).__name__ if self.backend is not None else None,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": round(self.aciertos / total, 4) if total else 0.0,
+        }
+    
+    def _contar(self, acierto: bool) -> None:
+        with self._lock:
+            if acierto:
+                self.aciertos += 1
+            else:
+                self.fallos += 1
+
+
+_cache: Optional[CacheRespuestas] = None
+_cache_estadisticas: Optional[CacheRespuestas] = None
+
+
+def _crear_backend(ttl: Optional[float] = None) -> Optional[BackendCache]:
+    tipo = os.environ.get("TICKETING_CACHE_BACKEND", "memoria")
+    ttl = ttl if ttl is not None else float(os.environ.get("TICKETING_CACHE_TTL", "30"))
+    if tipo == "ninguno":
+        return None
+    if tipo == "memoria":
+        return MemoriaLRU(max_entradas=int(os.environ.get("TICKETING_CACHE_MAX_ENTRADAS", "10000")), ttl=ttl)
+    if tipo == "redis":
+        return RedisBackend(os.environ.get("TICKETING_CACHE_URL", "redis://localhost:6379/0"), ttl=ttl)
+    raise ValueError(f"Backend de cache desconocido: {tipo}. Válidos: memoria, redis, ninguno")
+
+
+def obtener_cache() -> CacheRespuestas:
+    global _cache
+    if _cache is None:
+        _cache = CacheRespuestas(_crear_backend())
+    return _cache
+
+
+def obtener_cache_estadisticas() -> CacheRespuestas:
+    """Cache de GET /stats: no se invalida con cada escritura, sólo expira con un TTL corto."""
+    global _cache_estadisticas
+    if _cache_estadisticas is None:
+        _cache_estadisticas = CacheRespuestas(_crear_backend(float(os.environ.get("TICKETING_STATS_TTL", "10"))))
+    return _cache_estadisticas
+
+
+def configurar_cache(backend: Optional[BackendCache]) -> CacheRespuestas:
+    """Reemplaza el backend en uso, por ejemplo por una MemoriaLRU local en pruebas."""
+    global _cache
+    _cache = CacheRespuestas(backend)
+    return _cache
@@ -0,0 +1,93 @@
+from typing import Optional, Dict, Any, List, Tuple
+from database.cambios import CREAR, ELIMINAR
+from database.unit_of_work import UnitOfWork
+from models.cambio import Cambio
+
+
+class CambioController:
+    
+    def __init__(self, uow: Optional[UnitOfWork] = None):
+        self.uow = uow if uow is not None else UnitOfWork()
+        self.repo = self.uow.cambios
+    
+    def obtener_cambios(self, desde: int, limite: int = 100) -> Dict[str, Any]:
+        """Devuelve los cambios posteriores a la secuencia 'desde' con el estado actual de cada entidad."""
+        primero = self.repo.primer_seq()
+        if primero is not None and desde < primero - 1:
+            return {
+                "exito": False,
+                "expirado": True,
+                "mensaje": "El token es anterior a la compactación del registro de cambios. Resincronice desde GET /tickets",
+                "ultimo": self.repo.ultimo_seq(),
+            }
+        
+        cambios = self.repo.listar_desde(desde, limite + 1)
+        hay_mas = len(cambios) > limite
+        cambios = cambios[:limite]
+        if not cambios:
+            return {"exito": True, "datos": [], "hasta": desde, "hay_mas": False}
+        
+        vigentes = ultimo_por_entidad(cambios)
+        tickets = {
+            ticket.id: ticket
+            for ticket in self.uow.tickets.obtener_por_ids(
+                c.entidad_id for c in vigentes if c.entidad == "ticket" and c.operacion != ELIMINAR
+            )
+        }
+        incidentes = {
+            incidente.id: incidente
+            for incidente in self.uow.incidentes.obtener_por_ids(
+                c.entidad_id for c in vigentes if c.entidad == "incidente" and c.operacion != ELIMINAR
+            )
+        }
+        
+        datos = []
+        for cambio in vigentes:
+            actuales = tickets if cambio.entidad == "ticket" else incidentes
+            actual = actuales.get(cambio.entidad_id)
+            item = cambio.to_dict()
+            item["datos"] = actual.to_dict() if actual is not None else None
+            datos.append(item)
+        
+        return {"exito": True, "datos": datos, "hasta": cambios[-1].seq, "hay_mas": hay_mas}
+    
+    def obtener_eventos_tickets(self, desde: int, limite: int = 500) -> Tuple[List[Dict[str, Any]], int]:
+        """Devuelve los eventos de tickets posteriores a 'desde' y la secuencia hasta la que se leyó.
+        
+        Sólo las altas y los cambios de estado son eventos, uno por cambio y con el estado que dejó,
+        así una transición no se pierde aunque el ticket vuelva a cambiar en el mismo lote. Los cambios
+        de contadores o de otros campos se saltan pero avanzan la secuencia; 'ticket' trae los datos actuales.
+        """
+        leidos = self.repo.listar_desde(desde, limite, entidad="ticket")
+        if not leidos:
+            return [], desde
+        
+        cambios = [c for c in leidos if c.operacion == CREAR or c.estado is not None]
+        tickets = {
+            ticket.id: ticket.to_dict()
+            for ticket in self.uow.tickets.obtener_por_ids(c.entidad_id for c in cambios if c.operacion != ELIMINAR)
+        }
+        eventos = [
+            {
+                "seq": cambio.seq,
+                "operacion": cambio.operacion,
+                "id": cambio.entidad_id,
+                "estado": cambio.estado,
+                "ticket": tickets.get(cambio.entidad_id),
+            }
+            for cambio in cambios
+        ]
+        return eventos, leidos[-1].seq
+    
+    def ultimo_seq(self) -> int:
+        return self.repo.ultimo_seq() or 0
+
+
+def ultimo_por_entidad(cambios: List[Cambio]) -> List[Cambio]:
+    # Sólo importa el último cambio de cada entidad: los datos que se envían son los actuales.
+    ultimos: Dict[Tuple[str, int], Cambio] = {}
+    for cambio in cambios:
+        clave = (cambio.entidad, cambio.entidad_id)
+        ultimos.pop(clave, None)
+        ultimos[clave] = cambio
+    return list(ultimos.values())
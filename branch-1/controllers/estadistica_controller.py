@@ -0,0 +1,91 @@
+from datetime import date, datetime
+from typing import Optional, Dict, Any
+from cache.respuestas import CacheRespuestas, obtener_cache_estadisticas
+from database.unit_of_work import UnitOfWork
+from models.incidente import CATEGORIAS, PRIORIDADES
+from models.ticket import ESTADOS
+
+
+class EstadisticaController:
+    
+    def __init__(self, uow: Optional[UnitOfWork] = None, cache: Optional[CacheRespuestas] = None):
+        self.uow = uow if uow is not None else UnitOfWork()
+        self.cache = cache if cache is not None else obtener_cache_estadisticas()
+        self.repo = self.uow.estadisticas
+    
+    def obtener_estadisticas(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """La ventana filtra por fecha de creación, salvo el tiempo de cierre, que usa la fecha de cierre."""
+        ventana = {
+            "desde": desde.isoformat() if desde else None,
+            "hasta": hasta.isoformat() if hasta else None,
+        }
+        
+        def calcular() -> Dict[str, Any]:
+            por_estado = self.repo.tickets_por_estado(desde, hasta)
+            por_categoria = {categoria: {prioridad: 0 for prioridad in PRIORIDADES} for categoria in CATEGORIAS}
+            for categoria, prioridad, cantidad in self.repo.incidentes_por_categoria_y_prioridad(desde, hasta):
+                por_categoria.setdefault(categoria, {})[prioridad] = cantidad
+            cerrados, segundos = self.repo.tiempo_medio_de_cierre(desde, hasta)
+            
+            return {
+                "ventana": ventana,
+                "tickets_por_estado": {estado: por_estado.get(estado, 0) for estado in ESTADOS},
+                "incidentes_por_categoria_y_prioridad": por_categoria,
+                "tiempo_medio_de_cierre": {
+                    "tickets_cerrados": cerrados,
+                    "segundos": round(segundos, 1) if segundos is not None else None,
+                },
+                "pendientes_por_empleado": [
+                    {"empleado_id": empleado_id, "pendientes": pendientes}
+                    for empleado_id, pendientes in self.repo.pendientes_por_empleado(desde, hasta)
+                ],
+            }
+        
+        return self.cache.obtener_o_calcular(CacheRespuestas.clave_estadisticas(**ventana), calcular)
+    
+    def obtener_serie_temporal(
+        self,
+        metrica: str,
+        por: Optional[str] = None,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Serie diaria leída de los resúmenes; refleja los cambios hasta la última pasada de actualizar-resumenes."""
+        clave = CacheRespuestas.clave_serie(
+            metrica,
+            por,
+            desde.isoformat() if desde else None,
+            hasta.isoformat() if hasta else None,
+        )
+        
+        def calcular() -> Dict[str, Any]:
+            marca = self.uow.resumenes.obtener_marca()
+            puntos = []
+            for fila in self.uow.resumenes.serie(metrica, por, desde, hasta):
+                punto: Dict[str, Any] = {"dia": fila[0].isoformat()}
+                if por:
+                    punto[por] = fila[1]
+                cantidad = fila[2 if por else 1]
+                punto["cantidad"] = cantidad
+                if metrica == "cierres":
+                    segundos = fila[-1]
+                    punto["segundos_promedio"] = round(segundos / cantidad, 1) if cantidad else None
+                puntos.append(punto)
+            
+            return {
+                "metrica": metrica,
+                "por": por,
+                "desde": desde.isoformat() if desde else None,
+                "hasta": hasta.isoformat() if hasta else None,
+                "actualizado": {
+                    "seq": marca.seq if marca else None,
+                    "fecha": marca.fecha_actualizacion if marca else None,
+                },
+                "puntos": puntos,
+            }
+        
+        return self.cache.obtener_o_calcular(clave, calcular)
@@ -1,12 +1,21 @@
-from typing import List, Optional, Dict, Any
-from database.repositories.incidente_repository import IncidenteRepository
-from models.incidente import Incidente
+import json
+from typing import List, Optional, Dict, Any, Tuple, Iterator
+from controllers.paginacion import cortar_pagina
+from controllers.validacion import validar_incidente, CAMPOS_INCIDENTE
+from cache.respuestas import CacheRespuestas, obtener_cache
+from database.unit_of_work import UnitOfWork
+from models.incidente import Incidente, CATEGORIAS, PRIORIDADES
+
+
+MAXIMO_ITEMS_EN_BLOQUE = 10000
 
 
 class IncidenteController:
     
-    def __init__(self):
-        self.repo = IncidenteRepository()
+    def __init__(self, uow: Optional[UnitOfWork] = None, cache: Optional[CacheRespuestas] = None):
+        self.uow = uow if uow is not None else UnitOfWork()
+        self.cache = cache if cache is not None else obtener_cache()
+        self.repo = self.uow.incidentes
     
     def crear_incidente(
         self,
@@ -15,20 +24,16 @@ class IncidenteController:
         prioridad: str,
         ticket_id: int,
     ) -> Dict[str, Any]:
-
-        categorias_validas = ["Hardware", "Software", "Red", "Otro"]
-        prioridades_validas = ["Baja", "Media", "Alta", "Crítica"]
-        
-        if categoria not in categorias_validas:
+        if categoria not in CATEGORIAS:
             return {
                 "exito": False,
-                "mensaje": f"Categoría inválida. Válidas: {', '.join(categorias_validas)}",
+                "mensaje": f"Categoría inválida. Válidas: {', '.join(CATEGORIAS)}",
             }
         
-        if prioridad not in prioridades_validas:
+        if prioridad not in PRIORIDADES:
             return {
                 "exito": False,
-                "mensaje": f"Prioridad inválida. Válidas: {', '.join(prioridades_validas)}",
+                "mensaje": f"Prioridad inválida. Válidas: {', '.join(PRIORIDADES)}",
             }
         
         incidente = Incidente(
@@ -39,6 +44,8 @@ class IncidenteController:
         )
         
         incidente_guardado = self.repo.crear(incidente)
+        self.uow.commit()
+        self.cache.invalidar_ticket(incidente_guardado.ticket_id)
         
         return {
             "exito": True,
@@ -47,23 +54,109 @@ class IncidenteController:
             "ticket_id": incidente_guardado.ticket_id,
         }
     
+    def crear_incidentes_en_bloque(self, items: List[Any]) -> Dict[str, Any]:
+        if len(items) > MAXIMO_ITEMS_EN_BLOQUE:
+            return {
+                "exito": False,
+                "mensaje": f"Se admiten como máximo {MAXIMO_ITEMS_EN_BLOQUE} incidentes por solicitud",
+            }
+        
+        campos = CAMPOS_INCIDENTE + ["ticket_id"]
+        errores = []
+        validos = []
+        for indice, datos in enumerate(items):
+            error = validar_incidente(datos, campos)
+            if error:
+                errores.append({"indice": indice, "mensaje": error})
+            else:
+                validos.append((indice, datos))
+        
+        existentes = self.uow.tickets.ids_existentes(datos["ticket_id"] for _, datos in validos)
+        filas = []
+        indices_validos = []
+        for indice, datos in validos:
+            if datos["ticket_id"] not in existentes:
+                errores.append({"indice": indice, "mensaje": f"No se encontró el ticket con ID {datos['ticket_id']}"})
+                continue
+            indices_validos.append(indice)
+            filas.append({campo: datos[campo] for campo in campos})
+        errores.sort(key=lambda error: error["indice"])
+        
+        ids = self.repo.crear_en_bloque(filas) if filas else []
+        self.uow.commit()
+        self.cache.invalidar_tickets({fila["ticket_id"] for fila in filas})
+        
+        return {
+            "exito": bool(ids),
+            "creados": [{"indice": indice, "id": incidente_id} for indice, incidente_id in zip(indices_validos, ids)],
+            "errores": errores,
+            "mensaje": f"{len(ids)} incidentes creados, {len(errores)} con errores",
+        }
+    
     def obtener_incidente(self, incidente_id: int) -> Optional[Dict[str, Any]]:
-        incidente = self.repo.obtener_por_id(incidente_id)
-        if incidente:
-            return incidente.to_dict()
+        fila = self.repo.obtener_fila(incidente_id)
+        if fila:
+            return Incidente.representar(fila)
         return None
     
-    def listar_incidentes(self) -> List[Dict[str, Any]]:
-        incidentes = self.repo.listar_todos()
-        return [incidente.to_dict() for incidente in incidentes]
+    def obtener_version_incidente(self, incidente_id: int) -> Optional[Tuple[int, Optional[str]]]:
+        return self.repo.obtener_version(incidente_id)
     
-    def listar_incidentes_por_ticket(self, ticket_id: int) -> List[Dict[str, Any]]:
-        incidentes = self.repo.listar_por_ticket(ticket_id)
-        return [incidente.to_dict() for incidente in incidentes]
+    def obtener_version_ticket(self, ticket_id: int) -> Optional[Tuple[int, Optional[str]]]:
+        return self.uow.tickets.obtener_version(ticket_id)
+    
+    def listar_incidentes(
+        self,
+        limite: int = 100,
+        despues_de: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        filas = self.repo.listar_filas(limite=limite + 1, despues_de=despues_de)
+        return cortar_pagina([Incidente.representar(fila) for fila in filas], limite)
+    
+    def exportar_incidentes(self, despues_de: Optional[int] = None) -> Iterator[str]:
+        for fila in self.repo.iterar_filas(despues_de=despues_de):
+            yield json.dumps(Incidente.representar(fila), ensure_ascii=False) + "\n"
+    
+    def buscar_incidentes(
+        self,
+        consulta: str,
+        limite: int = 100,
+        despues_de: Optional[Tuple[float, int]] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[float, int]]]:
+        """Devuelve los incidentes más relevantes primero y la posición (rango, id) del último si hay más."""
+        resultados = self.repo.buscar(consulta, limite=limite + 1, despues_de=despues_de)
+        datos = [
+            dict(incidente.to_dict(), relevancia=-rango, resaltado=fragmento)
+            for incidente, rango, fragmento in resultados[:limite]
+        ]
+        siguiente = None
+        if len(resultados) > limite:
+            incidente, rango, _ = resultados[limite - 1]
+            siguiente = (rango, incidente.id)
+        return datos, siguiente
+    
+    def listar_incidentes_por_ticket(self, ticket_id: int, version: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Con 'version', la del ticket que el router ya leyó, una entrada de cache de otra versión se recalcula."""
+        def cargar() -> Dict[str, Any]:
+            # 'version' se leyó antes que los incidentes: la entrada nunca dice ser más nueva que sus datos.
+            return {
+                "version": version,
+                "incidentes": [
+                    Incidente.representar(fila) for fila in self.repo.filas_por_tickets([ticket_id]).get(ticket_id, [])
+                ],
+            }
+        
+        def vigente(entrada: Dict[str, Any]) -> bool:
+            return version is None or entrada["version"] == version
+        
+        clave = CacheRespuestas.clave_incidentes_ticket(ticket_id)
+        return self.cache.obtener_o_calcular(clave, cargar, vigente)["incidentes"]
     
     def eliminar_incidente(self, incidente_id: int) -> Dict[str, Any]:
-        exito = self.repo.eliminar(incidente_id)
-        if exito:
+        eliminado = self.repo.eliminar(incidente_id)
+        self.uow.commit()
+        if eliminado:
+            self.cache.invalidar_ticket(eliminado.ticket_id)
             return {
                 "exito": True,
                 "mensaje": f"Incidente {incidente_id} eliminado exitosamente",
@@ -73,10 +166,20 @@ class IncidenteController:
             "mensaje": f"No se encontró el incidente con ID {incidente_id}",
         }
     
-    def filtrar_por_categoria(self, categoria: str) -> List[Dict[str, Any]]:
-        incidentes = self.repo.filtrar_por_categoria(categoria)
-        return [incidente.to_dict() for incidente in incidentes]
+    def filtrar_por_categoria(
+        self,
+        categoria: str,
+        limite: int = 100,
+        despues_de: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        filas = self.repo.filtrar_filas_por_categoria(categoria, limite=limite + 1, despues_de=despues_de)
+        return cortar_pagina([Incidente.representar(fila) for fila in filas], limite)
     
-    def filtrar_por_prioridad(self, prioridad: str) -> List[Dict[str, Any]]:
-        incidentes = self.repo.filtrar_por_prioridad(prioridad)
-        return [incidente.to_dict() for incidente in incidentes]
+    def filtrar_por_prioridad(
+        self,
+        prioridad: str,
+        limite: int = 100,
+        despues_de: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        filas = self.repo.filtrar_filas_por_prioridad(prioridad, limite=limite + 1, despues_de=despues_de)
+        return cortar_pagina([Incidente.representar(fila) for fila in filas], limite)
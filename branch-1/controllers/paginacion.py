@@ -0,0 +1,12 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def cortar_pagina(
+    filas: List[Dict[str, Any]],
+    limite: int,
+) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+    """Recibe hasta limite + 1 filas y devuelve la página junto al id del último elemento si hay más."""
+    if len(filas) > limite:
+        pagina = filas[:limite]
+        return pagina, pagina[-1]["id"]
+    return filas, None
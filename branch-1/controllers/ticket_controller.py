@@ -1,15 +1,32 @@
-from typing import Optional, Dict, Any, List
-from database.repositories.ticket_repository import TicketRepository
-from database.repositories.incidente_repository import IncidenteRepository
-from models.ticket import Ticket
-from models.incidente import Incidente
+import json
+import os
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Iterator, Callable
+from sqlalchemy.orm.exc import StaleDataError
+from controllers.paginacion import cortar_pagina
+from controllers.validacion import validar_ticket, CAMPOS_TICKET, CAMPOS_INCIDENTE
+from cache.respuestas import CacheRespuestas, obtener_cache
+from database.unit_of_work import UnitOfWork
+from database.repositories.ticket_repository import Posicion
+from models.ticket import Ticket, ESTADOS
+from models.incidente import Incidente, CATEGORIAS, PRIORIDADES
+
+
+MAXIMO_ITEMS_EN_BLOQUE = 10000
+
+
+def _listados_en_filas() -> bool:
+    # TICKETING_LISTADOS=orm vuelve a hidratar instancias en los listados, para comparar o descartar el camino en filas.
+    return os.environ.get("TICKETING_LISTADOS", "filas") != "orm"
 
 
 class TicketController:
     
-    def __init__(self):
-        self.ticket_repo = TicketRepository()
-        self.incidente_repo = IncidenteRepository()
+    def __init__(self, uow: Optional[UnitOfWork] = None, cache: Optional[CacheRespuestas] = None):
+        self.uow = uow if uow is not None else UnitOfWork()
+        self.cache = cache if cache is not None else obtener_cache()
+        self.ticket_repo = self.uow.tickets
+        self.incidente_repo = self.uow.incidentes
     
     def crear_ticket(
         self,
@@ -38,71 +55,210 @@ class TicketController:
                 ticket.incidentes.append(incidente)
         
         ticket_guardado = self.ticket_repo.crear(ticket)
+        self.uow.commit()
         
         return {
             "exito": True,
             "id": ticket_guardado.id,
             "mensaje": "Ticket creado exitosamente",
             "estado": ticket_guardado.estado,
-            "cantidad_incidentes": len(ticket_guardado.incidentes),
+            "cantidad_incidentes": ticket_guardado.cantidad_incidentes,
         }
     
-    def obtener_ticket(self, ticket_id: int, incluir_incidentes: bool = True) -> Optional[Dict[str, Any]]:
-        ticket = self.ticket_repo.obtener_por_id(ticket_id)
-        if ticket:
-            return ticket.to_dict(incluir_incidentes=incluir_incidentes)
-        return None
+    def crear_tickets_en_bloque(self, items: List[Any]) -> Dict[str, Any]:
+        if len(items) > MAXIMO_ITEMS_EN_BLOQUE:
+            return {
+                "exito": False,
+                "mensaje": f"Se admiten como máximo {MAXIMO_ITEMS_EN_BLOQUE} tickets por solicitud",
+            }
+        
+        errores = []
+        indices_validos = []
+        filas = []
+        incidentes_por_ticket = []
+        fecha_creacion = datetime.now()
+        
+        for indice, datos in enumerate(items):
+            error = validar_ticket(datos)
+            if error:
+                errores.append({"indice": indice, "mensaje": error})
+                continue
+            indices_validos.append(indice)
+            filas.append(dict(
+                {campo: datos[campo] for campo in CAMPOS_TICKET},
+                estado="Abierto",
+                fecha_creacion=fecha_creacion,
+            ))
+            incidentes_por_ticket.append([
+                {campo: inc[campo] for campo in CAMPOS_INCIDENTE}
+                for inc in datos.get("incidentes", [])
+            ])
+        
+        ids = self.ticket_repo.crear_en_bloque(filas, incidentes_por_ticket) if filas else []
+        self.uow.commit()
+        
+        return {
+            "exito": bool(ids),
+            "creados": [{"indice": indice, "id": ticket_id} for indice, ticket_id in zip(indices_validos, ids)],
+            "errores": errores,
+            "mensaje": f"{len(ids)} tickets creados, {len(errores)} con errores",
+        }
+    
+    def obtener_ticket(
+        self,
+        ticket_id: int,
+        incluir_incidentes: bool = True,
+        version: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Con 'version', la que el router ya leyó, una entrada de cache de otra versión se recalcula."""
+        def cargar() -> Optional[Dict[str, Any]]:
+            ticket = self.ticket_repo.obtener_para_lectura(ticket_id, incluir_incidentes=incluir_incidentes)
+            if ticket:
+                return ticket.to_dict(incluir_incidentes=incluir_incidentes)
+            return None
+        
+        def vigente(ticket: Dict[str, Any]) -> bool:
+            return version is None or ticket["version"] == version
+        
+        clave = CacheRespuestas.clave_ticket(ticket_id, incluir_incidentes)
+        return self.cache.obtener_o_calcular(clave, cargar, vigente)
+    
+    def listar_tickets(
+        self,
+        incluir_incidentes: bool = False,
+        limite: int = 100,
+        despues_de: Optional[Posicion] = None,
+        filtros: Optional[Dict[str, Any]] = None,
+        orden: str = "id",
+        descendente: bool = False,
+    ) -> Tuple[List[Dict[str, Any]], Optional[Posicion]]:
+        """Devuelve la página y la posición del último ticket si hay más: el id, o (valor, id) si se ordena por otro campo."""
+        if _listados_en_filas():
+            tickets = self.ticket_repo.listar_filas(
+                limite=limite + 1,
+                despues_de=despues_de,
+                filtros=filtros,
+                orden=orden,
+                descendente=descendente,
+            )
+            incidentes = self.incidente_repo.filas_por_tickets(t.id for t in tickets) if incluir_incidentes else {}
+            datos = [
+                Ticket.representar(
+                    ticket,
+                    [Incidente.representar(i) for i in incidentes.get(ticket.id, ())] if incluir_incidentes else None,
+                )
+                for ticket in tickets
+            ]
+        else:
+            tickets = self.ticket_repo.listar_todos(
+                limite=limite + 1,
+                despues_de=despues_de,
+                incluir_incidentes=incluir_incidentes,
+                filtros=filtros,
+                orden=orden,
+                descendente=descendente,
+            )
+            datos = [ticket.to_dict(incluir_incidentes=incluir_incidentes) for ticket in tickets]
+        pagina, siguiente = cortar_pagina(datos, limite)
+        if siguiente is not None and orden != "id":
+            ultimo = tickets[limite - 1]
+            siguiente = (getattr(ultimo, orden), ultimo.id)
+        return pagina, siguiente
+    
+    def exportar_tickets(
+        self,
+        incluir_incidentes: bool = False,
+        despues_de: Optional[Posicion] = None,
+        filtros: Optional[Dict[str, Any]] = None,
+        orden: str = "id",
+        descendente: bool = False,
+    ) -> Iterator[str]:
+        tickets = self.ticket_repo.iterar_todos(
+            despues_de=despues_de,
+            incluir_incidentes=incluir_incidentes,
+            filtros=filtros,
+            orden=orden,
+            descendente=descendente,
+        )
+        for ticket in tickets:
+            yield json.dumps(ticket.to_dict(incluir_incidentes=incluir_incidentes), ensure_ascii=False) + "\n"
     
-    def listar_tickets(self, incluir_incidentes: bool = False) -> List[Dict[str, Any]]:
-        tickets = self.ticket_repo.listar_todos()
-        return [ticket.to_dict(incluir_incidentes=incluir_incidentes) for ticket in tickets]
+    def obtener_version_ticket(self, ticket_id: int) -> Optional[Tuple[int, Optional[str]]]:
+        return self.ticket_repo.obtener_version(ticket_id)
     
-    def cambiar_estado_ticket(self, ticket_id: int, nuevo_estado: str) -> Dict[str, Any]:
-        estados_validos = ["Abierto", "En Progreso", "Cerrado", "Reabierto"]
-        if nuevo_estado not in estados_validos:
+    def cambiar_estado_ticket(
+        self,
+        ticket_id: int,
+        nuevo_estado: str,
+        version_esperada: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        if nuevo_estado not in ESTADOS:
             return {
                 "exito": False,
-                "mensaje": f"Estado inválido. Estados válidos: {', '.join(estados_validos)}",
+                "mensaje": f"Estado inválido. Estados válidos: {', '.join(ESTADOS)}",
             }
         
-        exito = self.ticket_repo.actualizar_estado(ticket_id, nuevo_estado)
-        if exito:
+        ticket, conflicto = self._confirmar_cambio(
+            ticket_id,
+            lambda: self.ticket_repo.actualizar_estado(ticket_id, nuevo_estado, version_esperada),
+        )
+        if conflicto:
+            return conflicto
+        if ticket:
             return {
                 "exito": True,
                 "mensaje": f"Ticket {ticket_id} actualizado a {nuevo_estado}",
+                "version": ticket.version,
             }
         return {
             "exito": False,
             "mensaje": f"No se encontró el ticket con ID {ticket_id}",
         }
     
-    def cerrar_ticket(self, ticket_id: int) -> Dict[str, Any]:
-        exito = self.ticket_repo.cerrar_ticket(ticket_id)
-        if exito:
+    def cerrar_ticket(self, ticket_id: int, version_esperada: Optional[int] = None) -> Dict[str, Any]:
+        ticket, conflicto = self._confirmar_cambio(
+            ticket_id,
+            lambda: self.ticket_repo.cerrar_ticket(ticket_id, version_esperada),
+        )
+        if conflicto:
+            return conflicto
+        if ticket:
             return {
                 "exito": True,
                 "mensaje": f"Ticket {ticket_id} cerrado exitosamente",
+                "version": ticket.version,
             }
         return {
             "exito": False,
             "mensaje": f"No se encontró el ticket con ID {ticket_id}",
         }
     
-    def reabrir_ticket(self, ticket_id: int) -> Dict[str, Any]:
-        exito = self.ticket_repo.reabrir_ticket(ticket_id)
-        if exito:
+    def reabrir_ticket(self, ticket_id: int, version_esperada: Optional[int] = None) -> Dict[str, Any]:
+        ticket, conflicto = self._confirmar_cambio(
+            ticket_id,
+            lambda: self.ticket_repo.reabrir_ticket(ticket_id, version_esperada),
+        )
+        if conflicto:
+            return conflicto
+        if ticket:
             return {
                 "exito": True,
                 "mensaje": f"Ticket {ticket_id} reabierto exitosamente",
+                "version": ticket.version,
             }
         return {
             "exito": False,
             "mensaje": f"No se pudo reabrir el ticket {ticket_id}. Verifique que esté cerrado",
         }
     
-    def filtrar_por_estado(self, estado: str) -> List[Dict[str, Any]]:
-        tickets = self.ticket_repo.filtrar_por_estado(estado)
-        return [ticket.to_dict() for ticket in tickets]
+    def filtrar_por_estado(
+        self,
+        estado: str,
+        limite: int = 100,
+        despues_de: Optional[int] = None,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        tickets = self.ticket_repo.filtrar_por_estado(estado, limite=limite + 1, despues_de=despues_de)
+        return cortar_pagina([ticket.to_dict() for ticket in tickets], limite)
     
     def agregar_incidente_a_ticket(
         self, 
@@ -111,20 +267,16 @@ class TicketController:
         categoria: str, 
         prioridad: str
     ) -> Dict[str, Any]:
-
-        categorias_validas = ["Hardware", "Software", "Red", "Otro"]
-        prioridades_validas = ["Baja", "Media", "Alta", "Crítica"]
-        
-        if categoria not in categorias_validas:
+        if categoria not in CATEGORIAS:
             return {
                 "exito": False,
-                "mensaje": f"Categoría inválida. Válidas: {', '.join(categorias_validas)}",
+                "mensaje": f"Categoría inválida. Válidas: {', '.join(CATEGORIAS)}",
             }
         
-        if prioridad not in prioridades_validas:
+        if prioridad not in PRIORIDADES:
             return {
                 "exito": False,
-                "mensaje": f"Prioridad inválida. Válidas: {', '.join(prioridades_validas)}",
+                "mensaje": f"Prioridad inválida. Válidas: {', '.join(PRIORIDADES)}",
             }
         
         incidente = Incidente(
@@ -134,16 +286,35 @@ class TicketController:
             ticket_id=ticket_id,
         )
         
-        exito = self.ticket_repo.agregar_incidente(ticket_id, incidente)
-        
-        if exito:
+        if not self.ticket_repo.agregar_incidente(ticket_id, incidente):
             return {
-                "exito": True,
-                "id": incidente.id,
-                "mensaje": f"Incidente agregado al ticket {ticket_id}",
+                "exito": False,
+                "mensaje": f"No se encontró el ticket con ID {ticket_id}",
             }
+        
+        self.uow.commit()
+        self.cache.invalidar_ticket(ticket_id)
         return {
-            "exito": False,
-            "mensaje": f"No se encontró el ticket con ID {ticket_id}",
+            "exito": True,
+            "id": incidente.id,
+            "mensaje": f"Incidente agregado al ticket {ticket_id}",
         }
-
+    
+    def _confirmar_cambio(
+        self,
+        ticket_id: int,
+        cambio: Callable[[], Optional[Ticket]],
+    ) -> Tuple[Optional[Ticket], Optional[Dict[str, Any]]]:
+        try:
+            ticket = cambio()
+            self.uow.commit()
+        except StaleDataError:
+            self.uow.rollback()
+            return None, {
+                "exito": False,
+                "conflicto": True,
+                "mensaje": f"El ticket {ticket_id} fue modificado por otra solicitud. Vuelva a obtenerlo y reintente",
+            }
+        if ticket:
+            self.cache.invalidar_ticket(ticket_id)
+        return ticket, None
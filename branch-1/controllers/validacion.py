@@ -0,0 +1,35 @@
+from typing import Any, Optional
+from models.incidente import CATEGORIAS, PRIORIDADES
+
+CAMPOS_TICKET = ["cliente_id", "servicio_id", "equipo_id", "empleado_id"]
+CAMPOS_INCIDENTE = ["descripcion", "categoria", "prioridad"]
+
+
+def validar_incidente(datos: Any, campos=CAMPOS_INCIDENTE) -> Optional[str]:
+    if not isinstance(datos, dict) or not all(k in datos for k in campos):
+        return f"Faltan parámetros requeridos: {', '.join(campos)}"
+    if datos["categoria"] not in CATEGORIAS:
+        return f"Categoría inválida. Válidas: {', '.join(CATEGORIAS)}"
+    if datos["prioridad"] not in PRIORIDADES:
+        return f"Prioridad inválida. Válidas: {', '.join(PRIORIDADES)}"
+    if not isinstance(datos["descripcion"], str) or not datos["descripcion"].strip():
+        return "La descripción no puede estar vacía"
+    if "ticket_id" in campos and (not isinstance(datos["ticket_id"], int) or isinstance(datos["ticket_id"], bool)):
+        return "El campo 'ticket_id' debe ser un entero"
+    return None
+
+
+def validar_ticket(datos: Any) -> Optional[str]:
+    if not isinstance(datos, dict) or not all(k in datos for k in CAMPOS_TICKET):
+        return f"Faltan parámetros requeridos: {', '.join(CAMPOS_TICKET)}"
+    for campo in CAMPOS_TICKET:
+        if not isinstance(datos[campo], int) or isinstance(datos[campo], bool):
+            return f"El campo '{campo}' debe ser un entero"
+    incidentes = datos.get("incidentes", [])
+    if not isinstance(incidentes, list):
+        return "El campo 'incidentes' debe ser una lista"
+    for posicion, incidente in enumerate(incidentes):
+        error = validar_incidente(incidente)
+        if error:
+            return f"Incidente {posicion}: {error}"
+    return None
@@ -0,0 +1,146 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import column, func, literal_column, select, table, text, tuple_
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from models.incidente import Incidente
+
+MARCA_INICIO = "<mark>"
+MARCA_FIN = "</mark>"
+TOKENS_FRAGMENTO = 24
+
+# (incidente, rango, fragmento resaltado); un rango menor es más relevante.
+Resultado = Tuple[Incidente, float, str]
+
+_TERMINO = re.compile(r"\w+", re.UNICODE)
+
+
+def terminos(consulta: str) -> List[str]:
+    return _TERMINO.findall(consulta)
+
+
+class BusquedaIncidentes(ABC):
+    """Interfaz de un índice de texto sobre Incidente.descripcion."""
+
+    @abstractmethod
+    def buscar(
+        self,
+        session: Session,
+        consulta: str,
+        limite: int,
+        despues_de: Optional[Tuple[float, int]] = None,
+    ) -> List[Resultado]:
+        raise NotImplementedError
+
+
+class BusquedaFTS5(BusquedaIncidentes):
+    """Tabla FTS5 de contenido externo sobre incidentes, sincronizada por triggers y ordenada por bm25."""
+
+    tabla = "incidentes_fts"
+
+    @classmethod
+    def disponible(cls, conn: Connection) -> bool:
+        return conn.dialect.name == "sqlite" and bool(
+            conn.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar()
+        )
+
+    @classmethod
+    def crear_indice(cls, conn: Connection) -> None:
+        # remove_diacritics permite encontrar "critica" en "crítica".
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {cls.tabla} USING fts5("
+            "descripcion, content='incidentes', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2')"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {cls.tabla}_insert AFTER INSERT ON incidentes BEGIN "
+            f"INSERT INTO {cls.tabla}(rowid, descripcion) VALUES (new.id, new.descripcion); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {cls.tabla}_delete AFTER DELETE ON incidentes BEGIN "
+            f"INSERT INTO {cls.tabla}({cls.tabla}, rowid, descripcion) VALUES ('delete', old.id, old.descripcion); END"
+        ))
+        conn.execute(text(
+            f"CREATE TRIGGER IF NOT EXISTS {cls.tabla}_update AFTER UPDATE OF descripcion ON incidentes BEGIN "
+            f"INSERT INTO {cls.tabla}({cls.tabla}, rowid, descripcion) VALUES ('delete', old.id, old.descripcion); "
+            f"INSERT INTO {cls.tabla}(rowid, descripcion) VALUES (new.id, new.descripcion); END"
+        ))
+        conn.execute(text(f"INSERT INTO {cls.tabla}({cls.tabla}) VALUES ('rebuild')"))
+
+    def buscar(
+        self,
+        session: Session,
+        consulta: str,
+        limite: int,
+        despues_de: Optional[Tuple[float, int]] = None,
+    ) -> List[Resultado]:
+        # Cada término va entre comillas: el texto del usuario nunca se interpreta como sintaxis FTS5.
+        expresion = " ".join('"{}"'.format(termino.replace('"', '""')) for termino in terminos(consulta))
+        fts = table(self.tabla, column("rowid"))
+        tabla_fts = literal_column(self.tabla)
+        coincidencias = (
+            select(
+                fts.c.rowid.label("id"),
+                func.bm25(tabla_fts).label("rango"),
+                func.snippet(tabla_fts, 0, MARCA_INICIO, MARCA_FIN, "…", TOKENS_FRAGMENTO).label("fragmento"),
+            )
+            .where(tabla_fts.op("MATCH")(expresion))
+            .subquery()
+        )
+
+        query = (
+            select(Incidente, coincidencias.c.rango, coincidencias.c.fragmento)
+            .join(coincidencias, coincidencias.c.id == Incidente.id)
+            .order_by(coincidencias.c.rango, coincidencias.c.id)
+            .limit(limite)
+        )
+        if despues_de is not None:
+            query = query.where(tuple_(coincidencias.c.rango, coincidencias.c.id) > tuple_(*despues_de))
+        return [tuple(fila) for fila in session.execute(query)]
+
+
+class BusquedaLike(BusquedaIncidentes):
+    """Alternativa sin índice para backends sin FTS: exige todos los términos y ordena por id."""
+
+    def buscar(
+        self,
+        session: Session,
+        consulta: str,
+        limite: int,
+        despues_de: Optional[Tuple[float, int]] = None,
+    ) -> List[Resultado]:
+        lista = terminos(consulta)
+        query = select(Incidente).where(*(
+            Incidente.descripcion.ilike("%{}%".format(termino.replace("_", "\\_")), escape="\\")
+            for termino in lista
+        ))
+        if despues_de is not None:
+            query = query.where(Incidente.id > despues_de[1])
+        incidentes = session.execute(query.order_by(Incidente.id).limit(limite)).scalars()
+
+        patron = re.compile("|".join(re.escape(termino) for termino in lista), re.IGNORECASE)
+        return [
+            (incidente, 0.0, patron.sub(lambda m: f"{MARCA_INICIO}{m.group(0)}{MARCA_FIN}", incidente.descripcion))
+            for incidente in incidentes
+        ]
+
+
+def crear_indice_de_busqueda(conn: Connection) -> None:
+    if BusquedaFTS5.disponible(conn):
+        BusquedaFTS5.crear_indice(conn)
+
+
+_motores: Dict[object, BusquedaIncidentes] = {}
+
+
+def obtener_busqueda(session: Session) -> BusquedaIncidentes:
+    """Elige el motor según el engine de la sesión; la elección se recuerda por engine."""
+    engine = session.get_bind()
+    if engine not in _motores:
+        conn = session.connection()
+        if BusquedaFTS5.disponible(conn) and conn.dialect.has_table(conn, BusquedaFTS5.tabla):
+            _motores[engine] = BusquedaFTS5()
+        else:
+            _motores[engine] = BusquedaLike()
+    return _motores[engine]
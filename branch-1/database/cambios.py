@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import Integer, String, bindparam, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+from models.cambio import Cambio
+from models.incidente import Incidente
+from models.ticket import Ticket
+
+CREAR = "crear"
+ACTUALIZAR = "actualizar"
+ELIMINAR = "eliminar"
+
+# (entidad, operacion, entidad_id, ticket_id)
+FilaCambio = Tuple[str, str, int, int]
+
+# El estado de un alta de ticket es el conocido o, si no, el que el ticket tiene en esta misma
+# transacción, leído en el propio INSERT para no agregar una consulta por escritura.
+_tickets = Ticket.__table__
+_INSERTAR = insert(Cambio.__table__).values(
+    estado=func.coalesce(
+        bindparam("estado_conocido", type_=String(50)),
+        select(_tickets.c.estado).where(_tickets.c.id == bindparam("ticket_sin_estado", type_=Integer)).scalar_subquery(),
+    )
+)
+
+
+def registrar_cambios(
+    session: Session,
+    cambios: Iterable[FilaCambio],
+    estados: Optional[Dict[int, str]] = None,
+) -> None:
+    """Inserta los cambios en la transacción de la sesión, en una sola sentencia de Core.
+
+    Las altas de tickets y los cambios de ticket presentes en 'estados' guardan el estado nuevo;
+    el resto (contadores, otros campos, bajas) queda sin estado porque no es una transición.
+    """
+    estados = estados or {}
+    ahora = datetime.now().isoformat()
+    filas = []
+    for entidad, operacion, entidad_id, ticket_id in cambios:
+        es_ticket = entidad == "ticket"
+        conocido = estados.get(entidad_id) if es_ticket else None
+        filas.append({
+            "entidad": entidad,
+            "operacion": operacion,
+            "entidad_id": entidad_id,
+            "ticket_id": ticket_id,
+            "estado_conocido": conocido,
+            "ticket_sin_estado": entidad_id if es_ticket and operacion == CREAR and conocido is None else None,
+            "fecha": ahora,
+        })
+    if filas:
+        session.execute(_INSERTAR, filas)
+
+
+def cambios_de_incidentes(
+    operacion: str,
+    incidentes: Iterable[Tuple[int, int]],
+    tickets_ya_registrados: Iterable[int] = (),
+) -> List[FilaCambio]:
+    """Cambios para pares (incidente_id, ticket_id) más la actualización de cada ticket afectado,
+    cuyos contadores y versión cambian con sus incidentes."""
+    cambios: List[FilaCambio] = [("incidente", operacion, incidente_id, ticket_id) for incidente_id, ticket_id in incidentes]
+    afectados = {ticket_id for _, _, _, ticket_id in cambios} - set(tickets_ya_registrados)
+    cambios.extend(("ticket", ACTUALIZAR, ticket_id, ticket_id) for ticket_id in sorted(afectados))
+    return cambios
+
+
+def _despues_de_flush(session: Session, flush_context) -> None:
+    tickets: List[FilaCambio] = []
+    incidentes: List[FilaCambio] = []
+    estados: Dict[int, str] = {}
+    for objetos, operacion in ((session.new, CREAR), (session.dirty, ACTUALIZAR), (session.deleted, ELIMINAR)):
+        for obj in objetos:
+            if operacion == ACTUALIZAR and not session.is_modified(obj, include_collections=False):
+                continue
+            if isinstance(obj, Ticket):
+                tickets.append(("ticket", operacion, obj.id, obj.id))
+                if operacion == CREAR or (operacion == ACTUALIZAR and inspect(obj).attrs.estado.history.has_changes()):
+                    estados[obj.id] = obj.estado
+            elif isinstance(obj, Incidente):
+                incidentes.append(("incidente", operacion, obj.id, obj.ticket_id))
+    
+    registrados = {ticket_id for _, _, ticket_id, _ in tickets}
+    afectados = sorted({ticket_id for _, _, _, ticket_id in incidentes} - registrados)
+    registrar_cambios(
+        session,
+        tickets + incidentes + [("ticket", ACTUALIZAR, ticket_id, ticket_id) for ticket_id in afectados],
+        estados,
+    )
+
+
+def registrar_eventos(session_factory) -> None:
+    event.listen(session_factory, "after_flush", _despues_de_flush)
@@ -0,0 +1,121 @@
+import os
+from typing import Any, Dict, Optional
+from sqlalchemy.engine import make_url
+
+PERFIL_SQLITE_POR_DEFECTO = "produccion"
+PERFIL_SERVIDOR_POR_DEFECTO = "servidor"
+
+# Sentencias compiladas que guarda cada engine. Los filtros y órdenes de los
+# listados generan algunos cientos de variantes, más que las 500 por defecto.
+TAMANO_CACHE_SQL = 1200
+
+PERFILES: Dict[str, Dict[str, Any]] = {
+    # Comportamiento original: journal DELETE, fsync completo y sin espera ante bloqueos.
+    "basico": {
+        "pragmas": {},
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+        "query_cache_size": TAMANO_CACHE_SQL,
+    },
+    # WAL permite lectores concurrentes mientras un único escritor confirma;
+    # synchronous=NORMAL sólo sincroniza en los checkpoints del WAL.
+    "produccion": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "cache_size": -65536,
+            "mmap_size": 268435456,
+            "temp_store": "MEMORY",
+        },
+        "pool_size": 8,
+        "max_overflow": 4,
+        "pool_timeout": 30,
+        "pool_pre_ping": False,
+        "pool_recycle": -1,
+        "query_cache_size": TAMANO_CACHE_SQL,
+    },
+    # Servidor de base de datos (PostgreSQL, MySQL): conexiones de red que pueden
+    # cortarse, por eso se verifican antes de usarse y se reciclan periódicamente.
+    "servidor": {
+        "pragmas": {},
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "query_cache_size": TAMANO_CACHE_SQL,
+    },
+}
+
+_VARIABLES_POOL = {
+    "pool_size": ("TICKETING_DB_POOL_SIZE", int),
+    "max_overflow": ("TICKETING_DB_MAX_OVERFLOW", int),
+    "pool_timeout": ("TICKETING_DB_POOL_TIMEOUT", int),
+    "pool_recycle": ("TICKETING_DB_POOL_RECYCLE", int),
+    "pool_pre_ping": ("TICKETING_DB_POOL_PRE_PING", lambda valor: valor.lower() in ("1", "true", "si")),
+    "query_cache_size": ("TICKETING_DB_QUERY_CACHE_SIZE", int),
+}
+
+
+def obtener_url(db_path: str = "app.db", database_url: Optional[str] = None) -> str:
+    return database_url or os.environ.get("DATABASE_URL") or f"sqlite:///{db_path}"
+
+
+# Drivers asíncronos usados por el modo ASGI para cada backend.
+DRIVERS_ASYNC = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def obtener_url_async(database_url: str) -> str:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in DRIVERS_ASYNC:
+        raise ValueError(f"No hay driver asíncrono configurado para {backend}")
+    return url.set(drivername=DRIVERS_ASYNC[backend]).render_as_string(hide_password=False)
+
+
+def es_sqlite(database_url: str) -> bool:
+    return database_url.startswith("sqlite")
+
+
+def obtener_perfil(nombre: Optional[str] = None, database_url: Optional[str] = None) -> Dict[str, Any]:
+    """Devuelve el perfil pedido con los ajustes de pool y caché sobrescritos por variables de entorno."""
+    por_defecto = PERFIL_SQLITE_POR_DEFECTO
+    if database_url and not es_sqlite(database_url):
+        por_defecto = PERFIL_SERVIDOR_POR_DEFECTO
+
+    nombre = nombre or os.environ.get("TICKETING_DB_PERFIL", por_defecto)
+    if nombre not in PERFILES:
+        raise ValueError(f"Perfil de base de datos desconocido: {nombre}. Válidos: {', '.join(PERFILES)}")
+
+    perfil = dict(PERFILES[nombre])
+    for clave, (variable, convertir) in _VARIABLES_POOL.items():
+        valor = os.environ.get(variable)
+        if valor is not None:
+            perfil[clave] = convertir(valor)
+    return perfil
+
+
+def obtener_ajustes_diagnostico() -> Optional[Dict[str, Any]]:
+    """Ajustes del diagnóstico SQL, o None si no se pidió ninguno.
+
+    TICKETING_DB_LENTAS_MS registra las sentencias que tardan al menos esos milisegundos junto con su plan;
+    TICKETING_DB_REPETICIONES_MAX avisa cuando una misma sentencia supera esa cantidad en una unidad de trabajo,
+    y con TICKETING_DB_DIAGNOSTICO_ESTRICTO=1 la hace fallar.
+    """
+    lentas = os.environ.get("TICKETING_DB_LENTAS_MS")
+    repeticiones = os.environ.get("TICKETING_DB_REPETICIONES_MAX")
+    if lentas is None and repeticiones is None:
+        return None
+    return {
+        "umbral_lenta_ms": float(lentas) if lentas is not None else None,
+        "maximo_repeticiones": int(repeticiones) if repeticiones is not None else None,
+        "estricto": os.environ.get("TICKETING_DB_DIAGNOSTICO_ESTRICTO", "").lower() in ("1", "true", "si"),
+    }
@@ -0,0 +1,141 @@
+from datetime import datetime
+from typing import Iterable, Optional, Set
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+from models.incidente import Incidente, CATEGORIAS, PRIORIDADES
+from models.ticket import Ticket
+
+COLUMNAS_POR_CATEGORIA = {
+    "Hardware": "incidentes_hardware",
+    "Software": "incidentes_software",
+    "Red": "incidentes_red",
+    "Otro": "incidentes_otro",
+}
+
+COLUMNAS_CONTADORES = ["cantidad_incidentes", "prioridad_maxima"] + [
+    COLUMNAS_POR_CATEGORIA[categoria] for categoria in CATEGORIAS
+]
+
+# Un cambio en los incidentes cambia la representación del ticket: también se versiona.
+COLUMNAS_A_EXPIRAR = COLUMNAS_CONTADORES + ["version", "fecha_actualizacion"]
+
+TAMANO_LOTE_RECALCULO = 5000
+
+_CLAVE_PENDIENTES = "contadores_tickets_pendientes"
+
+
+def _valores_contadores() -> dict:
+    incidentes = Incidente.__table__
+    tickets = Ticket.__table__
+
+    def contar(*condiciones):
+        return (
+            select(func.count())
+            .select_from(incidentes)
+            .where(incidentes.c.ticket_id == tickets.c.id, *condiciones)
+            .scalar_subquery()
+        )
+
+    rango_prioridad = case(
+        {prioridad: rango for rango, prioridad in enumerate(PRIORIDADES)},
+        value=incidentes.c.prioridad,
+        else_=-1,
+    )
+    prioridad_maxima = (
+        select(incidentes.c.prioridad)
+        .where(incidentes.c.ticket_id == tickets.c.id)
+        .order_by(rango_prioridad.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    valores = {
+        "cantidad_incidentes": contar(),
+        "prioridad_maxima": prioridad_maxima,
+        "version": tickets.c.version + 1,
+        "fecha_actualizacion": datetime.now().isoformat(),
+    }
+    for categoria, columna in COLUMNAS_POR_CATEGORIA.items():
+        valores[columna] = contar(incidentes.c.categoria == categoria)
+    return valores
+
+
+def recalcular_contadores(session: Session, ticket_ids: Optional[Iterable[int]] = None) -> int:
+    """Recalcula los contadores de los tickets indicados, o de todos si ticket_ids es None."""
+    tickets = Ticket.__table__
+    valores = _valores_contadores()
+
+    if ticket_ids is not None:
+        ids = sorted(set(ticket_ids))
+        for inicio in range(0, len(ids), TAMANO_LOTE_RECALCULO):
+            lote = ids[inicio:inicio + TAMANO_LOTE_RECALCULO]
+            session.execute(update(tickets).where(tickets.c.id.in_(lote)).values(**valores))
+        return len(ids)
+
+    maximo = session.execute(select(func.max(tickets.c.id))).scalar() or 0
+    for inicio in range(0, maximo, TAMANO_LOTE_RECALCULO):
+        session.execute(
+            update(tickets)
+            .where(tickets.c.id > inicio, tickets.c.id <= inicio + TAMANO_LOTE_RECALCULO)
+            .values(**valores)
+        )
+    return session.execute(select(func.count()).select_from(tickets)).scalar()
+
+
+def _rango_prioridad(prioridad: str) -> int:
+    return PRIORIDADES.index(prioridad) if prioridad in PRIORIDADES else -1
+
+
+def _calcular_en_memoria(ticket: Ticket) -> None:
+    incidentes = ticket.incidentes
+    ticket.cantidad_incidentes = len(incidentes)
+    ticket.prioridad_maxima = max((i.prioridad for i in incidentes), key=_rango_prioridad, default=None)
+    for categoria, columna in COLUMNAS_POR_CATEGORIA.items():
+        setattr(ticket, columna, sum(1 for i in incidentes if i.categoria == categoria))
+
+
+def _antes_de_flush(session: Session, flush_context, instances) -> None:
+    # Un ticket nuevo trae todos sus incidentes en memoria: se evita el UPDATE posterior.
+    for obj in session.new:
+        if isinstance(obj, Ticket):
+            _calcular_en_memoria(obj)
+
+
+def _tickets_afectados(session: Session) -> Set[int]:
+    ids = set()
+    for obj in list(session.new) + list(session.deleted) + list(session.dirty):
+        if not isinstance(obj, Incidente):
+            continue
+        estado = inspect(obj)
+        historial = estado.attrs.ticket_id.history
+        ids.update(i for i in historial.sum() if i)
+        if obj.ticket_id:
+            ids.add(obj.ticket_id)
+        elif obj.ticket is not None and obj.ticket.id is not None:
+            ids.add(obj.ticket.id)
+    ids.difference_update(obj.id for obj in session.new if isinstance(obj, Ticket))
+    return ids
+
+
+def _despues_de_flush(session: Session, flush_context) -> None:
+    ids = _tickets_afectados(session)
+    if not ids:
+        return
+    recalcular_contadores(session, ids)
+    session.info.setdefault(_CLAVE_PENDIENTES, set()).update(ids)
+
+
+def _despues_de_flush_postexec(session: Session, flush_context) -> None:
+    ids = session.info.pop(_CLAVE_PENDIENTES, None)
+    if not ids:
+        return
+    for ticket_id in ids:
+        ticket = session.identity_map.get(session.identity_key(Ticket, ticket_id))
+        if ticket is not None:
+            session.expire(ticket, COLUMNAS_A_EXPIRAR)
+
+
+def registrar_eventos(session_factory) -> None:
+    event.listen(session_factory, "before_flush", _antes_de_flush)
+    event.listen(session_factory, "after_flush", _despues_de_flush)
+    event.listen(session_factory, "after_flush_postexec", _despues_de_flush_postexec)
@@ -1,101 +1,292 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
-from models.base import Base
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from typing import Optional, Dict, Any, Iterator, List
+from database.config import obtener_perfil, obtener_url, obtener_url_async, es_sqlite, obtener_ajustes_diagnostico
+from database.diagnostico import Diagnostico
 
 _engine = None
 _session_factory = None
 _scoped_session = None
 
+_engine_async = None
+_session_factory_async = None
 
-def init_db(db_path: str = "app.db") -> None:
-    global _engine, _session_factory, _scoped_session
+_diagnostico: Optional[Diagnostico] = None
+
+# Resultado de la caché de compilación en cada ejecución del engine síncrono. Los
+# requests lo actualizan desde varios hilos.
+_uso_cache_sql: Dict[str, int] = {"aciertos": 0, "fallos": 0, "sin_cache": 0}
+_lock_cache_sql = threading.Lock()
+_capacidad_cache_sql = 0
+
+
+def init_db(
+    db_path: str = "app.db",
+    perfil: Optional[str] = None,
+    database_url: Optional[str] = None,
+) -> None:
+    """Crea el engine y la fábrica de sesiones. No abre conexiones ni toca el esquema."""
+    global _engine, _session_factory, _scoped_session, _capacidad_cache_sql
     
     if _engine is not None:
         return  
     
-    database_url = f"sqlite:///{db_path}"
-    _engine = create_engine(
-        database_url,
-        connect_args={"check_same_thread": False}, 
-        echo=False,  
-    )
+    database_url = obtener_url(db_path, database_url)
+    configuracion = obtener_perfil(perfil, database_url)
+    _capacidad_cache_sql = configuracion["query_cache_size"]
+    
+    _engine = create_engine(database_url, echo=False, **_argumentos_engine(database_url, configuracion))
+    if es_sqlite(database_url):
+        _registrar_pragmas(_engine, configuracion["pragmas"])
+    _registrar_uso_cache_sql(_engine)
+    _registrar_diagnostico(_engine)
     
-    _session_factory = sessionmaker(bind=_engine)
+    # Las sesiones viven lo que dura un request: tras el commit los objetos ya
+    # cargados siguen siendo válidos y no hace falta volver a leerlos.
+    _session_factory = sessionmaker(bind=_engine, expire_on_commit=False)
     _scoped_session = scoped_session(_session_factory)
     
     from models.ticket import Ticket
     from models.incidente import Incidente
+    from database import cambios, contadores
     
-    Base.metadata.create_all(_engine)
-    
-    _crear_tablas_auxiliares()
+    contadores.registrar_eventos(_session_factory)
+    cambios.registrar_eventos(_session_factory)
 
     print("Base de datos inicializada con SQLAlchemy")
 
-def _crear_tablas_auxiliares() -> None:
-    from sqlalchemy import text
-    
-    with _engine.connect() as conn:
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS clientes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                email TEXT NOT NULL,
-                telefono TEXT NOT NULL,
-                direccion TEXT NOT NULL
-            )
-        """))
-        
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS empleados (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL,
-                categoria TEXT NOT NULL,
-                rol TEXT NOT NULL
-            )
-        """))
-        
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS equipos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                descripcion TEXT NOT NULL,
-                categoria TEXT NOT NULL,
-                marca TEXT NOT NULL,
-                modelo TEXT NOT NULL,
-                nro_serie TEXT NOT NULL
-            )
-        """))
-        
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS servicios (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nombre TEXT NOT NULL
-            )
-        """))
-        
-        conn.execute(text("""
-            CREATE TABLE IF NOT EXISTS trabajos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ticket_id INTEGER NOT NULL,
-                autor TEXT NOT NULL,
-                contenido TEXT NOT NULL,
-                fecha TEXT NOT NULL,
-                FOREIGN KEY (ticket_id) REFERENCES tickets(id)
-            )
-        """))
-        
-        conn.commit()
+
+def migrar_db(
+    db_path: str = "app.db",
+    perfil: Optional[str] = None,
+    database_url: Optional[str] = None,
+) -> List[int]:
+    """Aplica las migraciones pendientes. Es un paso único de despliegue, no de cada worker."""
+    from database.migraciones import aplicar_migraciones
+    
+    init_db(db_path, perfil, database_url)
+    return aplicar_migraciones(_engine)
+
+
+def verificar_esquema(db_path: str = "app.db", database_url: Optional[str] = None) -> None:
+    """Falla si quedan migraciones pendientes, usando un engine descartable que no se hereda al hacer fork."""
+    from database.migraciones import migraciones_pendientes
+    
+    engine = create_engine(obtener_url(db_path, database_url))
+    try:
+        pendientes = migraciones_pendientes(engine)
+    finally:
+        engine.dispose()
+    if pendientes:
+        raise RuntimeError(
+            f"Hay migraciones pendientes ({', '.join(map(str, pendientes))}). Ejecute: python manage.py init-db"
+        )
+
+
+def reiniciar_tras_fork() -> None:
+    """Descarta en el proceso hijo las conexiones heredadas del padre sin cerrarlas, porque siguen siendo del padre."""
+    if _scoped_session is not None:
+        _scoped_session.remove()
+    if _engine is not None:
+        _engine.dispose(close=False)
+
+
+def init_db_async(
+    db_path: str = "app.db",
+    perfil: Optional[str] = None,
+    database_url: Optional[str] = None,
+) -> None:
+    """Crea el engine asíncrono del modo ASGI. El esquema lo migra manage.py init-db."""
+    global _engine_async, _session_factory_async
+    
+    if _engine_async is not None:
+        return
+    
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+    
+    database_url = obtener_url(db_path, database_url)
+    configuracion = obtener_perfil(perfil, database_url)
+    
+    _engine_async = create_async_engine(
+        obtener_url_async(database_url),
+        echo=False,
+        **_argumentos_engine(database_url, configuracion),
+    )
+    if es_sqlite(database_url):
+        _registrar_pragmas(_engine_async.sync_engine, configuracion["pragmas"])
+    _registrar_diagnostico(_engine_async.sync_engine)
+    
+    _session_factory_async = async_sessionmaker(_engine_async, expire_on_commit=False)
+
+
+def _argumentos_engine(database_url: str, configuracion: Dict[str, Any]) -> Dict[str, Any]:
+    argumentos: Dict[str, Any] = {
+        "pool_pre_ping": configuracion["pool_pre_ping"],
+        "query_cache_size": configuracion["query_cache_size"],
+    }
+    if es_sqlite(database_url):
+        argumentos["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in database_url or database_url in ("sqlite://", "sqlite:///"):
+            # Una sola conexión compartida: con una por hilo cada hilo vería su propia base vacía.
+            argumentos["poolclass"] = StaticPool
+            return argumentos
+    
+    argumentos.update(
+        pool_size=configuracion["pool_size"],
+        max_overflow=configuracion["max_overflow"],
+        pool_timeout=configuracion["pool_timeout"],
+        pool_recycle=configuracion["pool_recycle"],
+    )
+    return argumentos
+
+
+def nombre_backend() -> str:
+    if _engine is None:
+        return make_url(obtener_url()).get_backend_name()
+    return _engine.dialect.name
+
+
+def _registrar_pragmas(engine, pragmas: Dict[str, Any]) -> None:
+    if not pragmas:
+        return
+    
+    @event.listens_for(engine, "connect")
+    def aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for nombre, valor in pragmas.items():
+                cursor.execute(f"PRAGMA {nombre}={valor}")
+        finally:
+            cursor.close()
+
+
+def _registrar_uso_cache_sql(engine) -> None:
+    from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def contar_uso_cache(conn, cursor, statement, parameters, context, executemany):
+        # Las sentencias de texto y los PRAGMA no pasan por la caché.
+        if context is None or context.cache_hit not in (CACHE_HIT, CACHE_MISS):
+            clave = "sin_cache"
+        elif context.cache_hit == CACHE_HIT:
+            clave = "aciertos"
+        else:
+            clave = "fallos"
+        with _lock_cache_sql:
+            _uso_cache_sql[clave] += 1
+
+
+def estadisticas_cache_sql() -> Dict[str, Any]:
+    """Capacidad configurada de la caché de sentencias compiladas y aciertos desde el arranque.
+
+    Sólo usa context.cache_hit, que es público; la ocupación de la caché es un atributo
+    privado del engine y no se informa.
+    """
+    with _lock_cache_sql:
+        return {"capacidad": _capacidad_cache_sql if _engine is not None else 0, **_uso_cache_sql}
+
+
+def _registrar_diagnostico(engine) -> None:
+    global _diagnostico
+    
+    if _diagnostico is None:
+        ajustes = obtener_ajustes_diagnostico()
+        if ajustes is None:
+            return
+        _diagnostico = Diagnostico(**ajustes)
+    _diagnostico.registrar(engine)
+
+
+def configurar_diagnostico(
+    umbral_lenta_ms: Optional[float] = None,
+    maximo_repeticiones: Optional[int] = None,
+    estricto: bool = False,
+) -> Diagnostico:
+    """Activa el diagnóstico SQL sin pasar por variables de entorno, por ejemplo desde el arranque de las pruebas."""
+    global _diagnostico
+    
+    quitar_diagnostico()
+    _diagnostico = Diagnostico(umbral_lenta_ms, maximo_repeticiones, estricto)
+    for engine in _engines_creados():
+        _diagnostico.registrar(engine)
+    return _diagnostico
+
+
+def quitar_diagnostico() -> None:
+    global _diagnostico
+    
+    if _diagnostico is None:
+        return
+    for engine in _engines_creados():
+        _diagnostico.quitar(engine)
+    _diagnostico = None
+
+
+def obtener_diagnostico() -> Optional[Diagnostico]:
+    return _diagnostico
+
+
+def _engines_creados() -> List[Any]:
+    engines = [_engine] if _engine is not None else []
+    if _engine_async is not None:
+        engines.append(_engine_async.sync_engine)
+    return engines
+
 
 def get_session():
     if _scoped_session is None:
         init_db()
+    if _diagnostico is not None:
+        _diagnostico.iniciar_unidad()
     return _scoped_session()
 
 
 def close_session() -> None:
     if _scoped_session is not None:
         _scoped_session.remove()
+    if _diagnostico is not None:
+        _diagnostico.terminar_unidad()
+
+
+@contextmanager
+def unidad_de_diagnostico() -> Iterator[None]:
+    """Cuenta como una unidad de trabajo del diagnóstico SQL lo que se ejecute dentro del bloque."""
+    if _diagnostico is None:
+        yield
+        return
+    with _diagnostico.unidad():
+        yield
+
+
+@contextmanager
+def sesion_propia() -> Iterator[Session]:
+    """Sesión aparte de la del request, que se cierra al salir sin tocar la sesión ni la unidad de trabajo en curso."""
+    if _session_factory is None:
+        init_db()
+    session = _session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_session_async():
+    if _session_factory_async is None:
+        init_db_async()
+    return _session_factory_async()
+
+
+async def close_db_async() -> None:
+    global _engine_async, _session_factory_async
+    
+    if _engine_async is not None:
+        await _engine_async.dispose()
+        _engine_async = None
+        _session_factory_async = None
 
 
 def close_db() -> None:
@@ -109,5 +300,8 @@ def close_db() -> None:
         _engine.dispose()
         _engine = None
         _session_factory = None
+    with _lock_cache_sql:
+        for clave in _uso_cache_sql:
+            _uso_cache_sql[clave] = 0
     
     print("Base de datos cerrada")
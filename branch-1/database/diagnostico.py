@@ -0,0 +1,145 @@
+import logging
+import re
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Deque, Dict, Iterator, List, Optional
+from sqlalchemy import event
+
+logger = logging.getLogger("ticketing.sql")
+
+# Sentencias que se cuentan y a las que se les puede pedir el plan. Los PRAGMA y el DDL
+# de las migraciones y la reflexión se repiten por tabla y no son consultas de la aplicación.
+_DML = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+# Listas de parámetros de un IN expandido: la misma forma con 3 o con 300 valores.
+_LISTA_PARAMETROS = re.compile(r"\bIN\s*\(\s*(\?|%s|%\(\w+\)s)(\s*,\s*(\?|%s|%\(\w+\)s))*\s*\)", re.IGNORECASE)
+
+# Unidad de trabajo actual, de get_session a close_session. Fuera de una unidad
+# (migraciones, scripts sobre el engine) no se cuenta.
+_unidad: ContextVar[Optional["_Unidad"]] = ContextVar("unidad_diagnostico", default=None)
+
+
+class ConsultasRepetidasError(RuntimeError):
+    """Una misma forma de sentencia se ejecutó más veces de las permitidas en una unidad de trabajo."""
+
+
+class _Unidad:
+    __slots__ = ("repeticiones", "contexto")
+
+    def __init__(self):
+        self.repeticiones: Dict[str, int] = {}
+        self.contexto = None
+
+
+def forma_de(sentencia: str) -> str:
+    return _LISTA_PARAMETROS.sub("IN (?)", " ".join(sentencia.split()))
+
+
+class Diagnostico:
+    """Registro de sentencias lentas con su plan y detector de sentencias repetidas (N+1).
+
+    Una unidad de trabajo va desde get_session hasta close_session, que en la API es un request.
+    En modo estricto la sentencia que supera el máximo de repeticiones falla con
+    ConsultasRepetidasError, así un N+1 rompe la prueba que lo produce.
+    """
+
+    def __init__(
+        self,
+        umbral_lenta_ms: Optional[float] = None,
+        maximo_repeticiones: Optional[int] = None,
+        estricto: bool = False,
+        historial: int = 100,
+    ):
+        self.umbral_lenta_ms = umbral_lenta_ms
+        self.maximo_repeticiones = maximo_repeticiones
+        self.estricto = estricto
+        self.lentas: Deque[Dict[str, Any]] = deque(maxlen=historial)
+        self.repetidas: Deque[Dict[str, Any]] = deque(maxlen=historial)
+
+    def registrar(self, engine) -> None:
+        if not event.contains(engine, "before_cursor_execute", self._antes_de_sentencia):
+            event.listen(engine, "before_cursor_execute", self._antes_de_sentencia)
+            event.listen(engine, "after_cursor_execute", self._despues_de_sentencia)
+
+    def quitar(self, engine) -> None:
+        if event.contains(engine, "before_cursor_execute", self._antes_de_sentencia):
+            event.remove(engine, "before_cursor_execute", self._antes_de_sentencia)
+            event.remove(engine, "after_cursor_execute", self._despues_de_sentencia)
+
+    def iniciar_unidad(self) -> None:
+        if _unidad.get() is None:
+            _unidad.set(_Unidad())
+
+    def terminar_unidad(self) -> None:
+        _unidad.set(None)
+
+    @contextmanager
+    def unidad(self) -> Iterator[None]:
+        """Unidad de trabajo explícita, para el código que no pasa por get_session y close_session."""
+        token = _unidad.set(_Unidad())
+        try:
+            yield
+        finally:
+            _unidad.reset(token)
+
+    def _antes_de_sentencia(self, conn, cursor, statement, parameters, context, executemany):
+        if self.maximo_repeticiones is not None and statement.lstrip()[:6].upper().startswith(_DML):
+            self._contar(statement, context)
+        # En el contexto de ejecución y no en conn.info: si la sentencia falla (también por
+        # ConsultasRepetidasError) no hay after_cursor_execute y el inicio quedaría en la conexión.
+        if self.umbral_lenta_ms is not None and context is not None:
+            context._inicio_diagnostico = perf_counter()
+
+    def _despues_de_sentencia(self, conn, cursor, statement, parameters, context, executemany):
+        inicio = getattr(context, "_inicio_diagnostico", None)
+        if self.umbral_lenta_ms is None or inicio is None:
+            return
+        milisegundos = (perf_counter() - inicio) * 1000
+        if milisegundos < self.umbral_lenta_ms:
+            return
+        plan = [] if executemany else self._plan(conn, statement, parameters)
+        self.lentas.append({"sentencia": statement, "milisegundos": milisegundos, "plan": plan})
+        logger.warning(
+            "Sentencia lenta (%.1f ms): %s\nParámetros: %r\nPlan:\n  %s",
+            milisegundos, statement, parameters, "\n  ".join(plan) or "(no disponible)",
+        )
+
+    def _contar(self, statement: str, context) -> None:
+        unidad = _unidad.get()
+        # Un executemany partido en lotes (insertmanyvalues) comparte el contexto: es una sola ejecución.
+        if unidad is None or (context is not None and context is unidad.contexto):
+            return
+        unidad.contexto = context
+        forma = forma_de(statement)
+        cantidad = unidad.repeticiones.get(forma, 0) + 1
+        unidad.repeticiones[forma] = cantidad
+        if cantidad != self.maximo_repeticiones + 1:
+            return
+
+        self.repetidas.append({"sentencia": forma, "maximo": self.maximo_repeticiones})
+        mensaje = (
+            f"La misma sentencia se ejecutó más de {self.maximo_repeticiones} veces en una unidad de trabajo "
+            f"(posible N+1): {forma}"
+        )
+        if self.estricto:
+            raise ConsultasRepetidasError(mensaje)
+        logger.warning(mensaje)
+
+    @staticmethod
+    def _plan(conn, statement: str, parameters) -> List[str]:
+        """EXPLAIN de la sentencia en un cursor aparte de la misma conexión, sin pasar por los eventos del engine."""
+        if not statement.lstrip()[:6].upper().startswith(_DML):
+            return []
+        prefijo = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute(prefijo + statement, parameters)
+            filas = cursor.fetchall()
+        except Exception as e:
+            return [f"(sin plan: {e})"]
+        finally:
+            cursor.close()
+        # En SQLite el detalle es la última columna; en otros motores cada fila es una línea del plan.
+        return [str(fila[-1]) if conn.dialect.name == "sqlite" else " ".join(map(str, fila)) for fila in filas]
@@ -0,0 +1,349 @@
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy import (
+    Column, Date, Float, ForeignKey, Index, Integer, MetaData, String, Table, Text,
+    case, column, func, inspect, select, table, text, update,
+)
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.schema import CreateColumn
+
+_metadata_versiones = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _metadata_versiones,
+    Column("version", Integer, primary_key=True),
+    Column("descripcion", String(200), nullable=False),
+    Column("fecha_aplicacion", String(50), nullable=False),
+)
+
+
+# Cada paso declara sus tablas, columnas e índices tal como eran cuando se escribió, sin leer
+# los modelos actuales: así una base nueva pasa por los mismos estados que una existente.
+
+
+def _esquema_inicial(conn: Connection) -> None:
+    metadata = MetaData()
+    Table(
+        "tickets",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("cliente_id", Integer, nullable=False),
+        Column("servicio_id", Integer, nullable=False),
+        Column("equipo_id", Integer, nullable=False),
+        Column("empleado_id", Integer, nullable=False),
+        Column("estado", String(50), nullable=False),
+        Column("fecha_creacion", String(50), nullable=False),
+        Column("fecha_cierre", String(50), nullable=True),
+    )
+    Table(
+        "incidentes",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("descripcion", Text, nullable=False),
+        Column("categoria", String(50), nullable=False),
+        Column("prioridad", String(50), nullable=False),
+        Column("ticket_id", Integer, ForeignKey("tickets.id"), nullable=False),
+    )
+    Table(
+        "clientes",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("nombre", Text, nullable=False),
+        Column("email", Text, nullable=False),
+        Column("telefono", Text, nullable=False),
+        Column("direccion", Text, nullable=False),
+        sqlite_autoincrement=True,
+    )
+    Table(
+        "empleados",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("nombre", Text, nullable=False),
+        Column("categoria", Text, nullable=False),
+        Column("rol", Text, nullable=False),
+        sqlite_autoincrement=True,
+    )
+    Table(
+        "equipos",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("descripcion", Text, nullable=False),
+        Column("categoria", Text, nullable=False),
+        Column("marca", Text, nullable=False),
+        Column("modelo", Text, nullable=False),
+        Column("nro_serie", Text, nullable=False),
+        sqlite_autoincrement=True,
+    )
+    Table(
+        "servicios",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("nombre", Text, nullable=False),
+        sqlite_autoincrement=True,
+    )
+    Table(
+        "trabajos",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("ticket_id", Integer, ForeignKey("tickets.id"), nullable=False),
+        Column("autor", Text, nullable=False),
+        Column("contenido", Text, nullable=False),
+        Column("fecha", Text, nullable=False),
+        sqlite_autoincrement=True,
+    )
+    metadata.create_all(conn)
+
+
+def _agregar_columnas(conn: Connection, nombre_tabla: str, *columnas: Column) -> List[str]:
+    """Agrega las columnas que la tabla todavía no tiene; las bases previas a las migraciones
+    pueden traer algunas."""
+    existentes = {columna["name"] for columna in inspect(conn).get_columns(nombre_tabla)}
+    tabla = Table(nombre_tabla, MetaData(), *columnas)
+    agregadas = []
+    for columna in tabla.columns:
+        if columna.name in existentes:
+            continue
+        ddl = CreateColumn(columna).compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {nombre_tabla} ADD COLUMN {ddl}"))
+        agregadas.append(columna.name)
+    return agregadas
+
+
+def _crear_indices(conn: Connection, nombre_tabla: str, indices: Dict[str, Tuple[str, ...]]) -> None:
+    tabla = Table(nombre_tabla, MetaData(), autoload_with=conn)
+    for nombre, columnas in indices.items():
+        Index(nombre, *(tabla.c[columna] for columna in columnas)).create(conn, checkfirst=True)
+
+
+def _contadores_en_tickets(conn: Connection) -> None:
+    columnas_por_categoria = {
+        "Hardware": "incidentes_hardware",
+        "Software": "incidentes_software",
+        "Red": "incidentes_red",
+        "Otro": "incidentes_otro",
+    }
+    agregadas = _agregar_columnas(
+        conn,
+        "tickets",
+        Column("cantidad_incidentes", Integer, nullable=False, server_default="0"),
+        Column("prioridad_maxima", String(50), nullable=True),
+        *(Column(columna, Integer, nullable=False, server_default="0") for columna in columnas_por_categoria.values()),
+    )
+    if not agregadas:
+        return
+
+    # Sólo los contadores: la versión y la fecha de actualización llegan en el paso 4.
+    tickets = table(
+        "tickets",
+        column("id"),
+        column("cantidad_incidentes"),
+        column("prioridad_maxima"),
+        *(column(columna) for columna in columnas_por_categoria.values()),
+    )
+    incidentes = table("incidentes", column("ticket_id"), column("categoria"), column("prioridad"))
+
+    def contar(*condiciones):
+        return (
+            select(func.count())
+            .select_from(incidentes)
+            .where(incidentes.c.ticket_id == tickets.c.id, *condiciones)
+            .scalar_subquery()
+        )
+
+    rango_prioridad = case(
+        {prioridad: rango for rango, prioridad in enumerate(["Baja", "Media", "Alta", "Crítica"])},
+        value=incidentes.c.prioridad,
+        else_=-1,
+    )
+    valores = {
+        "cantidad_incidentes": contar(),
+        "prioridad_maxima": (
+            select(incidentes.c.prioridad)
+            .where(incidentes.c.ticket_id == tickets.c.id)
+            .order_by(rango_prioridad.desc())
+            .limit(1)
+            .scalar_subquery()
+        ),
+    }
+    for categoria, columna in columnas_por_categoria.items():
+        valores[columna] = contar(incidentes.c.categoria == categoria)
+    conn.execute(update(tickets).values(**valores))
+
+
+def _indices_de_filtros(conn: Connection) -> None:
+    _crear_indices(conn, "tickets", {"ix_tickets_estado_id": ("estado", "id")})
+    _crear_indices(conn, "incidentes", {
+        "ix_incidentes_ticket_id": ("ticket_id",),
+        "ix_incidentes_categoria_id": ("categoria", "id"),
+        "ix_incidentes_prioridad_id": ("prioridad", "id"),
+    })
+
+
+def _versiones(conn: Connection) -> None:
+    for nombre_tabla in ("tickets", "incidentes"):
+        _agregar_columnas(
+            conn,
+            nombre_tabla,
+            Column("version", Integer, nullable=False, server_default="1"),
+            Column("fecha_actualizacion", String(50), nullable=True),
+        )
+    conn.execute(text(
+        "UPDATE tickets SET fecha_actualizacion = COALESCE(fecha_cierre, fecha_creacion) "
+        "WHERE fecha_actualizacion IS NULL"
+    ))
+    conn.execute(
+        text("UPDATE incidentes SET fecha_actualizacion = :ahora WHERE fecha_actualizacion IS NULL"),
+        {"ahora": datetime.now().isoformat()},
+    )
+
+
+def _registro_de_cambios(conn: Connection) -> None:
+    Table(
+        "cambios",
+        MetaData(),
+        Column("seq", Integer, primary_key=True, autoincrement=True),
+        Column("entidad", String(20), nullable=False),
+        Column("entidad_id", Integer, nullable=False),
+        Column("operacion", String(20), nullable=False),
+        Column("ticket_id", Integer, nullable=False),
+        Column("fecha", String(50), nullable=False),
+        sqlite_autoincrement=True,
+    ).create(conn, checkfirst=True)
+
+
+def _indices_de_busqueda(conn: Connection) -> None:
+    _crear_indices(conn, "tickets", {
+        "ix_tickets_cliente_id_id": ("cliente_id", "id"),
+        "ix_tickets_empleado_id_id": ("empleado_id", "id"),
+        "ix_tickets_equipo_id_id": ("equipo_id", "id"),
+        "ix_tickets_fecha_creacion_id": ("fecha_creacion", "id"),
+        "ix_tickets_cantidad_incidentes_id": ("cantidad_incidentes", "id"),
+    })
+    # El índice (ticket_id, categoria, prioridad) cubre por prefijo al de ticket_id solo.
+    _crear_indices(conn, "incidentes", {"ix_incidentes_ticket_categoria_prioridad": ("ticket_id", "categoria", "prioridad")})
+    conn.execute(text("DROP INDEX IF EXISTS ix_incidentes_ticket_id"))
+
+
+def _busqueda_de_texto(conn: Connection) -> None:
+    from database.busqueda import crear_indice_de_busqueda
+
+    crear_indice_de_busqueda(conn)
+
+
+def _fechas_como_timestamp(conn: Connection) -> None:
+    if conn.dialect.name == "sqlite":
+        # SQLite no tiene tipo fecha: DateTime guarda 'AAAA-MM-DD HH:MM:SS.ffffff', que se compara y
+        # ordena como texto. Se normalizan los valores ISO con 'T' y sin microsegundos.
+        for columna in ("fecha_creacion", "fecha_cierre"):
+            conn.execute(text(
+                f"UPDATE tickets SET {columna} = substr(replace({columna}, 'T', ' ') || '.000000', 1, 26) "
+                f"WHERE {columna} IS NOT NULL"
+            ))
+    elif conn.dialect.name == "postgresql":
+        conn.execute(text(
+            "ALTER TABLE tickets "
+            "ALTER COLUMN fecha_creacion TYPE TIMESTAMP USING fecha_creacion::timestamp, "
+            "ALTER COLUMN fecha_cierre TYPE TIMESTAMP USING fecha_cierre::timestamp"
+        ))
+    else:
+        conn.execute(text(
+            "ALTER TABLE tickets MODIFY fecha_creacion DATETIME(6) NOT NULL, MODIFY fecha_cierre DATETIME(6) NULL"
+        ))
+    _crear_indices(conn, "tickets", {"ix_tickets_fecha_cierre": ("fecha_cierre",)})
+
+
+def _resumenes_diarios(conn: Connection) -> None:
+    # Se llenan con la primera ejecución de manage.py actualizar-resumenes.
+    metadata = MetaData()
+    Table(
+        "resumen_diario_tickets",
+        metadata,
+        Column("dia", Date, primary_key=True),
+        Column("estado", String(50), primary_key=True),
+        Column("empleado_id", Integer, primary_key=True),
+        Column("cantidad", Integer, nullable=False),
+    )
+    Table(
+        "resumen_diario_incidentes",
+        metadata,
+        Column("dia", Date, primary_key=True),
+        Column("categoria", String(50), primary_key=True),
+        Column("prioridad", String(50), primary_key=True),
+        Column("cantidad", Integer, nullable=False),
+    )
+    Table(
+        "resumen_diario_cierres",
+        metadata,
+        Column("dia", Date, primary_key=True),
+        Column("empleado_id", Integer, primary_key=True),
+        Column("cantidad", Integer, nullable=False),
+        Column("segundos_cierre", Float, nullable=False),
+    )
+    Table(
+        "resumen_dias_ticket",
+        metadata,
+        Column("ticket_id", Integer, primary_key=True, autoincrement=False),
+        Column("dia_creacion", Date, nullable=False),
+        Column("dia_cierre", Date, nullable=True),
+    )
+    Table(
+        "marcas_de_agua",
+        metadata,
+        Column("nombre", String(50), primary_key=True),
+        Column("seq", Integer, nullable=False),
+        Column("fecha_actualizacion", String(50), nullable=False),
+    )
+    metadata.create_all(conn)
+
+
+def _estado_en_cambios(conn: Connection) -> None:
+    # Los cambios anteriores quedan sin estado: el de hoy no es el que tenía el ticket entonces.
+    _agregar_columnas(conn, "cambios", Column("estado", String(50), nullable=True))
+
+
+MIGRACIONES: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "Esquema inicial", _esquema_inicial),
+    (2, "Contadores de incidentes en tickets", _contadores_en_tickets),
+    (3, "Índices para filtros y paginación", _indices_de_filtros),
+    (4, "Versión y fecha de actualización en tickets e incidentes", _versiones),
+    (5, "Registro de cambios de tickets e incidentes", _registro_de_cambios),
+    (6, "Índices para la búsqueda combinada de tickets", _indices_de_busqueda),
+    (7, "Índice de texto completo sobre la descripción de incidentes", _busqueda_de_texto),
+    (8, "Fechas de creación y cierre de tickets como timestamps", _fechas_como_timestamp),
+    (9, "Resúmenes diarios para series temporales", _resumenes_diarios),
+    (10, "Estado nuevo de los tickets en el registro de cambios", _estado_en_cambios),
+]
+
+
+def version_actual(engine: Engine) -> int:
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(schema_version.name):
+            return 0
+        return conn.execute(select(schema_version.c.version).order_by(schema_version.c.version.desc())).scalar() or 0
+
+
+def migraciones_pendientes(engine: Engine) -> List[int]:
+    actual = version_actual(engine)
+    return [version for version, _, _ in MIGRACIONES if version > actual]
+
+
+def aplicar_migraciones(engine: Engine) -> List[int]:
+    """Aplica en orden las migraciones pendientes, cada una en su propia transacción."""
+    _metadata_versiones.create_all(engine)
+    actual = version_actual(engine)
+
+    aplicadas = []
+    for version, descripcion, migrar in MIGRACIONES:
+        if version <= actual:
+            continue
+        with engine.begin() as conn:
+            migrar(conn)
+            conn.execute(schema_version.insert().values(
+                version=version,
+                descripcion=descripcion,
+                fecha_aplicacion=datetime.now().isoformat(),
+            ))
+        aplicadas.append(version)
+        print(f" Migración {version} aplicada: {descripcion}")
+    return aplicadas
@@ -2,5 +2,8 @@
 
 from .ticket_repository import TicketRepository
 from .incidente_repository import IncidenteRepository
+from .cambio_repository import CambioRepository
+from .estadistica_repository import EstadisticaRepository
+from .resumen_repository import ResumenRepository
 
-__all__ = ["TicketRepository", "IncidenteRepository"]
\ No newline at end of file
+__all__ = ["TicketRepository", "IncidenteRepository", "CambioRepository", "EstadisticaRepository", "ResumenRepository"]
\ No newline at end of file
@@ -0,0 +1,36 @@
+from typing import Optional, List
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from models.cambio import Cambio
+from database.db import get_session
+
+_PRIMER_SEQ = select(func.min(Cambio.seq))
+_ULTIMO_SEQ = select(func.max(Cambio.seq))
+
+
+class CambioRepository:
+    
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session if session is not None else get_session()
+    
+    def listar_desde(self, desde: int, limite: int, entidad: Optional[str] = None) -> List[Cambio]:
+        query = select(Cambio).where(Cambio.seq > desde)
+        if entidad is not None:
+            query = query.where(Cambio.entidad == entidad)
+        return self.session.execute(query.order_by(Cambio.seq).limit(limite)).scalars().all()
+    
+    def primer_seq(self) -> Optional[int]:
+        return self.session.execute(_PRIMER_SEQ).scalar()
+    
+    def ultimo_seq(self) -> Optional[int]:
+        return self.session.execute(_ULTIMO_SEQ).scalar()
+    
+    def compactar(self, antes_de: str) -> int:
+        """Elimina los cambios anteriores a la fecha indicada, conservando siempre el último."""
+        ultimo = self.ultimo_seq()
+        if ultimo is None:
+            return 0
+        resultado = self.session.execute(
+            delete(Cambio).where(Cambio.fecha < antes_de, Cambio.seq < ultimo)
+        )
+        return resultado.rowcount
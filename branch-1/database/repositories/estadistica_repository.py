@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Optional, List, Dict, Tuple
+from sqlalchemy import Float, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+from models.ticket import Ticket
+from models.incidente import Incidente
+from database.db import get_session
+
+ESTADOS_PENDIENTES = ["Abierto", "En Progreso", "Reabierto"]
+
+
+class segundos_entre(FunctionElement):
+    """Segundos transcurridos entre dos timestamps, traducido al dialecto de cada backend."""
+    type = Float()
+    inherit_cache = True
+
+
+@compiles(segundos_entre)
+def _segundos_entre_sqlite(elemento, compiler, **kw):
+    inicio, fin = (compiler.process(argumento, **kw) for argumento in elemento.clauses)
+    return f"((julianday({fin}) - julianday({inicio})) * 86400.0)"
+
+
+@compiles(segundos_entre, "postgresql")
+def _segundos_entre_postgresql(elemento, compiler, **kw):
+    inicio, fin = (compiler.process(argumento, **kw) for argumento in elemento.clauses)
+    return f"EXTRACT(EPOCH FROM ({fin} - {inicio}))"
+
+
+@compiles(segundos_entre, "mysql")
+def _segundos_entre_mysql(elemento, compiler, **kw):
+    inicio, fin = (compiler.process(argumento, **kw) for argumento in elemento.clauses)
+    return f"(TIMESTAMPDIFF(MICROSECOND, {inicio}, {fin}) / 1000000.0)"
+
+
+class EstadisticaRepository:
+    """Agregados calculados en SQL; desde es inclusivo y hasta exclusivo."""
+    
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session if session is not None else get_session()
+    
+    def tickets_por_estado(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> Dict[str, int]:
+        query = select(Ticket.estado, func.count()).group_by(Ticket.estado)
+        query = _ventana(query, Ticket.fecha_creacion, desde, hasta)
+        return dict(self.session.execute(query).tuples().all())
+    
+    def incidentes_por_categoria_y_prioridad(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> List[Tuple[str, str, int]]:
+        query = select(Incidente.categoria, Incidente.prioridad, func.count()).group_by(
+            Incidente.categoria,
+            Incidente.prioridad,
+        )
+        if desde is not None or hasta is not None:
+            query = _ventana(query.join(Ticket, Ticket.id == Incidente.ticket_id), Ticket.fecha_creacion, desde, hasta)
+        return list(self.session.execute(query).tuples())
+    
+    def tiempo_medio_de_cierre(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> Tuple[int, Optional[float]]:
+        """Cantidad de tickets cerrados en la ventana y segundos promedio entre creación y cierre."""
+        query = select(func.count(), func.avg(segundos_entre(Ticket.fecha_creacion, Ticket.fecha_cierre)))
+        query = _ventana(query.where(Ticket.estado == "Cerrado"), Ticket.fecha_cierre, desde, hasta)
+        cantidad, promedio = self.session.execute(query).one()
+        return cantidad, promedio
+    
+    def pendientes_por_empleado(
+        self,
+        desde: Optional[datetime] = None,
+        hasta: Optional[datetime] = None,
+    ) -> List[Tuple[int, int]]:
+        cantidad = func.count().label("pendientes")
+        query = (
+            select(Ticket.empleado_id, cantidad)
+            .where(Ticket.estado.in_(ESTADOS_PENDIENTES))
+            .group_by(Ticket.empleado_id)
+            .order_by(cantidad.desc(), Ticket.empleado_id)
+        )
+        query = _ventana(query, Ticket.fecha_creacion, desde, hasta)
+        return list(self.session.execute(query).tuples())
+
+
+def _ventana(query, columna, desde: Optional[datetime], hasta: Optional[datetime]):
+    if desde is not None:
+        query = query.where(columna >= desde)
+    if hasta is not None:
+        query = query.where(columna < hasta)
+    return query
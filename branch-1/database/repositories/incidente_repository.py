@@ -1,44 +1,164 @@
-from typing import Optional, List
+from typing import Optional, List, Iterable, Iterator, Dict, Any, Tuple
+from sqlalchemy import Row, bindparam, insert, select
 from sqlalchemy.orm import Session
-from models.incidente import Incidente
+from models.incidente import Incidente, CAMPOS_REPRESENTACION
 from database.db import get_session
+from database.contadores import recalcular_contadores
+from database.cambios import CREAR, cambios_de_incidentes, registrar_cambios
+from database.busqueda import Resultado, obtener_busqueda
+
+# Columnas que usa Incidente.representar, para los listados de solo lectura.
+COLUMNAS_LECTURA = [getattr(Incidente, campo) for campo in CAMPOS_REPRESENTACION]
+
+# Sentencias construidas una sola vez; los valores llegan como parámetros.
+_LECTURA = select(Incidente)
+_POR_IDS = _LECTURA.where(Incidente.id.in_(bindparam("ids")))
+_POR_TICKET = _LECTURA.where(Incidente.ticket_id == bindparam("ticket_id"))
+_POR_CATEGORIA = _LECTURA.where(Incidente.categoria == bindparam("categoria"))
+_POR_PRIORIDAD = _LECTURA.where(Incidente.prioridad == bindparam("prioridad"))
+_VERSION = select(Incidente.version, Incidente.fecha_actualizacion).where(Incidente.id == bindparam("id"))
+_FILAS = select(*COLUMNAS_LECTURA)
+_FILA = _FILAS.where(Incidente.id == bindparam("id"))
+_FILAS_POR_CATEGORIA = _FILAS.where(Incidente.categoria == bindparam("categoria"))
+_FILAS_POR_PRIORIDAD = _FILAS.where(Incidente.prioridad == bindparam("prioridad"))
+_FILAS_POR_TICKETS = (
+    _FILAS
+    .where(Incidente.ticket_id.in_(bindparam("ids")))
+    .order_by(Incidente.ticket_id, Incidente.id)
+)
 
 
 class IncidenteRepository:
     
-    def __init__(self):
-        self.session: Session = get_session()
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session if session is not None else get_session()
     
     def crear(self, incidente: Incidente) -> Incidente:
         self.session.add(incidente)
-        self.session.commit()
-        self.session.refresh(incidente)
+        self.session.flush()
         return incidente
     
+    def crear_en_bloque(self, filas: List[Dict[str, Any]], tamano_lote: int = 1000) -> List[int]:
+        ids: List[int] = []
+        for inicio in range(0, len(filas), tamano_lote):
+            resultado = self.session.execute(
+                insert(Incidente).returning(Incidente.id, sort_by_parameter_order=True),
+                filas[inicio:inicio + tamano_lote],
+            )
+            ids.extend(resultado.scalars().all())
+        
+        if filas:
+            recalcular_contadores(self.session, {fila["ticket_id"] for fila in filas})
+            registrar_cambios(
+                self.session,
+                cambios_de_incidentes(CREAR, zip(ids, (fila["ticket_id"] for fila in filas))),
+            )
+        return ids
+    
     def obtener_por_id(self, incidente_id: int) -> Optional[Incidente]:
-        return self.session.query(Incidente).filter(Incidente.id == incidente_id).first()
+        return self.session.get(Incidente, incidente_id)
+    
+    def obtener_por_ids(self, incidente_ids: Iterable[int]) -> List[Incidente]:
+        ids = list(set(incidente_ids))
+        incidentes: List[Incidente] = []
+        for inicio in range(0, len(ids), 1000):
+            lote = ids[inicio:inicio + 1000]
+            incidentes.extend(self.session.execute(_POR_IDS, {"ids": lote}).scalars())
+        return incidentes
+    
+    def obtener_version(self, incidente_id: int) -> Optional[Tuple[int, Optional[str]]]:
+        fila = self.session.execute(_VERSION, {"id": incidente_id}).first()
+        return (fila.version, fila.fecha_actualizacion) if fila else None
+    
+    def listar_todos(self, limite: Optional[int] = None, despues_de: Optional[int] = None) -> List[Incidente]:
+        return self.session.execute(self._paginar(_LECTURA, limite, despues_de)).scalars().all()
+    
+    def iterar_todos(self, despues_de: Optional[int] = None, tamano_lote: int = 500) -> Iterator[Incidente]:
+        query = self._paginar(_LECTURA, None, despues_de)
+        return iter(self.session.execute(query, execution_options={"yield_per": tamano_lote}).scalars())
+    
+    def obtener_fila(self, incidente_id: int) -> Optional[Row]:
+        return self.session.execute(_FILA, {"id": incidente_id}).first()
     
-    def listar_todos(self) -> List[Incidente]:
-        return self.session.query(Incidente).order_by(Incidente.id).all()
+    def listar_filas(self, limite: Optional[int] = None, despues_de: Optional[int] = None) -> List[Row]:
+        """Como listar_todos, pero en filas: sin instancias, mapa de identidad ni seguimiento de cambios."""
+        return self.session.execute(self._paginar(_FILAS, limite, despues_de)).all()
+    
+    def iterar_filas(self, despues_de: Optional[int] = None, tamano_lote: int = 500) -> Iterator[Row]:
+        query = self._paginar(_FILAS, None, despues_de)
+        return iter(self.session.execute(query, execution_options={"yield_per": tamano_lote}))
+    
+    def filtrar_filas_por_categoria(
+        self,
+        categoria: str,
+        limite: Optional[int] = None,
+        despues_de: Optional[int] = None,
+    ) -> List[Row]:
+        query = self._paginar(_FILAS_POR_CATEGORIA, limite, despues_de)
+        return self.session.execute(query, {"categoria": categoria}).all()
+    
+    def filtrar_filas_por_prioridad(
+        self,
+        prioridad: str,
+        limite: Optional[int] = None,
+        despues_de: Optional[int] = None,
+    ) -> List[Row]:
+        query = self._paginar(_FILAS_POR_PRIORIDAD, limite, despues_de)
+        return self.session.execute(query, {"prioridad": prioridad}).all()
+    
+    def buscar(
+        self,
+        consulta: str,
+        limite: int,
+        despues_de: Optional[Tuple[float, int]] = None,
+    ) -> List[Resultado]:
+        return obtener_busqueda(self.session).buscar(self.session, consulta, limite, despues_de)
+    
+    def filas_por_tickets(self, ticket_ids: Iterable[int]) -> Dict[int, List[Row]]:
+        """Incidentes de varios tickets en filas, agrupados por ticket y ordenados por id."""
+        ids = sorted(set(ticket_ids))
+        por_ticket: Dict[int, List[Row]] = {}
+        for inicio in range(0, len(ids), 1000):
+            lote = ids[inicio:inicio + 1000]
+            for fila in self.session.execute(_FILAS_POR_TICKETS, {"ids": lote}):
+                por_ticket.setdefault(fila.ticket_id, []).append(fila)
+        return por_ticket
     
     def listar_por_ticket(self, ticket_id: int) -> List[Incidente]:
-        return self.session.query(Incidente).filter(Incidente.ticket_id == ticket_id).all()
+        return self.session.execute(_POR_TICKET, {"ticket_id": ticket_id}).scalars().all()
     
-    def eliminar(self, incidente_id: int) -> bool:
+    def eliminar(self, incidente_id: int) -> Optional[Incidente]:
         incidente = self.obtener_por_id(incidente_id)
         if incidente:
             self.session.delete(incidente)
-            self.session.commit()
-            return True
-        return False
+        return incidente
     
-    def filtrar_por_categoria(self, categoria: str) -> List[Incidente]:
-        return self.session.query(Incidente).filter(Incidente.categoria == categoria).all()
+    def filtrar_por_categoria(
+        self,
+        categoria: str,
+        limite: Optional[int] = None,
+        despues_de: Optional[int] = None,
+    ) -> List[Incidente]:
+        query = self._paginar(_POR_CATEGORIA, limite, despues_de)
+        return self.session.execute(query, {"categoria": categoria}).scalars().all()
     
-    def filtrar_por_prioridad(self, prioridad: str) -> List[Incidente]:
-        return self.session.query(Incidente).filter(Incidente.prioridad == prioridad).all()
+    def filtrar_por_prioridad(
+        self,
+        prioridad: str,
+        limite: Optional[int] = None,
+        despues_de: Optional[int] = None,
+    ) -> List[Incidente]:
+        query = self._paginar(_POR_PRIORIDAD, limite, despues_de)
+        return self.session.execute(query, {"prioridad": prioridad}).scalars().all()
     
     def actualizar(self, incidente: Incidente) -> Incidente:
-        self.session.commit()
-        self.session.refresh(incidente)
+        self.session.flush()
         return incidente
+    
+    def _paginar(self, query, limite: Optional[int], despues_de: Optional[int]):
+        if despues_de is not None:
+            query = query.where(Incidente.id > despues_de)
+        query = query.order_by(Incidente.id)
+        if limite is not None:
+            query = query.limit(limite)
+        return query
@@ -0,0 +1,37 @@
+from datetime import date
+from typing import Optional, List, Any
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from models.resumen import MARCA_RESUMENES, SERIES, MarcaDeAgua, ResumenDiarioCierres
+from database.db import get_session
+
+
+class ResumenRepository:
+    """Lecturas sobre los resúmenes diarios que mantiene database.resumenes."""
+    
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session if session is not None else get_session()
+    
+    def obtener_marca(self) -> Optional[MarcaDeAgua]:
+        return self.session.get(MarcaDeAgua, MARCA_RESUMENES)
+    
+    def serie(
+        self,
+        metrica: str,
+        por: Optional[str] = None,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+    ) -> List[Any]:
+        """Filas (dia, [valor de la dimensión], cantidad[, segundos_cierre]) ordenadas por día; desde y hasta son inclusivos."""
+        modelo, _ = SERIES[metrica]
+        claves = [modelo.dia] + ([getattr(modelo, por)] if por else [])
+        agregados = [func.sum(modelo.cantidad)]
+        if modelo is ResumenDiarioCierres:
+            agregados.append(func.sum(modelo.segundos_cierre))
+        
+        query = select(*claves, *agregados).group_by(*claves).order_by(*claves)
+        if desde is not None:
+            query = query.where(modelo.dia >= desde)
+        if hasta is not None:
+            query = query.where(modelo.dia <= hasta)
+        return self.session.execute(query).all()
@@ -1,57 +1,243 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Optional, List, Iterator, Dict, Any, Iterable, Set, Tuple, Union
+from sqlalchemy import Row, bindparam, insert, select, tuple_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 from models.ticket import Ticket
+from models.incidente import Incidente
 from database.db import get_session
+from database.contadores import recalcular_contadores
+from database.cambios import CREAR, cambios_de_incidentes, registrar_cambios
+
+# Posición de keyset: el id para el orden por id, (valor, id) para el resto.
+Posicion = Union[int, Tuple[Any, int]]
+
+# Columnas que usa Ticket.representar, para los listados de solo lectura.
+COLUMNAS_LECTURA = [
+    Ticket.id, Ticket.cliente_id, Ticket.servicio_id, Ticket.equipo_id, Ticket.empleado_id, Ticket.estado,
+    Ticket.fecha_creacion, Ticket.fecha_cierre, Ticket.fecha_actualizacion, Ticket.version,
+    Ticket.cantidad_incidentes, Ticket.prioridad_maxima,
+    Ticket.incidentes_hardware, Ticket.incidentes_software, Ticket.incidentes_red, Ticket.incidentes_otro,
+]
+
+# Sentencias construidas una sola vez; los valores llegan como parámetros y la
+# compilación se reutiliza desde la caché del engine.
+_IDS_EXISTENTES = select(Ticket.id).where(Ticket.id.in_(bindparam("ids")))
+_INCIDENTES_DE = (
+    select(Incidente.id, Incidente.ticket_id)
+    .where(Incidente.ticket_id.in_(bindparam("ids")))
+    .order_by(Incidente.id)
+)
+_POR_IDS = select(Ticket).where(Ticket.id.in_(bindparam("ids")))
+_VERSION = select(Ticket.version, Ticket.fecha_actualizacion).where(Ticket.id == bindparam("id"))
+_CON_INCIDENTES = [selectinload(Ticket.incidentes)]
+_LECTURA = select(Ticket)
+_LECTURA_CON_INCIDENTES = select(Ticket).options(*_CON_INCIDENTES)
+_POR_ESTADO = _LECTURA.where(Ticket.estado == bindparam("estado"))
+_FILAS = select(*COLUMNAS_LECTURA)
 
 
 class TicketRepository:
     
-    def __init__(self):
-        self.session: Session = get_session()
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session if session is not None else get_session()
     
     def crear(self, ticket: Ticket) -> Ticket:
         self.session.add(ticket)
-        self.session.commit()
-        self.session.refresh(ticket)
+        self.session.flush()
         return ticket
     
+    def crear_en_bloque(
+        self,
+        filas: List[Dict[str, Any]],
+        incidentes_por_ticket: List[List[Dict[str, Any]]],
+        tamano_lote: int = 1000,
+    ) -> List[int]:
+        """Inserta tickets con executemany + RETURNING; incidentes_por_ticket va en el mismo orden que filas."""
+        ids: List[int] = []
+        for inicio in range(0, len(filas), tamano_lote):
+            resultado = self.session.execute(
+                insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True),
+                filas[inicio:inicio + tamano_lote],
+            )
+            ids.extend(resultado.scalars().all())
+        
+        filas_incidentes = [
+            dict(incidente, ticket_id=ticket_id)
+            for ticket_id, incidentes in zip(ids, incidentes_por_ticket)
+            for incidente in incidentes
+        ]
+        for inicio in range(0, len(filas_incidentes), tamano_lote):
+            self.session.execute(insert(Incidente), filas_incidentes[inicio:inicio + tamano_lote])
+        
+        cambios = [("ticket", CREAR, ticket_id, ticket_id) for ticket_id in ids]
+        if filas_incidentes:
+            recalcular_contadores(self.session, {fila["ticket_id"] for fila in filas_incidentes})
+            # Todos los incidentes de estos tickets son nuevos; leerlos evita un RETURNING fila a fila.
+            cambios += cambios_de_incidentes(CREAR, self._incidentes_de(ids), tickets_ya_registrados=ids)
+        registrar_cambios(self.session, cambios)
+        return ids
+    
+    def ids_existentes(self, ticket_ids: Iterable[int]) -> Set[int]:
+        ids = list(set(ticket_ids))
+        existentes: Set[int] = set()
+        for inicio in range(0, len(ids), 1000):
+            lote = ids[inicio:inicio + 1000]
+            existentes.update(self.session.execute(_IDS_EXISTENTES, {"ids": lote}).scalars())
+        return existentes
+    
+    def _incidentes_de(self, ticket_ids: List[int]) -> List[Tuple[int, int]]:
+        pares: List[Tuple[int, int]] = []
+        for inicio in range(0, len(ticket_ids), 1000):
+            lote = ticket_ids[inicio:inicio + 1000]
+            pares.extend(self.session.execute(_INCIDENTES_DE, {"ids": lote}).tuples())
+        return pares
+    
     def obtener_por_id(self, ticket_id: int) -> Optional[Ticket]:
-        return self.session.query(Ticket).filter(Ticket.id == ticket_id).first()
+        # Si el ticket ya está en el mapa de identidad de la sesión no se consulta la base.
+        return self.session.get(Ticket, ticket_id)
     
-    def listar_todos(self) -> List[Ticket]:
-        return self.session.query(Ticket).order_by(Ticket.id).all()
+    def obtener_por_ids(self, ticket_ids: Iterable[int]) -> List[Ticket]:
+        ids = list(set(ticket_ids))
+        tickets: List[Ticket] = []
+        for inicio in range(0, len(ids), 1000):
+            lote = ids[inicio:inicio + 1000]
+            tickets.extend(self.session.execute(_POR_IDS, {"ids": lote}).scalars())
+        return tickets
     
-    def actualizar_estado(self, ticket_id: int, nuevo_estado: str) -> bool:
-        ticket = self.obtener_por_id(ticket_id)
+    def obtener_version(self, ticket_id: int) -> Optional[Tuple[int, Optional[str]]]:
+        fila = self.session.execute(_VERSION, {"id": ticket_id}).first()
+        return (fila.version, fila.fecha_actualizacion) if fila else None
+    
+    def obtener_para_lectura(self, ticket_id: int, incluir_incidentes: bool = True) -> Optional[Ticket]:
+        return self.session.get(Ticket, ticket_id, options=_CON_INCIDENTES if incluir_incidentes else None)
+    
+    def listar_todos(
+        self,
+        limite: Optional[int] = None,
+        despues_de: Optional[Posicion] = None,
+        incluir_incidentes: bool = False,
+        filtros: Optional[Dict[str, Any]] = None,
+        orden: str = "id",
+        descendente: bool = False,
+    ) -> List[Ticket]:
+        query = self._filtrar(self._query_lectura(incluir_incidentes), filtros)
+        return self.session.execute(self._paginar(query, limite, despues_de, orden, descendente)).scalars().all()
+    
+    def listar_filas(
+        self,
+        limite: Optional[int] = None,
+        despues_de: Optional[Posicion] = None,
+        filtros: Optional[Dict[str, Any]] = None,
+        orden: str = "id",
+        descendente: bool = False,
+    ) -> List[Row]:
+        """Como listar_todos, pero en filas: sin instancias, mapa de identidad ni seguimiento de cambios."""
+        query = self._filtrar(_FILAS, filtros)
+        return self.session.execute(self._paginar(query, limite, despues_de, orden, descendente)).all()
+    
+    def iterar_todos(
+        self,
+        despues_de: Optional[Posicion] = None,
+        incluir_incidentes: bool = False,
+        tamano_lote: int = 500,
+        filtros: Optional[Dict[str, Any]] = None,
+        orden: str = "id",
+        descendente: bool = False,
+    ) -> Iterator[Ticket]:
+        query = self._filtrar(self._query_lectura(incluir_incidentes), filtros)
+        query = self._paginar(query, None, despues_de, orden, descendente)
+        return iter(self.session.execute(query, execution_options={"yield_per": tamano_lote}).scalars())
+    
+    def actualizar_estado(
+        self,
+        ticket_id: int,
+        nuevo_estado: str,
+        version_esperada: Optional[int] = None,
+    ) -> Optional[Ticket]:
+        ticket = self._obtener_para_modificar(ticket_id, version_esperada)
         if ticket:
             ticket.estado = nuevo_estado
-            self.session.commit()
-            return True
-        return False
+        return ticket
     
-    def cerrar_ticket(self, ticket_id: int) -> bool:
-        ticket = self.obtener_por_id(ticket_id)
+    def cerrar_ticket(self, ticket_id: int, version_esperada: Optional[int] = None) -> Optional[Ticket]:
+        ticket = self._obtener_para_modificar(ticket_id, version_esperada)
         if ticket:
             ticket.cerrar()
-            self.session.commit()
-            return True
-        return False
+        return ticket
     
-    def reabrir_ticket(self, ticket_id: int) -> bool:
-        ticket = self.obtener_por_id(ticket_id)
+    def reabrir_ticket(self, ticket_id: int, version_esperada: Optional[int] = None) -> Optional[Ticket]:
+        ticket = self._obtener_para_modificar(ticket_id, version_esperada)
         if ticket and ticket.estado == "Cerrado":
             ticket.reabrir()
-            self.session.commit()
-            return True
-        return False
+            return ticket
+        return None
     
-    def filtrar_por_estado(self, estado: str) -> List[Ticket]:
-        return self.session.query(Ticket).filter(Ticket.estado == estado).all()
+    def filtrar_por_estado(
+        self,
+        estado: str,
+        limite: Optional[int] = None,
+        despues_de: Optional[int] = None,
+    ) -> List[Ticket]:
+        query = self._paginar(_POR_ESTADO, limite, despues_de)
+        return self.session.execute(query, {"estado": estado}).scalars().all()
     
     def agregar_incidente(self, ticket_id: int, incidente) -> bool:
         ticket = self.obtener_por_id(ticket_id)
         if ticket:
-            ticket.incidentes.append(incidente)
-            self.session.commit()
+            incidente.ticket_id = ticket.id
+            self.session.add(incidente)
+            self.session.flush()
             return True
         return False
+    
+    def _obtener_para_modificar(self, ticket_id: int, version_esperada: Optional[int]) -> Optional[Ticket]:
+        ticket = self.obtener_por_id(ticket_id)
+        if ticket and version_esperada is not None and ticket.version != version_esperada:
+            raise StaleDataError(
+                f"El ticket {ticket_id} está en la versión {ticket.version}, se esperaba {version_esperada}"
+            )
+        return ticket
+    
+    def _query_lectura(self, incluir_incidentes: bool):
+        return _LECTURA_CON_INCIDENTES if incluir_incidentes else _LECTURA
+    
+    def _filtrar(self, query, filtros: Optional[Dict[str, Any]]):
+        """Aplica los filtros presentes; categorías y prioridades exigen un mismo incidente que cumpla ambas."""
+        if not filtros:
+            return query
+        if filtros.get("estados"):
+            query = query.filter(Ticket.estado.in_(filtros["estados"]))
+        for campo in ("cliente_id", "empleado_id", "equipo_id"):
+            if filtros.get(campo) is not None:
+                query = query.filter(getattr(Ticket, campo) == filtros[campo])
+        if filtros.get("creado_desde"):
+            query = query.filter(Ticket.fecha_creacion >= filtros["creado_desde"])
+        if filtros.get("creado_hasta"):
+            query = query.filter(Ticket.fecha_creacion < filtros["creado_hasta"])
+        
+        condiciones = []
+        if filtros.get("categorias"):
+            condiciones.append(Incidente.categoria.in_(filtros["categorias"]))
+        if filtros.get("prioridades"):
+            condiciones.append(Incidente.prioridad.in_(filtros["prioridades"]))
+        if condiciones:
+            query = query.filter(select(Incidente.id).where(Incidente.ticket_id == Ticket.id, *condiciones).exists())
+        return query
+    
+    def _paginar(
+        self,
+        query,
+        limite: Optional[int],
+        despues_de: Optional[Posicion],
+        orden: str = "id",
+        descendente: bool = False,
+    ):
+        claves = [Ticket.id] if orden == "id" else [getattr(Ticket, orden), Ticket.id]
+        if despues_de is not None:
+            valores = [despues_de] if orden == "id" else list(despues_de)
+            posicion, referencia = tuple_(*claves), tuple_(*valores)
+            query = query.filter(posicion < referencia if descendente else posicion > referencia)
+        query = query.order_by(*(clave.desc() if descendente else clave for clave in claves))
+        if limite is not None:
+            query = query.limit(limite)
+        return query
@@ -0,0 +1,204 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy import Date, and_, case, delete, func, insert, select
+from sqlalchemy.orm import Session
+from database.db import get_session, close_session
+from database.repositories.estadistica_repository import segundos_entre
+from models.cambio import Cambio
+from models.incidente import Incidente
+from models.resumen import (
+    MARCA_RESUMENES,
+    DiasDeTicket,
+    MarcaDeAgua,
+    ResumenDiarioCierres,
+    ResumenDiarioIncidentes,
+    ResumenDiarioTickets,
+)
+from models.ticket import Ticket
+
+TAMANO_LOTE = 5000
+DIAS_POR_LOTE = 31
+
+
+def _dia(columna):
+    return func.date(columna, type_=Date)
+
+
+def _en_rango(columna, inicio: date, fin: date):
+    """[inicio, fin) sobre una columna timestamp, resoluble con su índice."""
+    return and_(columna >= datetime.combine(inicio, time.min), columna < datetime.combine(fin, time.min))
+
+
+def _en_dias(columna, dias: List[date]):
+    # Un único rango acotado más un IN sobre el día: días dispersos no generan una cadena de OR.
+    return and_(_en_rango(columna, dias[0], dias[-1] + timedelta(days=1)), _dia(columna).in_(dias))
+
+
+def _lotes(valores: List[Any], tamano: int) -> Iterable[List[Any]]:
+    for inicio in range(0, len(valores), tamano):
+        yield valores[inicio:inicio + tamano]
+
+
+def _consultas(creados: Optional[Any], cerrados: Optional[Any]):
+    """(tabla, columnas, SELECT agregado) de cada resumen, filtrando por fecha de creación o de cierre."""
+    consultas = []
+    if creados is not None:
+        dia = _dia(Ticket.fecha_creacion)
+        consultas.append((
+            ResumenDiarioTickets.__table__,
+            ["dia", "estado", "empleado_id", "cantidad"],
+            select(dia, Ticket.estado, Ticket.empleado_id, func.count())
+            .where(creados)
+            .group_by(dia, Ticket.estado, Ticket.empleado_id),
+        ))
+        consultas.append((
+            ResumenDiarioIncidentes.__table__,
+            ["dia", "categoria", "prioridad", "cantidad"],
+            select(dia, Incidente.categoria, Incidente.prioridad, func.count())
+            .join_from(Incidente, Ticket, Ticket.id == Incidente.ticket_id)
+            .where(creados)
+            .group_by(dia, Incidente.categoria, Incidente.prioridad),
+        ))
+    if cerrados is not None:
+        dia = _dia(Ticket.fecha_cierre)
+        consultas.append((
+            ResumenDiarioCierres.__table__,
+            ["dia", "empleado_id", "cantidad", "segundos_cierre"],
+            select(
+                dia,
+                Ticket.empleado_id,
+                func.count(),
+                func.sum(segundos_entre(Ticket.fecha_creacion, Ticket.fecha_cierre)),
+            )
+            .where(Ticket.estado == "Cerrado", cerrados)
+            .group_by(dia, Ticket.empleado_id),
+        ))
+    return consultas
+
+
+def _dias_de_tickets():
+    dia_cierre = case((Ticket.estado == "Cerrado", _dia(Ticket.fecha_cierre)))
+    return select(Ticket.id, _dia(Ticket.fecha_creacion), dia_cierre)
+
+
+def _recalcular_dias(session: Session, dias_creacion: Set[date], dias_cierre: Set[date]) -> None:
+    """Reemplaza las filas de los días indicados por su agregado actual, con INSERT ... SELECT."""
+    for dias, columna in ((dias_creacion, Ticket.fecha_creacion), (dias_cierre, Ticket.fecha_cierre)):
+        for lote in _lotes(sorted(dias), TAMANO_LOTE):
+            condicion = _en_dias(columna, lote)
+            consultas = _consultas(condicion, None) if columna is Ticket.fecha_creacion else _consultas(None, condicion)
+            for tabla, columnas, query in consultas:
+                session.execute(delete(tabla).where(tabla.c.dia.in_(lote)))
+                session.execute(insert(tabla).from_select(columnas, query))
+
+
+def _guardar_marca(session: Session, seq: int) -> None:
+    marca = session.get(MarcaDeAgua, MARCA_RESUMENES)
+    ahora = datetime.now().isoformat()
+    if marca is None:
+        session.add(MarcaDeAgua(nombre=MARCA_RESUMENES, seq=seq, fecha_actualizacion=ahora))
+    else:
+        marca.seq = seq
+        marca.fecha_actualizacion = ahora
+    session.flush()
+
+
+def actualizar_resumenes(session: Session) -> Dict[str, Any]:
+    """Incorpora los cambios posteriores a la marca de agua, recalculando solo los días que tocan.
+
+    Si nunca se construyeron los resúmenes, o el registro de cambios se compactó por delante de la
+    marca, reconstruye todo.
+    """
+    marca = session.get(MarcaDeAgua, MARCA_RESUMENES)
+    primero, ultimo = session.execute(select(func.min(Cambio.seq), func.max(Cambio.seq))).one()
+    if marca is None or (primero is not None and primero > marca.seq + 1):
+        return reconstruir_resumenes(session)
+    if ultimo is None or ultimo <= marca.seq:
+        return {"modo": "incremental", "marca": marca.seq, "tickets": 0, "dias": 0}
+
+    ticket_ids = session.execute(
+        select(Cambio.ticket_id).where(Cambio.seq > marca.seq, Cambio.seq <= ultimo).distinct()
+    ).scalars().all()
+
+    dias_creacion: Set[date] = set()
+    dias_cierre: Set[date] = set()
+    for lote in _lotes(sorted(ticket_ids), TAMANO_LOTE):
+        anteriores = session.execute(
+            select(DiasDeTicket.dia_creacion, DiasDeTicket.dia_cierre).where(DiasDeTicket.ticket_id.in_(lote))
+        ).all()
+        actuales = session.execute(_dias_de_tickets().where(Ticket.id.in_(lote))).all()
+        for creacion, cierre in anteriores + [(creacion, cierre) for _, creacion, cierre in actuales]:
+            dias_creacion.add(creacion)
+            if cierre is not None:
+                dias_cierre.add(cierre)
+
+        session.execute(delete(DiasDeTicket).where(DiasDeTicket.ticket_id.in_(lote)))
+        if actuales:
+            session.execute(
+                insert(DiasDeTicket),
+                [{"ticket_id": i, "dia_creacion": creacion, "dia_cierre": cierre} for i, creacion, cierre in actuales],
+            )
+
+    _recalcular_dias(session, dias_creacion, dias_cierre)
+    _guardar_marca(session, ultimo)
+    return {
+        "modo": "incremental",
+        "marca": ultimo,
+        "tickets": len(ticket_ids),
+        "dias": len(dias_creacion | dias_cierre),
+    }
+
+
+def _agregar_lote(inicio: date, fin: date) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+    # Cada hilo lee con su propia sesión; las escrituras quedan en la transacción principal.
+    session = get_session()
+    try:
+        consultas = _consultas(_en_rango(Ticket.fecha_creacion, inicio, fin), _en_rango(Ticket.fecha_cierre, inicio, fin))
+        return [(tabla, [dict(zip(columnas, fila)) for fila in session.execute(query)]) for tabla, columnas, query in consultas]
+    finally:
+        close_session()
+
+
+def reconstruir_resumenes(
+    session: Session,
+    hilos: int = 4,
+    dias_por_lote: int = DIAS_POR_LOTE,
+) -> Dict[str, Any]:
+    """Reconstruye los resúmenes desde cero en una sola transacción.
+
+    Los lotes de días se agregan en paralelo y solo después se escriben, para que los hilos lectores
+    no esperen al bloqueo de escritura. Los cambios que lleguen mientras tanto quedan por delante de
+    la marca y los incorpora la siguiente pasada incremental.
+    """
+    marca = session.execute(select(func.max(Cambio.seq))).scalar() or 0
+    primero = session.execute(select(func.min(Ticket.fecha_creacion))).scalar()
+    ultimos = [
+        session.execute(select(func.max(Ticket.fecha_creacion))).scalar(),
+        session.execute(select(func.max(Ticket.fecha_cierre))).scalar(),
+    ]
+
+    lotes: List[Tuple[date, date]] = []
+    if primero is not None:
+        dia = primero.date()
+        fin = max(fecha for fecha in ultimos if fecha is not None).date() + timedelta(days=1)
+        while dia < fin:
+            lotes.append((dia, min(dia + timedelta(days=dias_por_lote), fin)))
+            dia = lotes[-1][1]
+
+    with ThreadPoolExecutor(max_workers=max(1, hilos)) as ejecutor:
+        resultados = list(ejecutor.map(lambda lote: _agregar_lote(*lote), lotes))
+
+    for tabla in (ResumenDiarioTickets.__table__, ResumenDiarioIncidentes.__table__, ResumenDiarioCierres.__table__):
+        session.execute(delete(tabla))
+    filas_escritas = 0
+    for filas_por_tabla in resultados:
+        for tabla, filas in filas_por_tabla:
+            if filas:
+                session.execute(insert(tabla), filas)
+                filas_escritas += len(filas)
+
+    session.execute(delete(DiasDeTicket))
+    session.execute(insert(DiasDeTicket).from_select(["ticket_id", "dia_creacion", "dia_cierre"], _dias_de_tickets()))
+    _guardar_marca(session, marca)
+    return {"modo": "reconstruccion", "marca": marca, "lotes": len(lotes), "filas": filas_escritas}
@@ -0,0 +1,33 @@
+from typing import Optional
+from sqlalchemy.orm import Session
+from database.db import get_session
+from database.repositories.ticket_repository import TicketRepository
+from database.repositories.incidente_repository import IncidenteRepository
+from database.repositories.cambio_repository import CambioRepository
+from database.repositories.estadistica_repository import EstadisticaRepository
+from database.repositories.resumen_repository import ResumenRepository
+
+
+class UnitOfWork:
+    """Agrupa los repositorios sobre una misma sesión para confirmar una sola transacción por request."""
+    
+    def __init__(self, session: Optional[Session] = None):
+        self.session: Session = session if session is not None else get_session()
+        self.tickets = TicketRepository(self.session)
+        self.incidentes = IncidenteRepository(self.session)
+        self.cambios = CambioRepository(self.session)
+        self.estadisticas = EstadisticaRepository(self.session)
+        self.resumenes = ResumenRepository(self.session)
+    
+    def commit(self) -> None:
+        self.session.commit()
+    
+    def rollback(self) -> None:
+        self.session.rollback()
+    
+    def __enter__(self) -> "UnitOfWork":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.rollback()
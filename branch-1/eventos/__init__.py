@@ -0,0 +1,3 @@
+from .difusor import Difusor, Suscripcion, SuscripcionAsync, obtener_difusor
+
+__all__ = ["Difusor", "Suscripcion", "SuscripcionAsync", "obtener_difusor"]
@@ -0,0 +1,243 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from controllers.cambio_controller import CambioController
+from database.db import sesion_propia
+from database.unit_of_work import UnitOfWork
+
+Evento = Dict[str, Any]
+
+TAMANO_LOTE = 500
+
+
+class Suscripcion:
+    """Cola en memoria de un cliente conectado, con sus filtros."""
+    
+    def __init__(
+        self,
+        estado: Optional[str] = None,
+        empleado_id: Optional[int] = None,
+        capacidad: int = 1000,
+    ):
+        self.desde = 0
+        self.estado = estado
+        self.empleado_id = empleado_id
+        self.desbordada = False
+        self._cola: "queue.Queue[Evento]" = queue.Queue(maxsize=capacidad)
+    
+    def acepta(self, evento: Evento) -> bool:
+        # El estado es el que dejó el cambio y no el actual del ticket.
+        if self.estado is not None and evento["estado"] != self.estado:
+            return False
+        if self.empleado_id is not None:
+            ticket = evento["ticket"]
+            if ticket is None or ticket["empleado_id"] != self.empleado_id:
+                return False
+        return True
+    
+    def publicar(self, evento: Evento) -> None:
+        try:
+            self._cola.put_nowait(evento)
+        except queue.Full:
+            # Un cliente lento no frena al resto: se corta y se reconecta con Last-Event-ID.
+            self.desbordada = True
+    
+    def esperar(self, timeout: float) -> Optional[Evento]:
+        try:
+            return self._cola.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def drenar(self) -> List[Evento]:
+        eventos = []
+        while True:
+            try:
+                eventos.append(self._cola.get_nowait())
+            except queue.Empty:
+                return eventos
+
+
+class SuscripcionAsync(Suscripcion):
+    """Suscripción para el modo ASGI: el hilo del difusor entrega los eventos al event loop
+    del cliente, que espera sin ocupar un hilo."""
+    
+    def __init__(
+        self,
+        estado: Optional[str] = None,
+        empleado_id: Optional[int] = None,
+        capacidad: int = 1000,
+    ):
+        super().__init__(estado, empleado_id, capacidad)
+        self._loop = asyncio.get_running_loop()
+        self._cola_async: "asyncio.Queue[Evento]" = asyncio.Queue(maxsize=capacidad)
+    
+    def publicar(self, evento: Evento) -> None:
+        self._loop.call_soon_threadsafe(self._encolar, evento)
+    
+    def _encolar(self, evento: Evento) -> None:
+        try:
+            self._cola_async.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.desbordada = True
+    
+    async def esperar_async(self, timeout: float) -> Optional[Evento]:
+        try:
+            return await asyncio.wait_for(self._cola_async.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+    
+    def drenar(self) -> List[Evento]:
+        eventos = []
+        while not self._cola_async.empty():
+            eventos.append(self._cola_async.get_nowait())
+        return eventos
+
+
+class Difusor:
+    """Un único hilo por proceso lee el registro de cambios y reparte los eventos
+    entre las suscripciones, así los clientes esperan en memoria y no en la base."""
+    
+    def __init__(self, intervalo: float = 0.5, capacidad: int = 1000):
+        self.intervalo = intervalo
+        self.capacidad = capacidad
+        self._suscripciones: Set[Suscripcion] = set()
+        self._ultimo_seq: Optional[int] = None
+        self._lock = threading.Lock()
+        self._hilo: Optional[threading.Thread] = None
+    
+    def suscribir(self, estado: Optional[str] = None, empleado_id: Optional[int] = None) -> Suscripcion:
+        return self.registrar(Suscripcion(estado, empleado_id, self.capacidad))
+    
+    def registrar(self, suscripcion: Suscripcion) -> Suscripcion:
+        """Agrega la suscripción; recibirá los eventos posteriores a suscripcion.desde."""
+        # La consulta va antes del lock, que comparten el hilo del difusor y las demás suscripciones.
+        ultimo = self._ultimo_seq
+        if ultimo is None:
+            with sesion_propia() as session:
+                ultimo = CambioController(UnitOfWork(session)).ultimo_seq()
+        with self._lock:
+            if self._ultimo_seq is None:
+                self._ultimo_seq = ultimo
+            suscripcion.desde = self._ultimo_seq
+            self._suscripciones.add(suscripcion)
+            if self._hilo is None or not self._hilo.is_alive():
+                self._hilo = threading.Thread(target=self._ejecutar, name="difusor-eventos", daemon=True)
+                self._hilo.start()
+        return suscripcion
+    
+    def desuscribir(self, suscripcion: Suscripcion) -> None:
+        with self._lock:
+            self._suscripciones.discard(suscripcion)
+    
+    def escuchar(
+        self,
+        suscripcion: Suscripcion,
+        desde: Optional[int] = None,
+        latido: float = 15.0,
+    ) -> Iterator[Optional[Evento]]:
+        """Emite los eventos pendientes desde 'desde' y luego los nuevos; None marca un latido."""
+        try:
+            ultimo = suscripcion.desde
+            if desde is not None:
+                for evento, ultimo in self._pendientes(suscripcion, desde):
+                    if evento is not None:
+                        yield evento
+            
+            while not suscripcion.desbordada:
+                evento = suscripcion.esperar(latido)
+                if evento is None:
+                    yield None
+                elif evento["seq"] > ultimo:
+                    yield evento
+        finally:
+            self.desuscribir(suscripcion)
+    
+    def esperar_eventos(
+        self,
+        suscripcion: Suscripcion,
+        desde: Optional[int],
+        timeout: float,
+    ) -> Tuple[List[Evento], int]:
+        """Long poll: devuelve los eventos pendientes o espera hasta 'timeout' el siguiente."""
+        try:
+            hasta = suscripcion.desde
+            if desde is not None:
+                pendientes = list(self._pendientes(suscripcion, desde))
+                hasta = pendientes[-1][1] if pendientes else desde
+                eventos = [evento for evento, _ in pendientes if evento is not None]
+                if eventos:
+                    return eventos, hasta
+            
+            limite = time.monotonic() + timeout
+            while True:
+                restante = limite - time.monotonic()
+                evento = suscripcion.esperar(restante) if restante > 0 else None
+                if evento is None:
+                    return [], hasta
+                eventos = [e for e in [evento] + suscripcion.drenar() if e["seq"] > hasta]
+                if eventos:
+                    return eventos, eventos[-1]["seq"]
+        finally:
+            self.desuscribir(suscripcion)
+    
+    def cantidad_suscripciones(self) -> int:
+        with self._lock:
+            return len(self._suscripciones)
+    
+    def _pendientes(self, suscripcion: Suscripcion, desde: int) -> Iterator[Tuple[Optional[Evento], int]]:
+        # Recorre el registro por lotes; un lote sin eventos aceptados avanza igual la secuencia.
+        with sesion_propia() as session:
+            controller = CambioController(UnitOfWork(session))
+            while True:
+                eventos, hasta = controller.obtener_eventos_tickets(desde, TAMANO_LOTE)
+                if hasta == desde:
+                    return
+                for evento in eventos:
+                    if suscripcion.acepta(evento):
+                        yield evento, evento["seq"]
+                yield None, hasta
+                desde = hasta
+    
+    def _ejecutar(self) -> None:
+        while True:
+            time.sleep(self.intervalo)
+            with self._lock:
+                if not self._suscripciones:
+                    self._ultimo_seq = None
+                    continue
+                desde = self._ultimo_seq
+            try:
+                with sesion_propia() as session:
+                    self._sondear(CambioController(UnitOfWork(session)), desde)
+            except Exception as e:
+                print(f" Error al leer el registro de cambios: {e}")
+    
+    def _sondear(self, controller: CambioController, desde: int) -> None:
+        while True:
+            eventos, hasta = controller.obtener_eventos_tickets(desde, TAMANO_LOTE)
+            if hasta == desde:
+                return
+            # Publicar y avanzar juntos: quien se suscribe después ya parte de 'hasta'.
+            with self._lock:
+                for evento in eventos:
+                    for suscripcion in self._suscripciones:
+                        if suscripcion.acepta(evento):
+                            suscripcion.publicar(evento)
+                self._ultimo_seq = hasta
+            desde = hasta
+
+
+_difusor: Optional[Difusor] = None
+
+
+def obtener_difusor() -> Difusor:
+    global _difusor
+    if _difusor is None:
+        _difusor = Difusor(
+            intervalo=float(os.environ.get("TICKETING_STREAM_INTERVALO", "0.5")),
+            capacidad=int(os.environ.get("TICKETING_STREAM_CAPACIDAD", "1000")),
+        )
+    return _difusor
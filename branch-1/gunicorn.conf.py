@@ -0,0 +1,45 @@
+import os
+
+bind = os.environ.get("TICKETING_BIND", "127.0.0.1:8000")
+workers = int(os.environ.get("TICKETING_WORKERS", "4"))
+worker_class = "gthread"
+threads = int(os.environ.get("TICKETING_HILOS", "8"))
+
+# La aplicación (blueprints, Swagger) se importa una vez en el proceso maestro y los
+# workers la heredan ya construida al hacer fork.
+preload_app = True
+
+
+def on_starting(server):
+    from database.db import verificar_esquema
+
+    verificar_esquema()
+    _elegir_cache(server)
+
+
+def _elegir_cache(server):
+    # MemoriaLRU es propia de cada proceso: con varios workers una invalidación sólo llega
+    # al que atendió la escritura, y los demás sirven (y confirman con 304) el ticket viejo
+    # hasta que vence el TTL. Los workers heredan el entorno del maestro al hacer fork.
+    if server.cfg.workers <= 1:
+        return
+    backend = os.environ.get("TICKETING_CACHE_BACKEND")
+    if backend is None:
+        os.environ["TICKETING_CACHE_BACKEND"] = "ninguno"
+        server.log.warning(
+            "Cache de respuestas desactivada: con %s workers la cache en memoria no se invalida entre procesos. "
+            "Use TICKETING_CACHE_BACKEND=redis para compartirla",
+            server.cfg.workers,
+        )
+    elif backend == "memoria":
+        server.log.warning(
+            "TICKETING_CACHE_BACKEND=memoria con %s workers: cada worker invalida sólo su propia cache "
+            "y puede servir tickets desactualizados hasta que venza el TTL",
+            server.cfg.workers,
+        )
+
+
+def post_fork(server, worker):
+    from database.db import reiniciar_tras_fork
+
+    reiniciar_tras_fork()
@@ -0,0 +1,21 @@
+from .mediciones import (
+    TRAMOS,
+    Medicion,
+    iniciar_medicion,
+    terminar_medicion,
+    medir_tramo,
+    instrumentar_clase,
+    registrar_eventos_sql,
+)
+from .metricas import Metricas
+
+__all__ = [
+    "TRAMOS",
+    "Medicion",
+    "iniciar_medicion",
+    "terminar_medicion",
+    "medir_tramo",
+    "instrumentar_clase",
+    "registrar_eventos_sql",
+    "Metricas",
+]
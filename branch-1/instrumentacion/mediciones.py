@@ -0,0 +1,106 @@
+import functools
+import inspect
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Tramos en el orden en que se informan. Son inclusivos: el router contiene al
+# controlador, éste al repositorio y el repositorio al SQL. Lo que el repositorio
+# tarda de más sobre el SQL es sobre todo la hidratación del ORM, y lo que el
+# controlador tarda sobre el repositorio, la conversión a diccionarios.
+TRAMOS = ["router", "controlador", "repositorio", "sql", "serializador"]
+
+
+class Medicion:
+    """Tiempos acumulados de un request por tramo, más las sentencias SQL ejecutadas."""
+    
+    __slots__ = ("inicio", "duraciones", "activos", "sentencias")
+    
+    def __init__(self):
+        self.inicio = perf_counter()
+        self.duraciones: Dict[str, float] = dict.fromkeys(TRAMOS, 0.0)
+        self.activos: Dict[str, bool] = dict.fromkeys(TRAMOS, False)
+        self.sentencias = 0
+    
+    def total(self) -> float:
+        return perf_counter() - self.inicio
+    
+    def server_timing(self) -> str:
+        """Valor de la cabecera Server-Timing, en milisegundos."""
+        partes = [
+            f'{tramo};dur={self.duraciones[tramo] * 1000:.2f}'
+            + (f';desc="{self.sentencias} sentencias"' if tramo == "sql" else "")
+            for tramo in TRAMOS
+        ]
+        partes.append(f"total;dur={self.total() * 1000:.2f}")
+        return ", ".join(partes)
+
+
+_actual: ContextVar[Optional[Medicion]] = ContextVar("medicion", default=None)
+
+
+def iniciar_medicion() -> Medicion:
+    medicion = Medicion()
+    _actual.set(medicion)
+    return medicion
+
+
+def terminar_medicion() -> Optional[Medicion]:
+    medicion = _actual.get()
+    _actual.set(None)
+    return medicion
+
+
+def medir_tramo(funcion: Callable, tramo: str) -> Callable:
+    """Envuelve funcion para sumar su duración al tramo; las llamadas anidadas del mismo tramo no se cuentan dos veces."""
+
+    @functools.wraps(funcion)
+    def medida(*args: Any, **kwargs: Any) -> Any:
+        medicion = _actual.get()
+        if medicion is None or medicion.activos[tramo]:
+            return funcion(*args, **kwargs)
+        medicion.activos[tramo] = True
+        inicio = perf_counter()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            medicion.duraciones[tramo] += perf_counter() - inicio
+            medicion.activos[tramo] = False
+
+    medida.__instrumentada__ = True
+    return medida
+
+
+def instrumentar_clase(clase: type, tramo: str) -> None:
+    """Mide los métodos públicos de la clase. Sólo se llama con la instrumentación activa, así que sin ella no hay costo."""
+    for nombre, atributo in list(vars(clase).items()):
+        if nombre.startswith("_") or not inspect.isfunction(atributo):
+            continue
+        if getattr(atributo, "__instrumentada__", False):
+            continue
+        setattr(clase, nombre, medir_tramo(atributo, tramo))
+
+
+def _antes_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    # El inicio va en el contexto de ejecución y no en la conexión: si la sentencia falla no
+    # hay after_cursor_execute, y lo guardado en conn.info quedaría en la conexión del pool.
+    if context is not None and _actual.get() is not None:
+        context._inicio_medicion = perf_counter()
+
+
+def _despues_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    medicion = _actual.get()
+    inicio = getattr(context, "_inicio_medicion", None)
+    if medicion is None or inicio is None:
+        return
+    medicion.duraciones["sql"] += perf_counter() - inicio
+    medicion.sentencias += 1
+
+
+def registrar_eventos_sql() -> None:
+    """Cuenta sentencias y tiempo de base de datos en todos los engines, incluido el de cada worker."""
+    if not event.contains(Engine, "before_cursor_execute", _antes_de_sentencia):
+        event.listen(Engine, "before_cursor_execute", _antes_de_sentencia)
+        event.listen(Engine, "after_cursor_execute", _despues_de_sentencia)
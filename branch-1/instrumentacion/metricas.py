@@ -0,0 +1,89 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Tuple
+from instrumentacion.mediciones import TRAMOS, Medicion
+
+# Límites superiores, en segundos, de los buckets del histograma de latencia.
+BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Serie:
+    __slots__ = ("buckets", "suma", "cantidad", "sentencias", "segundos_tramo")
+    
+    def __init__(self):
+        self.buckets: List[int] = [0] * len(BUCKETS)
+        self.suma = 0.0
+        self.cantidad = 0
+        self.sentencias = 0
+        self.segundos_tramo: Dict[str, float] = dict.fromkeys(TRAMOS, 0.0)
+
+
+class Metricas:
+    """Latencia por ruta y tiempos por tramo del proceso, en formato de texto de Prometheus.
+
+    Cada worker lleva sus propias series; con varios workers cada scrape ve las de uno solo.
+    """
+    
+    def __init__(self):
+        self._series: Dict[Tuple[str, str, int], _Serie] = {}
+        self._lock = threading.Lock()
+    
+    def observar(self, metodo: str, ruta: str, codigo: int, medicion: Medicion) -> None:
+        segundos = medicion.total()
+        with self._lock:
+            serie = self._series.get((metodo, ruta, codigo))
+            if serie is None:
+                serie = self._series[(metodo, ruta, codigo)] = _Serie()
+            indice = bisect_left(BUCKETS, segundos)
+            if indice < len(BUCKETS):
+                serie.buckets[indice] += 1
+            serie.suma += segundos
+            serie.cantidad += 1
+            serie.sentencias += medicion.sentencias
+            for tramo, duracion in medicion.duraciones.items():
+                serie.segundos_tramo[tramo] += duracion
+    
+    def exportar(self) -> str:
+        with self._lock:
+            series = sorted(self._series.items())
+            lineas = [
+                "# HELP ticketing_request_duracion_segundos Latencia de los requests por ruta.",
+                "# TYPE ticketing_request_duracion_segundos histogram",
+            ]
+            for (metodo, ruta, codigo), serie in series:
+                etiquetas = _etiquetas(metodo=metodo, ruta=ruta, codigo=str(codigo))
+                acumulado = 0
+                for limite, cantidad in zip(BUCKETS, serie.buckets):
+                    acumulado += cantidad
+                    lineas.append(f'ticketing_request_duracion_segundos_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+                lineas.append(f'ticketing_request_duracion_segundos_bucket{{{etiquetas},le="+Inf"}} {serie.cantidad}')
+                lineas.append(f"ticketing_request_duracion_segundos_sum{{{etiquetas}}} {serie.suma}")
+                lineas.append(f"ticketing_request_duracion_segundos_count{{{etiquetas}}} {serie.cantidad}")
+            
+            lineas += [
+                "# HELP ticketing_sql_sentencias_total Sentencias SQL ejecutadas por ruta.",
+                "# TYPE ticketing_sql_sentencias_total counter",
+            ]
+            for (metodo, ruta, codigo), serie in series:
+                etiquetas = _etiquetas(metodo=metodo, ruta=ruta, codigo=str(codigo))
+                lineas.append(f"ticketing_sql_sentencias_total{{{etiquetas}}} {serie.sentencias}")
+            
+            lineas += [
+                "# HELP ticketing_tramo_segundos_total Tiempo acumulado por tramo (router, controlador, repositorio, sql, serializador).",
+                "# TYPE ticketing_tramo_segundos_total counter",
+            ]
+            for (metodo, ruta, codigo), serie in series:
+                for tramo in TRAMOS:
+                    etiquetas = _etiquetas(metodo=metodo, ruta=ruta, codigo=str(codigo), tramo=tramo)
+                    lineas.append(f"ticketing_tramo_segundos_total{{{etiquetas}}} {serie.segundos_tramo[tramo]}")
+        return "\n".join(lineas) + "\n"
+
+
+def _etiquetas(**valores: str) -> str:
+    return ",".join(f'{nombre}="{_escapar(valor)}"' for nombre, valor in valores.items())
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,98 @@
+import argparse
+from datetime import datetime, timedelta
+from database.db import init_db, get_session, close_db
+
+
+def init_db_cli(args: argparse.Namespace) -> None:
+    from database.db import migrar_db
+
+    aplicadas = migrar_db(args.db)
+    print(f" Esquema al día ({len(aplicadas)} migraciones aplicadas)")
+
+
+def recalcular_contadores(args: argparse.Namespace) -> None:
+    from database.contadores import recalcular_contadores as recalcular
+
+    session = get_session()
+    cantidad = recalcular(session)
+    session.commit()
+    print(f" Contadores recalculados para {cantidad} tickets")
+
+
+def compactar_cambios(args: argparse.Namespace) -> None:
+    from database.repositories.cambio_repository import CambioRepository
+
+    session = get_session()
+    limite = (datetime.now() - timedelta(days=args.dias)).isoformat()
+    eliminados = CambioRepository(session).compactar(limite)
+    session.commit()
+    print(f" {eliminados} cambios anteriores a {limite} eliminados")
+
+
+def actualizar_resumenes(args: argparse.Namespace) -> None:
+    from database.resumenes import actualizar_resumenes as actualizar
+
+    session = get_session()
+    resultado = actualizar(session)
+    session.commit()
+    if resultado["modo"] == "reconstruccion":
+        print(f" Resúmenes reconstruidos en {resultado['lotes']} lotes hasta el cambio {resultado['marca']}")
+    else:
+        print(f" {resultado['tickets']} tickets y {resultado['dias']} días recalculados hasta el cambio {resultado['marca']}")
+
+
+def reconstruir_resumenes(args: argparse.Namespace) -> None:
+    from database.resumenes import reconstruir_resumenes as reconstruir
+
+    session = get_session()
+    resultado = reconstruir(session, hilos=args.hilos, dias_por_lote=args.dias_por_lote)
+    session.commit()
+    print(f" Resúmenes reconstruidos en {resultado['lotes']} lotes ({resultado['filas']} filas) hasta el cambio {resultado['marca']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tareas de mantenimiento de la Ticketing API")
+    parser.add_argument("--db", default="app.db", help="Ruta del archivo SQLite")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    subparsers.add_parser(
+        "init-db",
+        help="Crea o migra el esquema. Se ejecuta una vez por despliegue, antes de arrancar los workers",
+    ).set_defaults(funcion=init_db_cli)
+
+    subparsers.add_parser(
+        "recalcular-contadores",
+        help="Recalcula en bloque los contadores de incidentes de todos los tickets",
+    ).set_defaults(funcion=recalcular_contadores)
+
+    compactar = subparsers.add_parser(
+        "compactar-cambios",
+        help="Elimina del registro de cambios las entradas más antiguas que --dias",
+    )
+    compactar.add_argument("--dias", type=int, default=7, help="Días de cambios a conservar")
+    compactar.set_defaults(funcion=compactar_cambios)
+
+    subparsers.add_parser(
+        "actualizar-resumenes",
+        help="Incorpora a los resúmenes diarios los cambios posteriores a la última pasada. "
+             "Debe correr más seguido que compactar-cambios; si no, reconstruye todo",
+    ).set_defaults(funcion=actualizar_resumenes)
+
+    reconstruir = subparsers.add_parser(
+        "reconstruir-resumenes",
+        help="Reconstruye desde cero los resúmenes diarios, agregando lotes de días en paralelo",
+    )
+    reconstruir.add_argument("--hilos", type=int, default=4, help="Lotes agregados a la vez")
+    reconstruir.add_argument("--dias-por-lote", type=int, default=31, help="Días de cada lote")
+    reconstruir.set_defaults(funcion=reconstruir_resumenes)
+
+    args = parser.parse_args()
+    init_db(args.db)
+    try:
+        args.funcion(args)
+    finally:
+        close_db()
+
+
+if __name__ == "__main__":
+    main()
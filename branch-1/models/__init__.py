@@ -2,5 +2,22 @@
 
 from .ticket import Ticket
 from .incidente import Incidente
+from .cambio import Cambio
+from .resumen import ResumenDiarioTickets, ResumenDiarioIncidentes, ResumenDiarioCierres, DiasDeTicket, MarcaDeAgua
+from .auxiliares import Cliente, Empleado, Equipo, Servicio, Trabajo
 
-__all__ = ["Ticket", "Incidente"]
\ No newline at end of file
+__all__ = [
+    "Ticket",
+    "Incidente",
+    "Cambio",
+    "ResumenDiarioTickets",
+    "ResumenDiarioIncidentes",
+    "ResumenDiarioCierres",
+    "DiasDeTicket",
+    "MarcaDeAgua",
+    "Cliente",
+    "Empleado",
+    "Equipo",
+    "Servicio",
+    "Trabajo",
+]
\ No newline at end of file
@@ -0,0 +1,54 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey
+from models.base import Base
+
+
+class Cliente(Base):
+    __tablename__ = 'clientes'
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    nombre = Column(Text, nullable=False)
+    email = Column(Text, nullable=False)
+    telefono = Column(Text, nullable=False)
+    direccion = Column(Text, nullable=False)
+
+
+class Empleado(Base):
+    __tablename__ = 'empleados'
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    nombre = Column(Text, nullable=False)
+    categoria = Column(Text, nullable=False)
+    rol = Column(Text, nullable=False)
+
+
+class Equipo(Base):
+    __tablename__ = 'equipos'
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    descripcion = Column(Text, nullable=False)
+    categoria = Column(Text, nullable=False)
+    marca = Column(Text, nullable=False)
+    modelo = Column(Text, nullable=False)
+    nro_serie = Column(Text, nullable=False)
+
+
+class Servicio(Base):
+    __tablename__ = 'servicios'
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    nombre = Column(Text, nullable=False)
+
+
+class Trabajo(Base):
+    __tablename__ = 'trabajos'
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ticket_id = Column(Integer, ForeignKey('tickets.id'), nullable=False)
+    autor = Column(Text, nullable=False)
+    contenido = Column(Text, nullable=False)
+    fecha = Column(Text, nullable=False)
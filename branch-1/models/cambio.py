@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String
+from datetime import datetime
+from models.base import Base
+
+ENTIDADES = ["ticket", "incidente"]
+OPERACIONES = ["crear", "actualizar", "eliminar"]
+
+
+class Cambio(Base):
+    __tablename__ = 'cambios'
+    # AUTOINCREMENT evita que SQLite reutilice números de secuencia tras compactar.
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entidad = Column(String(20), nullable=False)
+    entidad_id = Column(Integer, nullable=False)
+    operacion = Column(String(20), nullable=False)
+    ticket_id = Column(Integer, nullable=False)
+    # Estado nuevo del ticket en sus altas y cambios de estado; nulo en el resto de los cambios.
+    estado = Column(String(50), nullable=True)
+    fecha = Column(String(50), nullable=False, default=lambda: datetime.now().isoformat())
+    
+    def to_dict(self):
+        return {
+            "seq": self.seq,
+            "entidad": self.entidad,
+            "id": self.entidad_id,
+            "operacion": self.operacion,
+            "ticket_id": self.ticket_id,
+            "estado": self.estado,
+            "fecha": self.fecha,
+        }
+    
+    def __repr__(self):
+        return f"<Cambio(seq={self.seq}, {self.operacion} {self.entidad} {self.entidad_id})>"
@@ -1,10 +1,23 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import Any, Dict
 from models.base import Base
 
+CATEGORIAS = ["Hardware", "Software", "Red", "Otro"]
+PRIORIDADES = ["Baja", "Media", "Alta", "Crítica"]
+# Campos de la representación, en el mismo orden que las columnas de las lecturas en filas.
+CAMPOS_REPRESENTACION = ["id", "descripcion", "categoria", "prioridad", "ticket_id", "fecha_actualizacion", "version"]
+
 
 class Incidente(Base):
     __tablename__ = 'incidentes'
+    __table_args__ = (
+        # Cubre el EXISTS de la búsqueda de tickets y, por prefijo, las lecturas por ticket.
+        Index("ix_incidentes_ticket_categoria_prioridad", "ticket_id", "categoria", "prioridad"),
+        Index("ix_incidentes_categoria_id", "categoria", "id"),
+        Index("ix_incidentes_prioridad_id", "prioridad", "id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     descripcion = Column(Text, nullable=False)
@@ -13,6 +26,16 @@ class Incidente(Base):
     
     ticket_id = Column(Integer, ForeignKey('tickets.id'), nullable=False)
     
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    fecha_actualizacion = Column(
+        String(50),
+        nullable=True,
+        default=lambda: datetime.now().isoformat(),
+        onupdate=lambda: datetime.now().isoformat(),
+    )
+    
+    __mapper_args__ = {"version_id_col": version}
+    
     ticket = relationship("Ticket", back_populates="incidentes")
     
     def __init__(self, descripcion, categoria, prioridad, ticket_id):
@@ -22,13 +45,12 @@ class Incidente(Base):
         self.ticket_id = ticket_id
     
     def to_dict(self):
-        return {
-            "id": self.id,
-            "descripcion": self.descripcion,
-            "categoria": self.categoria,
-            "prioridad": self.prioridad,
-            "ticket_id": self.ticket_id,
-        }
+        return {campo: getattr(self, campo) for campo in CAMPOS_REPRESENTACION}
+    
+    @staticmethod
+    def representar(fila) -> Dict[str, Any]:
+        """Arma la representación desde una fila con las columnas de CAMPOS_REPRESENTACION, en ese orden."""
+        return dict(zip(CAMPOS_REPRESENTACION, fila))
     
     def __repr__(self):
         return f"<Incidente(id={self.id}, categoria='{self.categoria}', prioridad='{self.prioridad}')>"
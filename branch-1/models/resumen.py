@@ -0,0 +1,60 @@
+from sqlalchemy import Column, Date, Float, Integer, String
+from models.base import Base
+
+MARCA_RESUMENES = "resumenes_diarios"
+
+
+class ResumenDiarioTickets(Base):
+    """Tickets creados cada día, por su estado actual y empleado."""
+    __tablename__ = 'resumen_diario_tickets'
+    
+    dia = Column(Date, primary_key=True)
+    estado = Column(String(50), primary_key=True)
+    empleado_id = Column(Integer, primary_key=True)
+    cantidad = Column(Integer, nullable=False)
+
+
+class ResumenDiarioIncidentes(Base):
+    """Incidentes de los tickets creados cada día, por categoría y prioridad."""
+    __tablename__ = 'resumen_diario_incidentes'
+    
+    dia = Column(Date, primary_key=True)
+    categoria = Column(String(50), primary_key=True)
+    prioridad = Column(String(50), primary_key=True)
+    cantidad = Column(Integer, nullable=False)
+
+
+class ResumenDiarioCierres(Base):
+    """Tickets cerrados cada día, por empleado, con la suma de segundos entre creación y cierre."""
+    __tablename__ = 'resumen_diario_cierres'
+    
+    dia = Column(Date, primary_key=True)
+    empleado_id = Column(Integer, primary_key=True)
+    cantidad = Column(Integer, nullable=False)
+    segundos_cierre = Column(Float, nullable=False)
+
+
+class DiasDeTicket(Base):
+    """Días en los que cada ticket cuenta en los resúmenes, para descontarlo si cambia o desaparece."""
+    __tablename__ = 'resumen_dias_ticket'
+    
+    ticket_id = Column(Integer, primary_key=True, autoincrement=False)
+    dia_creacion = Column(Date, nullable=False)
+    dia_cierre = Column(Date, nullable=True)
+
+
+class MarcaDeAgua(Base):
+    """Último seq del registro de cambios incorporado por un proceso incremental."""
+    __tablename__ = 'marcas_de_agua'
+    
+    nombre = Column(String(50), primary_key=True)
+    seq = Column(Integer, nullable=False)
+    fecha_actualizacion = Column(String(50), nullable=False)
+
+
+# Métrica -> (modelo, dimensiones por las que se puede desglosar).
+SERIES = {
+    "tickets": (ResumenDiarioTickets, ["estado", "empleado_id"]),
+    "incidentes": (ResumenDiarioIncidentes, ["categoria", "prioridad"]),
+    "cierres": (ResumenDiarioCierres, ["empleado_id"]),
+}
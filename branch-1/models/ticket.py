@@ -1,11 +1,25 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, DateTime, Integer, String, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from typing import Any, Dict, List, Optional
 from models.base import Base
 
+ESTADOS = ["Abierto", "En Progreso", "Cerrado", "Reabierto"]
+# Columnas por las que se puede ordenar un listado; todas tienen índice (columna, id).
+CAMPOS_ORDEN = ["id", "fecha_creacion", "cantidad_incidentes"]
+
 
 class Ticket(Base):
     __tablename__ = 'tickets'
+    __table_args__ = (
+        Index("ix_tickets_estado_id", "estado", "id"),
+        Index("ix_tickets_cliente_id_id", "cliente_id", "id"),
+        Index("ix_tickets_empleado_id_id", "empleado_id", "id"),
+        Index("ix_tickets_equipo_id_id", "equipo_id", "id"),
+        Index("ix_tickets_fecha_creacion_id", "fecha_creacion", "id"),
+        Index("ix_tickets_fecha_cierre", "fecha_cierre"),
+        Index("ix_tickets_cantidad_incidentes_id", "cantidad_incidentes", "id"),
+    )
     
     id = Column(Integer, primary_key=True, autoincrement=True)
     cliente_id = Column(Integer, nullable=False)
@@ -13,14 +27,31 @@ class Ticket(Base):
     equipo_id = Column(Integer, nullable=False)
     empleado_id = Column(Integer, nullable=False)
     estado = Column(String(50), nullable=False, default="Abierto")
-    fecha_creacion = Column(String(50), nullable=False)
-    fecha_cierre = Column(String(50), nullable=True)
+    fecha_creacion = Column(DateTime, nullable=False)
+    fecha_cierre = Column(DateTime, nullable=True)
+    
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    fecha_actualizacion = Column(
+        String(50),
+        nullable=True,
+        default=lambda: datetime.now().isoformat(),
+        onupdate=lambda: datetime.now().isoformat(),
+    )
+    
+    cantidad_incidentes = Column(Integer, nullable=False, default=0, server_default="0")
+    prioridad_maxima = Column(String(50), nullable=True)
+    incidentes_hardware = Column(Integer, nullable=False, default=0, server_default="0")
+    incidentes_software = Column(Integer, nullable=False, default=0, server_default="0")
+    incidentes_red = Column(Integer, nullable=False, default=0, server_default="0")
+    incidentes_otro = Column(Integer, nullable=False, default=0, server_default="0")
+    
+    __mapper_args__ = {"version_id_col": version}
     
     incidentes = relationship(
         "Incidente",
         back_populates="ticket",
         cascade="all, delete-orphan",
-        lazy="joined"
+        lazy="select",
     )
     
     def __init__(self, cliente_id, servicio_id, equipo_id, empleado_id, estado="Abierto"):
@@ -29,12 +60,13 @@ class Ticket(Base):
         self.equipo_id = equipo_id
         self.empleado_id = empleado_id
         self.estado = estado
-        self.fecha_creacion = datetime.now().isoformat()
+        self.fecha_creacion = datetime.now()
+        self.fecha_actualizacion = self.fecha_creacion.isoformat()
         self.fecha_cierre = None
     
     def cerrar(self):
         self.estado = "Cerrado"
-        self.fecha_cierre = datetime.now().isoformat()
+        self.fecha_cierre = datetime.now()
     
     def reabrir(self):
         if self.estado == "Cerrado":
@@ -42,24 +74,39 @@ class Ticket(Base):
             self.fecha_cierre = None
     
     def to_dict(self, incluir_incidentes=False):
+        incidentes = [inc.to_dict() for inc in self.incidentes] if incluir_incidentes else None
+        return Ticket.representar(self, incidentes)
+    
+    @staticmethod
+    def representar(fila, incidentes: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Arma la representación desde una instancia o desde una fila de select() con las mismas columnas."""
         data = {
-            "id": self.id,
-            "cliente_id": self.cliente_id,
-            "servicio_id": self.servicio_id,
-            "equipo_id": self.equipo_id,
-            "empleado_id": self.empleado_id,
-            "estado": self.estado,
-            "fecha_creacion": self.fecha_creacion,
-            "fecha_cierre": self.fecha_cierre,
+            "id": fila.id,
+            "cliente_id": fila.cliente_id,
+            "servicio_id": fila.servicio_id,
+            "equipo_id": fila.equipo_id,
+            "empleado_id": fila.empleado_id,
+            "estado": fila.estado,
+            "fecha_creacion": fila.fecha_creacion.isoformat(),
+            "fecha_cierre": fila.fecha_cierre.isoformat() if fila.fecha_cierre else None,
+            "fecha_actualizacion": fila.fecha_actualizacion,
+            "version": fila.version,
         }
         
-        if incluir_incidentes:
-            data["incidentes"] = [inc.to_dict() for inc in self.incidentes]
+        if incidentes is not None:
+            data["incidentes"] = incidentes
         else:
-            data["cantidad_incidentes"] = len(self.incidentes)
+            data["cantidad_incidentes"] = fila.cantidad_incidentes
+            data["prioridad_maxima"] = fila.prioridad_maxima
+            data["incidentes_por_categoria"] = {
+                "Hardware": fila.incidentes_hardware,
+                "Software": fila.incidentes_software,
+                "Red": fila.incidentes_red,
+                "Otro": fila.incidentes_otro,
+            }
         
         return data
     
     def __repr__(self):
-        return f"<Ticket(id={self.id}, estado='{self.estado}', incidentes={len(self.incidentes)})>"
+        return f"<Ticket(id={self.id}, estado='{self.estado}')>"
 
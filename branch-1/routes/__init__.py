@@ -1,4 +1,5 @@
 from .ticket_router import ticket_bp
 from .incidente_router import incidente_bp
+from .estadistica_router import estadistica_bp
 
-__all__ = ["ticket_bp", "incidente_bp"]
\ No newline at end of file
+__all__ = ["ticket_bp", "incidente_bp", "estadistica_bp"]
\ No newline at end of file
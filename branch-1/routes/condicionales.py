@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+from typing import Optional
+from flask import Response, request
+
+
+def _ultima_modificacion(fecha: Optional[str]) -> Optional[datetime]:
+    if not fecha:
+        return None
+    try:
+        # Las fechas se guardan en hora local sin zona; HTTP trabaja en segundos enteros.
+        return datetime.fromisoformat(fecha).astimezone(timezone.utc).replace(microsecond=0)
+    except ValueError:
+        return None
+
+
+def con_validadores(respuesta: Response, version: int, fecha: Optional[str]) -> Response:
+    respuesta.set_etag(str(version))
+    ultima = _ultima_modificacion(fecha)
+    if ultima is not None:
+        respuesta.last_modified = ultima
+    return respuesta
+
+
+def respuesta_no_modificada(version: int, fecha: Optional[str]) -> Optional[Response]:
+    """Devuelve un 304 si el cliente ya tiene la versión vigente, o None si hay que enviar el cuerpo."""
+    if request.if_none_match:
+        vigente = request.if_none_match.contains_weak(str(version))
+    else:
+        ultima = _ultima_modificacion(fecha)
+        desde = request.if_modified_since
+        vigente = ultima is not None and desde is not None and ultima <= desde
+    
+    if not vigente:
+        return None
+    return con_validadores(Response(status=304), version, fecha)
+
+
+def leer_if_match() -> Optional[int]:
+    """Devuelve la versión indicada en If-Match, o None si el header no está o es '*'."""
+    if_match = request.if_match
+    if not if_match or if_match.star_tag:
+        return None
+    
+    etags = list(if_match)
+    if len(etags) != 1 or not etags[0].isdigit():
+        raise ValueError("Header 'If-Match' inválido: se espera el ETag de una única versión")
+    return int(etags[0])
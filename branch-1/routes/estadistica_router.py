@@ -0,0 +1,50 @@
+from flask import Blueprint, request, jsonify
+from controllers.estadistica_controller import EstadisticaController
+from models.resumen import SERIES
+from routes.filtros import leer_fecha
+
+estadistica_bp = Blueprint("estadisticas", __name__)
+
+
+@estadistica_bp.route("", methods=["GET"])
+def obtener_estadisticas():
+    controller = EstadisticaController()
+    try:
+        desde = leer_fecha(request.args, "desde")
+        hasta = leer_fecha(request.args, "hasta", fin_de_dia=True)
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    if desde and hasta and desde >= hasta:
+        return jsonify({"exito": False, "mensaje": "'desde' debe ser anterior a 'hasta'"}), 400
+    
+    return jsonify({"exito": True, "datos": controller.obtener_estadisticas(desde, hasta)}), 200
+
+
+@estadistica_bp.route("/timeseries", methods=["GET"])
+def obtener_serie_temporal():
+    controller = EstadisticaController()
+    metrica = request.args.get("metrica", "tickets")
+    if metrica not in SERIES:
+        return jsonify({"exito": False, "mensaje": f"Métrica inválida. Válidas: {', '.join(SERIES)}"}), 400
+    
+    por = request.args.get("por") or None
+    dimensiones = SERIES[metrica][1]
+    if por is not None and por not in dimensiones:
+        return jsonify({
+            "exito": False,
+            "mensaje": f"Dimensión inválida para '{metrica}'. Válidas: {', '.join(dimensiones)}",
+        }), 400
+    
+    try:
+        desde = leer_fecha(request.args, "desde")
+        hasta = leer_fecha(request.args, "hasta")
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    desde = desde.date() if desde else None
+    hasta = hasta.date() if hasta else None
+    if desde and hasta and desde > hasta:
+        return jsonify({"exito": False, "mensaje": "'desde' no puede ser posterior a 'hasta'"}), 400
+    
+    return jsonify({"exito": True, "datos": controller.obtener_serie_temporal(metrica, por, desde, hasta)}), 200
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Mapping, Optional
+from flask import request
+from models.incidente import CATEGORIAS, PRIORIDADES
+from models.ticket import CAMPOS_ORDEN, ESTADOS
+from routes.paginacion import leer_limite, codificar_cursor, decodificar_cursor, codificar_clave, decodificar_clave
+
+
+def leer_consulta_tickets(args: Optional[Mapping[str, str]] = None) -> Dict[str, Any]:
+    """Lee filtros, orden y paginación de GET /tickets. Lanza ValueError si algún parámetro es inválido."""
+    args = request.args if args is None else args
+    filtros: Dict[str, Any] = {
+        "estados": _leer_lista(args, "estado", ESTADOS),
+        "categorias": _leer_lista(args, "categoria", CATEGORIAS),
+        "prioridades": _leer_lista(args, "prioridad", PRIORIDADES),
+        "creado_desde": leer_fecha(args, "creado_desde"),
+        "creado_hasta": leer_fecha(args, "creado_hasta", fin_de_dia=True),
+    }
+    for campo in ("cliente_id", "empleado_id", "equipo_id"):
+        filtros[campo] = _leer_entero(args, campo)
+    
+    sort = args.get("sort", "id")
+    orden = sort.lstrip("-")
+    if orden not in CAMPOS_ORDEN or sort.count("-") > 1:
+        raise ValueError(f"Parámetro 'sort' inválido. Válidos: {', '.join(CAMPOS_ORDEN)} (con '-' para descendente)")
+    
+    return {
+        "filtros": {campo: valor for campo, valor in filtros.items() if valor is not None},
+        "orden": orden,
+        "descendente": sort.startswith("-"),
+        "limite": leer_limite(args),
+        "despues_de": _leer_posicion(args.get("after"), sort),
+    }
+
+
+def cursor_siguiente(consulta: Dict[str, Any], siguiente) -> Optional[str]:
+    """El cursor de un orden distinto de id incluye el orden, para rechazarlo si la consulta cambia."""
+    if siguiente is None or consulta["orden"] == "id":
+        return codificar_cursor(siguiente)
+    sort = ("-" if consulta["descendente"] else "") + consulta["orden"]
+    valor, ultimo_id = siguiente
+    if isinstance(valor, datetime):
+        valor = valor.isoformat()
+    return codificar_clave([sort, valor, ultimo_id])
+
+
+def _leer_posicion(cursor: Optional[str], sort: str):
+    if not cursor:
+        return None
+    if sort.lstrip("-") == "id":
+        return decodificar_cursor(cursor)
+    clave = decodificar_clave(cursor)
+    if len(clave) != 3 or clave[0] != sort or not isinstance(clave[2], int):
+        raise ValueError("Parámetro 'after' inválido para el orden pedido")
+    valor = clave[1]
+    if sort.lstrip("-") == "fecha_creacion":
+        try:
+            valor = datetime.fromisoformat(valor)
+        except (TypeError, ValueError):
+            raise ValueError("Parámetro 'after' inválido para el orden pedido")
+    return valor, clave[2]
+
+
+def _leer_lista(args: Mapping[str, str], nombre: str, validos: List[str]) -> Optional[List[str]]:
+    valor = args.get(nombre)
+    if not valor:
+        return None
+    valores = [parte.strip() for parte in valor.split(",")]
+    invalidos = [parte for parte in valores if parte not in validos]
+    if invalidos:
+        raise ValueError(f"Parámetro '{nombre}' inválido: {', '.join(invalidos)}. Válidos: {', '.join(validos)}")
+    return valores
+
+
+def _leer_entero(args: Mapping[str, str], nombre: str) -> Optional[int]:
+    valor = args.get(nombre)
+    if valor is None:
+        return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValueError(f"Parámetro '{nombre}' inválido")
+
+
+def leer_fecha(args: Mapping[str, str], nombre: str, fin_de_dia: bool = False) -> Optional[datetime]:
+    """Acepta fecha u hora ISO 8601; con fin_de_dia una fecha sola incluye el día completo."""
+    valor = args.get(nombre)
+    if not valor:
+        return None
+    try:
+        fecha = datetime.fromisoformat(valor)
+    except ValueError:
+        raise ValueError(f"Parámetro '{nombre}' inválido, se esperaba una fecha ISO 8601")
+    if fecha.tzinfo is not None:
+        # Las fechas se guardan en hora local sin zona.
+        fecha = fecha.astimezone().replace(tzinfo=None)
+    if fin_de_dia and len(valor) == 10:
+        fecha += timedelta(days=1)
+    return fecha
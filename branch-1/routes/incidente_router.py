@@ -1,32 +1,108 @@
 from flask import Blueprint, request, jsonify
 from controllers.incidente_controller import IncidenteController
+from database.busqueda import terminos
+from routes.paginacion import leer_paginacion, leer_limite, codificar_cursor, codificar_clave, decodificar_clave
+from routes.ndjson import acepta_ndjson, respuesta_ndjson
+from routes.condicionales import con_validadores, respuesta_no_modificada
 
 incidente_bp = Blueprint("incidentes", __name__)
-controller = IncidenteController()
 
 
 @incidente_bp.route("", methods=["GET"])
 def listar_incidentes():
-    incidentes = controller.listar_incidentes()
-    return jsonify({"exito": True, "datos": incidentes}), 200
+    controller = IncidenteController()
+    try:
+        limite, despues_de = leer_paginacion()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    if acepta_ndjson():
+        return respuesta_ndjson(controller.exportar_incidentes(despues_de=despues_de))
+    
+    incidentes, siguiente = controller.listar_incidentes(limite=limite, despues_de=despues_de)
+    return jsonify({"exito": True, "datos": incidentes, "next_cursor": codificar_cursor(siguiente)}), 200
+
+
+@incidente_bp.route("/export", methods=["GET"])
+def exportar_incidentes():
+    controller = IncidenteController()
+    try:
+        _, despues_de = leer_paginacion()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    return respuesta_ndjson(controller.exportar_incidentes(despues_de=despues_de))
+
+
+@incidente_bp.route("/buscar", methods=["GET"])
+def buscar_incidentes():
+    controller = IncidenteController()
+    consulta = request.args.get("q", "")
+    if not terminos(consulta):
+        return jsonify({"exito": False, "mensaje": "Parámetro 'q' requerido"}), 400
+    
+    try:
+        limite = leer_limite()
+        despues_de = _leer_posicion_busqueda(request.args.get("after"))
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    incidentes, siguiente = controller.buscar_incidentes(consulta, limite=limite, despues_de=despues_de)
+    return jsonify({"exito": True, "datos": incidentes, "next_cursor": codificar_clave(siguiente)}), 200
 
 
 @incidente_bp.route("/ticket/<int:ticket_id>", methods=["GET"])
 def listar_incidentes_por_ticket(ticket_id):
-    incidentes = controller.listar_incidentes_por_ticket(ticket_id)
-    return jsonify({"exito": True, "datos": incidentes}), 200
+    controller = IncidenteController()
+    # La versión del ticket cambia con cada alta, baja o edición de sus incidentes.
+    version = controller.obtener_version_ticket(ticket_id)
+    if version is not None:
+        no_modificada = respuesta_no_modificada(*version)
+        if no_modificada is not None:
+            return no_modificada
+    
+    incidentes = controller.listar_incidentes_por_ticket(ticket_id, version=version[0] if version is not None else None)
+    respuesta = jsonify({"exito": True, "datos": incidentes})
+    if version is not None:
+        con_validadores(respuesta, *version)
+    return respuesta, 200
 
 
 @incidente_bp.route("/<int:incidente_id>", methods=["GET"])
 def obtener_incidente(incidente_id):
+    controller = IncidenteController()
+    version = controller.obtener_version_incidente(incidente_id)
+    if version is None:
+        return jsonify({"exito": False, "mensaje": "Incidente no encontrado"}), 404
+    no_modificada = respuesta_no_modificada(*version)
+    if no_modificada is not None:
+        return no_modificada
+    
     incidente = controller.obtener_incidente(incidente_id)
     if incidente:
-        return jsonify({"exito": True, "datos": incidente}), 200
+        respuesta = jsonify({"exito": True, "datos": incidente})
+        return con_validadores(respuesta, incidente["version"], incidente["fecha_actualizacion"]), 200
     return jsonify({"exito": False, "mensaje": "Incidente no encontrado"}), 404
 
 
+@incidente_bp.route("/bulk", methods=["POST"])
+def crear_incidentes_en_bloque():
+    controller = IncidenteController()
+    datos = request.get_json(silent=True)
+    
+    if not isinstance(datos, list) or not datos:
+        return jsonify({"exito": False, "mensaje": "Se esperaba una lista no vacía de incidentes"}), 400
+    
+    resultado = controller.crear_incidentes_en_bloque(datos)
+    
+    if resultado["exito"]:
+        return jsonify(resultado), 201
+    return jsonify(resultado), 400
+
+
 @incidente_bp.route("", methods=["POST"])
 def crear_incidente():
+    controller = IncidenteController()
     datos = request.get_json()
     
     if not datos or not all(k in datos for k in ["descripcion", "categoria", "prioridad", "ticket_id"]):
@@ -46,6 +122,7 @@ def crear_incidente():
 
 @incidente_bp.route("/<int:incidente_id>", methods=["DELETE"])
 def eliminar_incidente(incidente_id):
+    controller = IncidenteController()
     resultado = controller.eliminar_incidente(incidente_id)
     if resultado["exito"]:
         return jsonify(resultado), 200
@@ -54,19 +131,40 @@ def eliminar_incidente(incidente_id):
 
 @incidente_bp.route("/filtrar/categoria", methods=["GET"])
 def filtrar_por_categoria():
+    controller = IncidenteController()
     categoria = request.args.get("categoria")
     if not categoria:
         return jsonify({"exito": False, "mensaje": "Parámetro 'categoria' requerido"}), 400
     
-    incidentes = controller.filtrar_por_categoria(categoria)
-    return jsonify({"exito": True, "datos": incidentes}), 200
+    try:
+        limite, despues_de = leer_paginacion()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    incidentes, siguiente = controller.filtrar_por_categoria(categoria, limite=limite, despues_de=despues_de)
+    return jsonify({"exito": True, "datos": incidentes, "next_cursor": codificar_cursor(siguiente)}), 200
 
 
 @incidente_bp.route("/filtrar/prioridad", methods=["GET"])
 def filtrar_por_prioridad():
+    controller = IncidenteController()
     prioridad = request.args.get("prioridad")
     if not prioridad:
         return jsonify({"exito": False, "mensaje": "Parámetro 'prioridad' requerido"}), 400
     
-    incidentes = controller.filtrar_por_prioridad(prioridad)
-    return jsonify({"exito": True, "datos": incidentes}), 200
\ No newline at end of file
+    try:
+        limite, despues_de = leer_paginacion()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    incidentes, siguiente = controller.filtrar_por_prioridad(prioridad, limite=limite, despues_de=despues_de)
+    return jsonify({"exito": True, "datos": incidentes, "next_cursor": codificar_cursor(siguiente)}), 200
+
+
+def _leer_posicion_busqueda(cursor):
+    if not cursor:
+        return None
+    clave = decodificar_clave(cursor)
+    if len(clave) != 2 or not isinstance(clave[0], (int, float)) or not isinstance(clave[1], int):
+        raise ValueError("Parámetro 'after' inválido")
+    return float(clave[0]), clave[1]
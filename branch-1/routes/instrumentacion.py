@@ -0,0 +1,73 @@
+import os
+from typing import Optional
+from flask import Flask, Response, request
+from instrumentacion import (
+    Metricas,
+    iniciar_medicion,
+    terminar_medicion,
+    medir_tramo,
+    instrumentar_clase,
+    registrar_eventos_sql,
+)
+from instrumentacion.metricas import CONTENT_TYPE
+
+
+def instrumentacion_habilitada() -> bool:
+    return os.environ.get("TICKETING_INSTRUMENTACION", "").lower() in ("1", "true", "si")
+
+
+def configurar_instrumentacion(app: Flask, habilitada: Optional[bool] = None) -> Optional[Metricas]:
+    """Con TICKETING_INSTRUMENTACION=1 mide cada request por tramo, agrega Server-Timing y expone /metrics.
+    
+    Desactivada no registra hooks ni envuelve nada, así que no agrega trabajo a los requests.
+    Se llama después de registrar los blueprints, para alcanzar todas las vistas.
+    """
+    if not (instrumentacion_habilitada() if habilitada is None else habilitada):
+        return None
+    
+    from controllers import TicketController, IncidenteController
+    from controllers.cambio_controller import CambioController
+    from controllers.estadistica_controller import EstadisticaController
+    from database import repositories
+    
+    for controlador in (TicketController, IncidenteController, CambioController, EstadisticaController):
+        instrumentar_clase(controlador, "controlador")
+    for nombre in repositories.__all__:
+        instrumentar_clase(getattr(repositories, nombre), "repositorio")
+    registrar_eventos_sql()
+    
+    for endpoint, vista in app.view_functions.items():
+        if not endpoint.startswith("flasgger."):
+            app.view_functions[endpoint] = medir_tramo(vista, "router")
+    app.json.response = medir_tramo(app.json.response, "serializador")
+    app.json.dumps = medir_tramo(app.json.dumps, "serializador")
+    
+    metricas = Metricas()
+    # El modo ASGI la toma de aquí para medir también sus handlers asíncronos.
+    app.extensions["metricas"] = metricas
+    
+    @app.before_request
+    def iniciar():
+        iniciar_medicion()
+    
+    @app.after_request
+    def registrar(respuesta: Response) -> Response:
+        medicion = terminar_medicion()
+        if medicion is None or request.endpoint == "metricas":
+            return respuesta
+        # La plantilla de la ruta y no la URL, para no abrir una serie por id.
+        ruta = request.url_rule.rule if request.url_rule is not None else "sin_ruta"
+        metricas.observar(request.method, ruta, respuesta.status_code, medicion)
+        respuesta.headers["Server-Timing"] = medicion.server_timing()
+        return respuesta
+    
+    @app.teardown_request
+    def descartar(exception=None):
+        # Si el request terminó en una excepción no pasó por after_request.
+        terminar_medicion()
+    
+    @app.route("/metrics", methods=["GET"], endpoint="metricas")
+    def exportar_metricas():
+        return Response(metricas.exportar(), content_type=CONTENT_TYPE)
+    
+    return metricas
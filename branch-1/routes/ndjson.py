@@ -0,0 +1,13 @@
+from typing import Iterable
+from flask import Response, request, stream_with_context
+
+MIMETYPE_NDJSON = "application/x-ndjson"
+
+
+def acepta_ndjson() -> bool:
+    mejor = request.accept_mimetypes.best_match(["application/json", MIMETYPE_NDJSON])
+    return mejor == MIMETYPE_NDJSON
+
+
+def respuesta_ndjson(lineas: Iterable[str]) -> Response:
+    return Response(stream_with_context(lineas), mimetype=MIMETYPE_NDJSON)
@@ -0,0 +1,64 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Mapping, Optional, Sequence, Tuple
+from flask import request
+
+LIMITE_POR_DEFECTO = 100
+LIMITE_MAXIMO = 1000
+
+
+def codificar_cursor(ultimo_id: Optional[int]) -> Optional[str]:
+    if ultimo_id is None:
+        return None
+    return base64.urlsafe_b64encode(str(ultimo_id).encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, parametro: str = "after") -> int:
+    relleno = "=" * (-len(cursor) % 4)
+    try:
+        return int(base64.urlsafe_b64decode(cursor + relleno).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Parámetro '{parametro}' inválido")
+
+
+def codificar_clave(clave: Optional[Sequence[Any]]) -> Optional[str]:
+    """Cursor opaco para posiciones compuestas, como (orden, valor, id)."""
+    if clave is None:
+        return None
+    texto = json.dumps(list(clave), separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(texto.encode()).decode().rstrip("=")
+
+
+def decodificar_clave(cursor: str, parametro: str = "after") -> List[Any]:
+    relleno = "=" * (-len(cursor) % 4)
+    try:
+        clave = json.loads(base64.urlsafe_b64decode(cursor + relleno).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Parámetro '{parametro}' inválido")
+    if not isinstance(clave, list):
+        raise ValueError(f"Parámetro '{parametro}' inválido")
+    return clave
+
+
+def leer_limite(args: Optional[Mapping[str, str]] = None) -> int:
+    args = request.args if args is None else args
+    limite_raw = args.get("limit")
+    if limite_raw is None:
+        return LIMITE_POR_DEFECTO
+    try:
+        limite = int(limite_raw)
+    except ValueError:
+        raise ValueError("Parámetro 'limit' inválido")
+    if limite < 1 or limite > LIMITE_MAXIMO:
+        raise ValueError(f"Parámetro 'limit' debe estar entre 1 y {LIMITE_MAXIMO}")
+    return limite
+
+
+def leer_paginacion(args: Optional[Mapping[str, str]] = None) -> Tuple[int, Optional[int]]:
+    """Lee 'limit' y 'after' de la query string. Lanza ValueError si son inválidos."""
+    args = request.args if args is None else args
+    limite = leer_limite(args)
+    cursor = args.get("after")
+    despues_de = decodificar_cursor(cursor) if cursor else None
+    return limite, despues_de
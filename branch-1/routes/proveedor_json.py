@@ -0,0 +1,44 @@
+import os
+from typing import Any
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ProveedorOrjson(DefaultJSONProvider):
+    """Proveedor JSON de Flask sobre orjson. Respeta sort_keys y compact; las fechas y lo que orjson no
+    conoce pasan por el default de Flask, así que la salida solo difiere en que no escapa los no ASCII."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._codificar(obj).decode()
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indentar = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(self._codificar(obj, indentar) + b"\n", mimetype=self.mimetype)
+
+    def _codificar(self, obj: Any, indentar: bool = False) -> bytes:
+        opciones = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            opciones |= orjson.OPT_SORT_KEYS
+        if indentar:
+            opciones |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=opciones)
+
+
+def configurar_json(app: Flask) -> None:
+    """TICKETING_JSON=orjson|estandar; por defecto orjson si el paquete opcional está instalado."""
+    eleccion = os.environ.get("TICKETING_JSON", "orjson" if orjson is not None else "estandar")
+    if eleccion == "orjson":
+        if orjson is None:
+            raise RuntimeError("TICKETING_JSON=orjson requiere instalar el paquete orjson")
+        app.json = ProveedorOrjson(app)
+    elif eleccion != "estandar":
+        raise ValueError(f"TICKETING_JSON inválido: {eleccion}. Válidos: orjson, estandar")
@@ -0,0 +1,61 @@
+import json
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from flask import Response, request, stream_with_context
+from routes.paginacion import codificar_cursor, decodificar_cursor
+
+MIMETYPE_SSE = "text/event-stream"
+CABECERAS_SSE = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+REINTENTO = "retry: 3000\n\n"
+LATIDO = ": latido\n\n"
+
+TIMEOUT_LONG_POLL = 25.0
+TIMEOUT_LONG_POLL_MAXIMO = 60.0
+
+
+def acepta_sse() -> bool:
+    mejor = request.accept_mimetypes.best_match(["application/json", MIMETYPE_SSE])
+    return mejor == MIMETYPE_SSE
+
+
+def leer_parametros_stream(
+    args: Mapping[str, str],
+    ultimo_evento: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[int], float, Optional[int]]:
+    """Devuelve estado, empleado_id, timeout y la secuencia desde la que reanudar ('since' o
+    Last-Event-ID). Lanza ValueError si algún parámetro es inválido."""
+    empleado_id = _leer_numero(args, "empleado_id", int)
+    timeout = _leer_numero(args, "timeout", float, TIMEOUT_LONG_POLL)
+    if timeout <= 0 or timeout > TIMEOUT_LONG_POLL_MAXIMO:
+        raise ValueError(f"Parámetro 'timeout' debe estar entre 0 y {TIMEOUT_LONG_POLL_MAXIMO:.0f}")
+    
+    token = args.get("since") or ultimo_evento
+    desde = decodificar_cursor(token, "since") if token else None
+    return args.get("estado"), empleado_id, timeout, desde
+
+
+def formatear_evento(evento: Optional[Dict[str, Any]]) -> str:
+    """Cada evento lleva su token como 'id' para que el navegador reanude con Last-Event-ID;
+    None se envía como comentario de latido."""
+    if evento is None:
+        return LATIDO
+    datos = json.dumps(evento, ensure_ascii=False)
+    return f"id: {codificar_cursor(evento['seq'])}\nevent: {evento['operacion']}\ndata: {datos}\n\n"
+
+
+def respuesta_sse(eventos: Iterable[Optional[Dict[str, Any]]]) -> Response:
+    def lineas():
+        yield REINTENTO
+        for evento in eventos:
+            yield formatear_evento(evento)
+    
+    return Response(stream_with_context(lineas()), mimetype=MIMETYPE_SSE, headers=CABECERAS_SSE)
+
+
+def _leer_numero(args: Mapping[str, str], parametro: str, tipo, por_defecto=None):
+    valor = args.get(parametro)
+    if valor is None:
+        return por_defecto
+    try:
+        return tipo(valor)
+    except ValueError:
+        raise ValueError(f"Parámetro '{parametro}' inválido")
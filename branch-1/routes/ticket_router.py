@@ -1,28 +1,132 @@
 from flask import Blueprint, request, jsonify
 from controllers.ticket_controller import TicketController
+from controllers.cambio_controller import CambioController
+from routes.paginacion import leer_paginacion, leer_limite, codificar_cursor, decodificar_cursor
+from routes.filtros import leer_consulta_tickets, cursor_siguiente
+from routes.ndjson import acepta_ndjson, respuesta_ndjson
+from routes.condicionales import con_validadores, respuesta_no_modificada, leer_if_match
+from routes.sse import acepta_sse, respuesta_sse, leer_parametros_stream
+from eventos.difusor import obtener_difusor
 
 ticket_bp = Blueprint("tickets", __name__)
-controller = TicketController()
 
 
 @ticket_bp.route("", methods=["GET"])
 def listar_tickets():
+    controller = TicketController()
     incluir_inc = request.args.get("incluir_incidentes", "false").lower() == "true"
-    tickets = controller.listar_tickets(incluir_incidentes=incluir_inc)
-    return jsonify({"exito": True, "datos": tickets}), 200
+    try:
+        consulta = leer_consulta_tickets()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    if acepta_ndjson():
+        return respuesta_ndjson(_exportar(controller, incluir_inc, consulta))
+    
+    tickets, siguiente = controller.listar_tickets(
+        incluir_incidentes=incluir_inc,
+        limite=consulta["limite"],
+        despues_de=consulta["despues_de"],
+        filtros=consulta["filtros"],
+        orden=consulta["orden"],
+        descendente=consulta["descendente"],
+    )
+    return jsonify({"exito": True, "datos": tickets, "next_cursor": cursor_siguiente(consulta, siguiente)}), 200
+
+
+@ticket_bp.route("/export", methods=["GET"])
+def exportar_tickets():
+    controller = TicketController()
+    incluir_inc = request.args.get("incluir_incidentes", "false").lower() == "true"
+    try:
+        consulta = leer_consulta_tickets()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    return respuesta_ndjson(_exportar(controller, incluir_inc, consulta))
+
+
+@ticket_bp.route("/changes", methods=["GET"])
+def obtener_cambios():
+    controller = CambioController()
+    try:
+        limite = leer_limite()
+        token = request.args.get("since")
+        desde = decodificar_cursor(token, "since") if token else 0
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    resultado = controller.obtener_cambios(desde, limite=limite)
+    if not resultado["exito"]:
+        return jsonify({
+            "exito": False,
+            "mensaje": resultado["mensaje"],
+            "next_token": codificar_cursor(resultado["ultimo"]),
+        }), 410
+    return jsonify({
+        "exito": True,
+        "datos": resultado["datos"],
+        "next_token": codificar_cursor(resultado["hasta"]),
+        "hay_mas": resultado["hay_mas"],
+    }), 200
+
+
+@ticket_bp.route("/stream", methods=["GET"])
+def stream_tickets():
+    try:
+        estado, empleado_id, timeout, desde = leer_parametros_stream(
+            request.args,
+            request.headers.get("Last-Event-ID"),
+        )
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    difusor = obtener_difusor()
+    suscripcion = difusor.suscribir(estado=estado, empleado_id=empleado_id)
+    if acepta_sse():
+        return respuesta_sse(difusor.escuchar(suscripcion, desde))
+    
+    eventos, hasta = difusor.esperar_eventos(suscripcion, desde, timeout)
+    return jsonify({"exito": True, "datos": eventos, "next_token": codificar_cursor(hasta)}), 200
 
 
 @ticket_bp.route("/<int:ticket_id>", methods=["GET"])
 def obtener_ticket(ticket_id):
+    controller = TicketController()
     incluir_inc = request.args.get("incluir_incidentes", "true").lower() == "true"
-    ticket = controller.obtener_ticket(ticket_id, incluir_incidentes=incluir_inc)
+    
+    version = controller.obtener_version_ticket(ticket_id)
+    if version is None:
+        return jsonify({"exito": False, "mensaje": "Ticket no encontrado"}), 404
+    no_modificada = respuesta_no_modificada(*version)
+    if no_modificada is not None:
+        return no_modificada
+    
+    ticket = controller.obtener_ticket(ticket_id, incluir_incidentes=incluir_inc, version=version[0])
     if ticket:
-        return jsonify({"exito": True, "datos": ticket}), 200
+        respuesta = jsonify({"exito": True, "datos": ticket})
+        return con_validadores(respuesta, ticket["version"], ticket["fecha_actualizacion"]), 200
     return jsonify({"exito": False, "mensaje": "Ticket no encontrado"}), 404
 
 
+@ticket_bp.route("/bulk", methods=["POST"])
+def crear_tickets_en_bloque():
+    controller = TicketController()
+    datos = request.get_json(silent=True)
+    
+    if not isinstance(datos, list) or not datos:
+        return jsonify({"exito": False, "mensaje": "Se esperaba una lista no vacía de tickets"}), 400
+    
+    resultado = controller.crear_tickets_en_bloque(datos)
+    
+    if resultado["exito"]:
+        return jsonify(resultado), 201
+    return jsonify(resultado), 400
+
+
 @ticket_bp.route("", methods=["POST"])
 def crear_ticket():
+    controller = TicketController()
     datos = request.get_json()
     
     campos_requeridos = ["cliente_id", "servicio_id", "equipo_id", "empleado_id"]
@@ -42,6 +146,7 @@ def crear_ticket():
 
 @ticket_bp.route("/<int:ticket_id>/incidentes", methods=["POST"])
 def agregar_incidente_a_ticket(ticket_id):
+    controller = TicketController()
     datos = request.get_json()
     
     if not datos or not all(k in datos for k in ["descripcion", "categoria", "prioridad"]):
@@ -61,39 +166,77 @@ def agregar_incidente_a_ticket(ticket_id):
 
 @ticket_bp.route("/<int:ticket_id>/estado", methods=["PUT"])
 def cambiar_estado_ticket(ticket_id):
+    controller = TicketController()
     datos = request.get_json()
     
     if not datos or "estado" not in datos:
         return jsonify({"exito": False, "mensaje": "Parámetro 'estado' requerido"}), 400
     
-    resultado = controller.cambiar_estado_ticket(ticket_id, datos["estado"])
+    try:
+        version_esperada = leer_if_match()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
     
-    if resultado["exito"]:
-        return jsonify(resultado), 200
-    return jsonify(resultado), 400
+    resultado = controller.cambiar_estado_ticket(ticket_id, datos["estado"], version_esperada)
+    return _respuesta_de_cambio(resultado, 400)
 
 
 @ticket_bp.route("/<int:ticket_id>/cerrar", methods=["PUT"])
 def cerrar_ticket(ticket_id):
-    resultado = controller.cerrar_ticket(ticket_id)
-    if resultado["exito"]:
-        return jsonify(resultado), 200
-    return jsonify(resultado), 404
+    controller = TicketController()
+    try:
+        version_esperada = leer_if_match()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    resultado = controller.cerrar_ticket(ticket_id, version_esperada)
+    return _respuesta_de_cambio(resultado, 404)
 
 
 @ticket_bp.route("/<int:ticket_id>/reabrir", methods=["PUT"])
 def reabrir_ticket(ticket_id):
-    resultado = controller.reabrir_ticket(ticket_id)
-    if resultado["exito"]:
-        return jsonify(resultado), 200
-    return jsonify(resultado), 400
+    controller = TicketController()
+    try:
+        version_esperada = leer_if_match()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    resultado = controller.reabrir_ticket(ticket_id, version_esperada)
+    return _respuesta_de_cambio(resultado, 400)
 
 
 @ticket_bp.route("/filtrar/estado", methods=["GET"])
 def filtrar_por_estado():
+    controller = TicketController()
     estado = request.args.get("estado")
     if not estado:
         return jsonify({"exito": False, "mensaje": "Parámetro 'estado' requerido"}), 400
     
-    tickets = controller.filtrar_por_estado(estado)
-    return jsonify({"exito": True, "datos": tickets}), 200
\ No newline at end of file
+    try:
+        limite, despues_de = leer_paginacion()
+    except ValueError as e:
+        return jsonify({"exito": False, "mensaje": str(e)}), 400
+    
+    tickets, siguiente = controller.filtrar_por_estado(estado, limite=limite, despues_de=despues_de)
+    return jsonify({"exito": True, "datos": tickets, "next_cursor": codificar_cursor(siguiente)}), 200
+
+
+def _exportar(controller: TicketController, incluir_inc: bool, consulta):
+    return controller.exportar_tickets(
+        incluir_incidentes=incluir_inc,
+        despues_de=consulta["despues_de"],
+        filtros=consulta["filtros"],
+        orden=consulta["orden"],
+        descendente=consulta["descendente"],
+    )
+
+
+def _respuesta_de_cambio(resultado, codigo_error: int):
+    if resultado["exito"]:
+        respuesta = jsonify(resultado)
+        respuesta.set_etag(str(resultado["version"]))
+        return respuesta, 200
+    if resultado.get("conflicto"):
+        return jsonify(resultado), 412
+    return jsonify(resultado), codigo_error
+
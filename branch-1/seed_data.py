@@ -1,68 +1,53 @@
-from database.db import init_db, get_session
+from database.db import migrar_db, get_session
 from models.ticket import Ticket
 from models.incidente import Incidente
-from sqlalchemy import text
+from models.auxiliares import Cliente, Empleado, Equipo, Servicio
 
 
 def insertar_datos_hardcodeados():
-    init_db()
+    migrar_db()
     session = get_session()
     
     print("Insertando datos hardcodeados...")
     
-    conn = session.connection()
-    
-    conn.execute(text("DELETE FROM clientes"))
+    session.query(Cliente).delete()
     clientes = [
-        (1, "Juan Pérez", "juan@email.com", "555-0001", "Calle Falsa 123"),
-        (2, "María García", "maria@email.com", "555-0002", "Av. Siempre Viva 456"),
-        (3, "Carlos López", "carlos@email.com", "555-0003", "Calle Principal 789"),
+        Cliente(id=1, nombre="Juan Pérez", email="juan@email.com", telefono="555-0001", direccion="Calle Falsa 123"),
+        Cliente(id=2, nombre="María García", email="maria@email.com", telefono="555-0002", direccion="Av. Siempre Viva 456"),
+        Cliente(id=3, nombre="Carlos López", email="carlos@email.com", telefono="555-0003", direccion="Calle Principal 789"),
     ]
     for cliente in clientes:
-        conn.execute(text(
-            "INSERT OR REPLACE INTO clientes (id, nombre, email, telefono, direccion) "
-            "VALUES (:id, :nombre, :email, :telefono, :direccion)"
-        ), {"id": cliente[0], "nombre": cliente[1], "email": cliente[2], 
-            "telefono": cliente[3], "direccion": cliente[4]})
+        session.merge(cliente)
     print(f" {len(clientes)} clientes insertados")
     
-    conn.execute(text("DELETE FROM empleados"))
+    session.query(Empleado).delete()
     empleados = [
-        (1, "Pedro Técnico", "Técnico", "Soporte Técnico"),
-        (2, "Ana Operadora", "Operador", "Atención Telefónica"),
-        (3, "Luis Técnico", "Técnico", "Soporte Técnico"),
+        Empleado(id=1, nombre="Pedro Técnico", categoria="Técnico", rol="Soporte Técnico"),
+        Empleado(id=2, nombre="Ana Operadora", categoria="Operador", rol="Atención Telefónica"),
+        Empleado(id=3, nombre="Luis Técnico", categoria="Técnico", rol="Soporte Técnico"),
     ]
     for empleado in empleados:
-        conn.execute(text(
-            "INSERT OR REPLACE INTO empleados (id, nombre, categoria, rol) "
-            "VALUES (:id, :nombre, :categoria, :rol)"
-        ), {"id": empleado[0], "nombre": empleado[1], "categoria": empleado[2], "rol": empleado[3]})
+        session.merge(empleado)
     print(f" {len(empleados)} empleados insertados")
     
-    conn.execute(text("DELETE FROM equipos"))
+    session.query(Equipo).delete()
     equipos = [
-        (1, "Notebook Dell Inspiron", "Computadora", "Dell", "Inspiron 15", "SN12345"),
-        (2, "Impresora HP LaserJet", "Impresora", "HP", "LaserJet Pro", "SN67890"),
-        (3, "Monitor Samsung 24", "Monitor", "Samsung", "S24F350", "SN11111"),
+        Equipo(id=1, descripcion="Notebook Dell Inspiron", categoria="Computadora", marca="Dell", modelo="Inspiron 15", nro_serie="SN12345"),
+        Equipo(id=2, descripcion="Impresora HP LaserJet", categoria="Impresora", marca="HP", modelo="LaserJet Pro", nro_serie="SN67890"),
+        Equipo(id=3, descripcion="Monitor Samsung 24", categoria="Monitor", marca="Samsung", modelo="S24F350", nro_serie="SN11111"),
     ]
     for equipo in equipos:
-        conn.execute(text(
-            "INSERT OR REPLACE INTO equipos (id, descripcion, categoria, marca, modelo, nro_serie) "
-            "VALUES (:id, :desc, :cat, :marca, :modelo, :serie)"
-        ), {"id": equipo[0], "desc": equipo[1], "cat": equipo[2], 
-            "marca": equipo[3], "modelo": equipo[4], "serie": equipo[5]})
+        session.merge(equipo)
     print(f" {len(equipos)} equipos insertados")
     
-    conn.execute(text("DELETE FROM servicios"))
+    session.query(Servicio).delete()
     servicios = [
-        (1, "Reparación de Hardware"),
-        (2, "Instalación de Software"),
-        (3, "Mantenimiento Preventivo"),
+        Servicio(id=1, nombre="Reparación de Hardware"),
+        Servicio(id=2, nombre="Instalación de Software"),
+        Servicio(id=3, nombre="Mantenimiento Preventivo"),
     ]
     for servicio in servicios:
-        conn.execute(text(
-            "INSERT OR REPLACE INTO servicios (id, nombre) VALUES (:id, :nombre)"
-        ), {"id": servicio[0], "nombre": servicio[1]})
+        session.merge(servicio)
     print(f" {len(servicios)} servicios insertados")
     
     session.commit()
@@ -0,0 +1,159 @@
+"""Migraciones y flujo de la API sobre cada backend de base de datos.
+
+SQLite en archivo y en memoria corren siempre. Con DATABASE_URL apuntando a un servidor
+(por ejemplo postgresql+psycopg://ticketing@localhost/ticketing_pruebas, sobre una base vacía)
+se agrega ese backend, que ejercita el perfil 'servidor', el pool y el DDL de PostgreSQL/MySQL.
+"""
+import os
+import pytest
+from sqlalchemy import inspect
+from cache import respuestas
+from database import config, db
+from database.migraciones import MIGRACIONES, version_actual
+
+URL_SERVIDOR = os.environ.get("DATABASE_URL")
+
+
+def _backends():
+    yield pytest.param(lambda tmp_path: f"sqlite:///{tmp_path / 'app.db'}", id="sqlite-archivo")
+    yield pytest.param(lambda tmp_path: "sqlite://", id="sqlite-memoria")
+    yield pytest.param(
+        lambda tmp_path: URL_SERVIDOR,
+        id="servidor",
+        marks=pytest.mark.skipif(
+            not URL_SERVIDOR or config.es_sqlite(URL_SERVIDOR),
+            reason="DATABASE_URL no apunta a un servidor de base de datos",
+        ),
+    )
+
+
+@pytest.fixture(params=list(_backends()))
+def database_url(request, tmp_path, monkeypatch):
+    # El engine, la cache de respuestas y sus estadísticas son globales del proceso.
+    monkeypatch.setenv("TICKETING_CACHE_BACKEND", "ninguno")
+    monkeypatch.setattr(respuestas, "_cache", None)
+    monkeypatch.setattr(respuestas, "_cache_estadisticas", None)
+    db.close_db()
+    url = request.param(tmp_path)
+    yield url
+    db.close_db()
+
+
+@pytest.fixture
+def cliente(database_url):
+    from app import create_app
+
+    db.migrar_db(database_url=database_url)
+    return create_app().test_client()
+
+
+def _ticket(cliente, empleado_id=1, incidentes=()):
+    respuesta = cliente.post("/tickets", json={
+        "cliente_id": 1,
+        "servicio_id": 1,
+        "equipo_id": 1,
+        "empleado_id": empleado_id,
+        "incidentes": list(incidentes),
+    })
+    assert respuesta.status_code == 201, respuesta.get_json()
+    return respuesta.get_json()["id"]
+
+
+def test_migraciones_llevan_al_esquema_de_los_modelos(database_url):
+    from models.base import Base
+    import models  # noqa: F401  registra todas las tablas en Base.metadata
+
+    aplicadas = db.migrar_db(database_url=database_url)
+    assert aplicadas == [version for version, _, _ in MIGRACIONES]
+    assert db.migrar_db(database_url=database_url) == []
+    assert version_actual(db._engine) == MIGRACIONES[-1][0]
+
+    inspector = inspect(db._engine)
+    for tabla in Base.metadata.sorted_tables:
+        columnas = {columna["name"] for columna in inspector.get_columns(tabla.name)}
+        assert columnas == set(tabla.columns.keys()), tabla.name
+        indices = {indice["name"] for indice in inspector.get_indexes(tabla.name)}
+        assert {indice.name for indice in tabla.indexes} <= indices, tabla.name
+
+
+def test_alta_lectura_y_cambio_de_estado(cliente):
+    ticket_id = _ticket(cliente, incidentes=[
+        {"descripcion": "disco roto", "categoria": "Hardware", "prioridad": "Alta"},
+        {"descripcion": "sin red", "categoria": "Red", "prioridad": "Baja"},
+    ])
+
+    respuesta = cliente.get(f"/tickets/{ticket_id}")
+    assert respuesta.status_code == 200
+    ticket = respuesta.get_json()["datos"]
+    assert ticket["estado"] == "Abierto"
+    assert [i["categoria"] for i in ticket["incidentes"]] == ["Hardware", "Red"]
+    etag = respuesta.headers["ETag"]
+    assert cliente.get(f"/tickets/{ticket_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    respuesta = cliente.put(f"/tickets/{ticket_id}/estado", json={"estado": "En Progreso"})
+    assert respuesta.status_code == 200, respuesta.get_json()
+    respuesta = cliente.post(
+        f"/tickets/{ticket_id}/incidentes",
+        json={"descripcion": "pantalla", "categoria": "Hardware", "prioridad": "Crítica"},
+    )
+    assert respuesta.status_code == 201, respuesta.get_json()
+
+    resumen = cliente.get(f"/tickets?limit=10&estado=En Progreso").get_json()["datos"]
+    assert [t["id"] for t in resumen] == [ticket_id]
+    assert resumen[0]["cantidad_incidentes"] == 3
+    assert resumen[0]["prioridad_maxima"] == "Crítica"
+    assert resumen[0]["incidentes_por_categoria"]["Hardware"] == 2
+
+    assert cliente.put(f"/tickets/{ticket_id}/cerrar").status_code == 200
+    ticket = cliente.get(f"/tickets/{ticket_id}").get_json()["datos"]
+    assert ticket["estado"] == "Cerrado"
+    assert ticket["fecha_cierre"] is not None
+
+
+def test_paginacion_por_cursor(cliente):
+    ids = [_ticket(cliente, empleado_id=numero % 2) for numero in range(7)]
+
+    vistos = []
+    cursor = None
+    while True:
+        ruta = "/tickets?limit=3" + (f"&after={cursor}" if cursor else "")
+        cuerpo = cliente.get(ruta).get_json()
+        vistos.extend(t["id"] for t in cuerpo["datos"])
+        cursor = cuerpo["next_cursor"]
+        if cursor is None:
+            break
+    assert vistos == ids
+
+    pares = cliente.get("/tickets?limit=2&empleado_id=0&sort=-fecha_creacion").get_json()
+    assert [t["id"] for t in pares["datos"]] == ids[::-2][:2]
+    siguiente = cliente.get(f"/tickets?limit=2&empleado_id=0&sort=-fecha_creacion&after={pares['next_cursor']}")
+    assert [t["id"] for t in siguiente.get_json()["datos"]] == ids[::-2][2:4]
+
+
+def test_perfil_servidor_configura_el_pool(monkeypatch):
+    url = "postgresql+psycopg://ticketing@localhost/ticketing"
+    monkeypatch.delenv("TICKETING_DB_PERFIL", raising=False)
+    monkeypatch.setenv("TICKETING_DB_POOL_SIZE", "3")
+
+    perfil = config.obtener_perfil(database_url=url)
+    argumentos = db._argumentos_engine(url, perfil)
+    assert argumentos["pool_size"] == 3
+    assert argumentos["max_overflow"] == config.PERFILES["servidor"]["max_overflow"]
+    assert argumentos["pool_pre_ping"] is True
+    assert argumentos["pool_recycle"] == 1800
+    assert "connect_args" not in argumentos
+
+
+@pytest.mark.parametrize("url, esperada", [
+    ("sqlite:///app.db", "sqlite+aiosqlite:///app.db"),
+    ("postgresql://u:clave@db/tickets", "postgresql+asyncpg://u:clave@db/tickets"),
+    ("postgresql+psycopg://u@db/tickets", "postgresql+asyncpg://u@db/tickets"),
+    ("mysql+pymysql://u@db/tickets", "mysql+aiomysql://u@db/tickets"),
+])
+def test_url_asincronica_por_backend(url, esperada):
+    assert config.obtener_url_async(url) == esperada
+
+
+def test_url_asincronica_sin_driver():
+    with pytest.raises(ValueError):
+        config.obtener_url_async("oracle://u@db/tickets")
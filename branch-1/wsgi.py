@@ -0,0 +1,8 @@
+"""Punto de entrada de producción: gunicorn -c gunicorn.conf.py wsgi:app
+
+El esquema se prepara antes, una sola vez por despliegue, con `python manage.py init-db`.
+Importar este módulo no abre conexiones: cada worker crea las suyas con su primera sesión.
+"""
+from app import create_app
+
+app = create_app()